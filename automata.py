@@ -0,0 +1,694 @@
+# automata.py
+from collections import OrderedDict
+
+EPS = 'ε'
+
+
+def limpiar_regex(regex: str) -> str:
+    return ''.join(ch for ch in regex if not ch.isspace())
+
+
+def es_simbolo(c: str) -> bool:
+    return c not in {'(', ')', '|', '*', '.'}
+
+
+def agregar_concatenacion(regex: str) -> str:
+    """
+    Inserta '.' donde la concatenación es implícita.
+    Ej: (ab)*a -> (a.b)*.a
+    """
+    res = []
+    for i, c in enumerate(regex):
+        res.append(c)
+        if i == len(regex) - 1:
+            continue
+        d = regex[i + 1]
+        if (es_simbolo(c) or c in {')', '*'}) and (es_simbolo(d) or d == '('):
+            res.append('.')
+    return ''.join(res)
+
+
+def regex_a_postfix(regex: str) -> str:
+
+    prec = {'|': 1, '.': 2}
+    salida = []
+    pila = []
+
+    for c in regex:
+        if es_simbolo(c):
+            salida.append(c)
+        elif c == '(':
+            pila.append(c)
+        elif c == ')':
+            while pila and pila[-1] != '(':
+                salida.append(pila.pop())
+            if not pila:
+                raise ValueError("Paréntesis desbalanceados")
+            pila.pop()
+        elif c in {'.', '|'}:
+            while pila and pila[-1] in prec and prec[pila[-1]] >= prec[c]:
+                salida.append(pila.pop())
+            pila.append(c)
+        elif c == '*':
+            salida.append(c)
+        else:
+            raise ValueError(f"Símbolo no soportado en regex: {c}")
+
+    while pila:
+        op = pila.pop()
+        if op in {'(', ')'}:
+            raise ValueError("Paréntesis desbalanceados")
+        salida.append(op)
+
+    return ''.join(salida)
+
+
+class NFAFragment:
+    def __init__(self, start, accept, transitions):
+        self.start = start
+        self.accept = accept
+        self.transitions = transitions  # dict[state][symbol] -> set(states)
+
+
+def agregar_transicion(trans, src, symbol, dst):
+    if src not in trans:
+        trans[src] = {}
+    if symbol not in trans[src]:
+        trans[src][symbol] = set()
+    trans[src][symbol].add(dst)
+
+
+def postfix_a_nfa(postfix: str):
+    """
+    Construcción de Thompson.
+    Retorna (start, accept, transitions, alfabeto)
+    """
+    stack = []
+    transitions = {}
+    state_counter = 0
+    alphabet = set()
+
+    for c in postfix:
+        if es_simbolo(c):
+            s = state_counter
+            f = state_counter + 1
+            state_counter += 2
+            agregar_transicion(transitions, s, c, f)
+            alphabet.add(c)
+            stack.append(NFAFragment(s, f, transitions))
+        elif c == '.':
+            # concatenación
+            b = stack.pop()
+            a = stack.pop()
+            agregar_transicion(transitions, a.accept, EPS, b.start)
+            stack.append(NFAFragment(a.start, b.accept, transitions))
+        elif c == '|':
+            b = stack.pop()
+            a = stack.pop()
+            s = state_counter
+            f = state_counter + 1
+            state_counter += 2
+            agregar_transicion(transitions, s, EPS, a.start)
+            agregar_transicion(transitions, s, EPS, b.start)
+            agregar_transicion(transitions, a.accept, EPS, f)
+            agregar_transicion(transitions, b.accept, EPS, f)
+            stack.append(NFAFragment(s, f, transitions))
+        elif c == '*':
+            a = stack.pop()
+            s = state_counter
+            f = state_counter + 1
+            state_counter += 2
+            agregar_transicion(transitions, s, EPS, a.start)
+            agregar_transicion(transitions, s, EPS, f)
+            agregar_transicion(transitions, a.accept, EPS, a.start)
+            agregar_transicion(transitions, a.accept, EPS, f)
+            stack.append(NFAFragment(s, f, transitions))
+        else:
+            raise ValueError(f"Operador no soportado en postfix: {c}")
+
+    if len(stack) != 1:
+        raise ValueError("Error al construir el AFN (stack no quedó en 1)")
+
+    frag = stack[0]
+    # Asegurar que todos los estados aparecen en transitions
+    all_states = set(transitions.keys())
+    for d in transitions.values():
+        for dests in d.values():
+            all_states |= dests
+    for s in all_states:
+        transitions.setdefault(s, {})
+    return frag.start, frag.accept, transitions, alphabet
+
+
+def epsilon_cierre(states, transitions):
+    stack = list(states)
+    cierre = set(states)
+    while stack:
+        s = stack.pop()
+        for dest in transitions.get(s, {}).get(EPS, set()):
+            if dest not in cierre:
+                cierre.add(dest)
+                stack.append(dest)
+    return cierre
+
+
+def mover(states, symbol, transitions):
+    dest = set()
+    for s in states:
+        dest |= transitions.get(s, {}).get(symbol, set())
+    return dest
+
+
+def _estados_importantes(accept, transitions):
+    """Estados con alguna transición por símbolo, más el de aceptación."""
+    importantes = {accept}
+    for s, trans in transitions.items():
+        if any(sym != EPS for sym in trans):
+            importantes.add(s)
+    return importantes
+
+
+def clases_de_simbolos(start, accept, transitions, alphabet, importantes=None):
+    """
+    Agrupa los símbolos que se comportan igual para la determinización.
+
+    Todo estado del AFD es una unión de cierres de "entradas" (el inicial y
+    los destinos de transiciones por símbolo). Si para cada entrada e
+        T_c(e) = cierre(mover(cierre(e), c))
+    coincide para c y d, entonces c y d llevan a todo estado del AFD al
+    mismo destino. Con `importantes` los cierres se restringen a esos
+    estados (como en nfa_a_dfa con solo_importantes). Retorna (clase_de,
+    representantes): símbolo -> id de clase, y un símbolo por clase. ε no
+    forma parte de ninguna clase.
+    """
+    entradas = {start}
+    for trans in transitions.values():
+        for sym, dests in trans.items():
+            if sym != EPS:
+                entradas |= dests
+
+    cierres = {}
+
+    def cierre_importante(estados):
+        clave = frozenset(estados)
+        if clave not in cierres:
+            cierre = epsilon_cierre(clave, transitions)
+            cierres[clave] = frozenset(cierre & importantes if importantes is not None else cierre)
+        return cierres[clave]
+
+    firmas = {}
+    for e in sorted(entradas):
+        por_simbolo = {}
+        for s in cierre_importante({e}):
+            for sym, dests in transitions.get(s, {}).items():
+                if sym != EPS:
+                    por_simbolo.setdefault(sym, set()).update(dests)
+        for sym, dests in por_simbolo.items():
+            firmas.setdefault(sym, []).append((e, cierre_importante(dests)))
+
+    clase_de = {}
+    representantes = []
+    por_firma = {}
+    for sym in sorted(a for a in alphabet if a != EPS):
+        firma = tuple(firmas.get(sym, ()))
+        cid = por_firma.get(firma)
+        if cid is None:
+            cid = por_firma[firma] = len(representantes)
+            representantes.append(sym)
+        clase_de[sym] = cid
+    return clase_de, representantes
+
+
+def nfa_a_dfa(start_nfa, accept_nfa, transitions, alphabet, solo_importantes=False):
+    """
+    Construcción de subconjuntos: cada estado del AFD es un ε-cierre, como
+    en el libro (es lo que muestra la pestaña de conversión). Se determiniza
+    una vez por clase de símbolos equivalentes (clases_de_simbolos) y el
+    resultado se copia a cada símbolo de la clase, así que el costo crece
+    con el número de clases y no con el tamaño del alfabeto.
+
+    Con solo_importantes=True (uso interno) cada estado se identifica sólo
+    por sus estados importantes (los que tienen transiciones por símbolo y
+    el de aceptación): el lenguaje es el mismo, pero cierres que difieren
+    sólo en estados ε se funden y los conjuntos son más chicos.
+    """
+    from collections import deque
+
+    importantes = _estados_importantes(accept_nfa, transitions) if solo_importantes else None
+
+    def cierre(estados):
+        c = epsilon_cierre(estados, transitions)
+        return frozenset(c & importantes if importantes is not None else c)
+
+    clase_de, representantes = clases_de_simbolos(
+        start_nfa, accept_nfa, transitions, alphabet, importantes
+    )
+    miembros = [[] for _ in representantes]
+    for sym, cid in clase_de.items():
+        miembros[cid].append(sym)
+
+    dfa_states = {}
+    dfa_trans = {}
+    dfa_accepts = set()
+
+    start_set = cierre({start_nfa})
+    dfa_states[0] = start_set
+    indice = {start_set: 0}
+    queue = deque([0])
+
+    if accept_nfa in start_set:
+        dfa_accepts.add(0)
+
+    while queue:
+        sid = queue.popleft()
+        current_set = dfa_states[sid]
+        dfa_trans[sid] = {}
+        for cid, a in enumerate(representantes):
+            move_set = mover(current_set, a, transitions)
+            if not move_set:
+                continue
+            new_set = cierre(move_set)
+            existing_id = indice.get(new_set)
+            if existing_id is None:
+                existing_id = len(dfa_states)
+                dfa_states[existing_id] = new_set
+                indice[new_set] = existing_id
+                queue.append(existing_id)
+                if accept_nfa in new_set:
+                    dfa_accepts.add(existing_id)
+            for b in miembros[cid]:
+                dfa_trans[sid][b] = existing_id
+
+    dfa_start = 0
+    return dfa_states, dfa_start, dfa_accepts, dfa_trans
+
+
+class AFDCompacto:
+    """
+    AFD con el alfabeto comprimido en clases: la tabla de transiciones es
+    un array plano de n_estados × n_clases (-1 = estado muerto) y la
+    entrada se traduce a ids de clase con una tabla de 256 entradas para
+    los caracteres de un byte (y un dict para el resto).
+    """
+
+    def __init__(self, dfa_states, dfa_start, dfa_accepts, dfa_trans):
+        from array import array
+
+        estados = sorted(dfa_states)
+        orden = {q: i for i, q in enumerate(estados)}
+        simbolos = sorted({a for t in dfa_trans.values() for a in t if a != EPS})
+
+        # Firma de un símbolo: su columna completa en la tabla del AFD
+        por_firma = {}
+        self.clase_de = {}
+        for a in simbolos:
+            firma = tuple(dfa_trans.get(q, {}).get(a, -1) for q in estados)
+            self.clase_de[a] = por_firma.setdefault(firma, len(por_firma))
+        self.n_clases = len(por_firma)
+        self.n_estados = len(estados)
+
+        self.traduccion = array("i", [-1]) * 256
+        for a, cid in self.clase_de.items():
+            if len(a) == 1 and ord(a) < 256:
+                self.traduccion[ord(a)] = cid
+
+        self.tabla = array("i", [-1]) * (self.n_estados * self.n_clases)
+        for q, trans in dfa_trans.items():
+            for a, destino in trans.items():
+                if a != EPS:
+                    self.tabla[orden[q] * self.n_clases + self.clase_de[a]] = orden[destino]
+        self.inicial = orden[dfa_start]
+        self.finales = bytearray(self.n_estados)
+        for q in dfa_accepts:
+            self.finales[orden[q]] = 1
+
+    def clase(self, c: str) -> int:
+        o = ord(c)
+        if o < 256:
+            return self.traduccion[o]
+        return self.clase_de.get(c, -1)
+
+    def acepta(self, cadena: str) -> bool:
+        tabla, traduccion, k = self.tabla, self.traduccion, self.n_clases
+        estado = self.inicial
+        for c in cadena:
+            o = ord(c)
+            cid = traduccion[o] if o < 256 else self.clase_de.get(c, -1)
+            if cid < 0:
+                return False
+            estado = tabla[estado * k + cid]
+            if estado < 0:
+                return False
+        return bool(self.finales[estado])
+
+
+def dfa_a_gramatica_regular(dfa_states, dfa_start, dfa_accepts, dfa_trans):
+    lines = []
+    lines.append(f"Gramática Regular (símbolo inicial: Q{dfa_start})\n")
+    for sid in sorted(dfa_states.keys()):
+        nombre = f"Q{sid}"
+        trans = dfa_trans.get(sid, {})
+        for a, dest in trans.items():
+            lines.append(f"{nombre} -> {a} Q{dest}")
+        if sid in dfa_accepts:
+            lines.append(f"{nombre} -> {EPS}")
+    return '\n'.join(lines)
+
+
+def describir_afn(start, accept, trans, alphabet):
+    lines = []
+    estados = sorted(trans.keys())
+    lines.append(f"Estados: {estados}")
+    lines.append(f"Estado inicial: {start}")
+    lines.append(f"Estado de aceptación: {accept}")
+    lines.append(f"Alfabeto: {sorted(alphabet)}")
+    lines.append("Transiciones:")
+    for s in estados:
+        for sym, dests in trans[s].items():
+            for d in dests:
+                lines.append(f"  {s} --{sym}--> {d}")
+    return '\n'.join(lines)
+
+
+def describir_afd(dfa_states, dfa_start, dfa_accepts, dfa_trans, alphabet):
+    lines = []
+    estados = sorted(dfa_states.keys())
+    lines.append("Estados: " + ", ".join(f"Q{i}" for i in estados))
+    lines.append(f"Estado inicial: Q{dfa_start}")
+    lines.append("Estados de aceptación: " +
+                 ", ".join(f"Q{i}" for i in sorted(dfa_accepts)))
+    lines.append("Alfabeto: " + ", ".join(sorted(alphabet)))
+    lines.append("Transiciones:")
+    for sid in estados:
+        trans = dfa_trans.get(sid, {})
+        for a, dest in trans.items():
+            lines.append(f"  Q{sid} --{a}--> Q{dest}")
+    return '\n'.join(lines)
+
+
+def regex_a_nfa(regex: str):
+    """
+    Atajo: limpia la regex, inserta concatenaciones y aplica Thompson.
+    Retorna (start, accept, transitions, alfabeto) igual que postfix_a_nfa.
+    """
+    regex = limpiar_regex(regex)
+    if not regex:
+        raise ValueError("La expresión regular está vacía.")
+    postfix = regex_a_postfix(agregar_concatenacion(regex))
+    return postfix_a_nfa(postfix)
+
+
+
+def regex_a_posiciones(regex: str):
+    """
+    Árbol sintáctico de la regex reducido a posiciones (hojas), con
+    nullable, firstpos, lastpos y followpos calculados al evaluar el postfix.
+    Cada hoja es una posición; los conjuntos de posiciones se internan para
+    que los repetidos se compartan. 'ε' como hoja es anulable y no ocupa
+    posición. La raíz se concatena con un marcador de fin (#) en la
+    posición len(simbolo_de).
+
+    Retorna (simbolo_de, followpos, firstpos de la raíz, anulable, internar).
+    """
+    regex = limpiar_regex(regex)
+    if not regex:
+        raise ValueError("La expresión regular está vacía.")
+    postfix = regex_a_postfix(agregar_concatenacion(regex))
+
+    internados = {}
+
+    def internar(conjunto):
+        conjunto = frozenset(conjunto)
+        return internados.setdefault(conjunto, conjunto)
+
+    vacio = internar(())
+    simbolo_de = []   # posición -> símbolo
+    followpos = []    # posición -> set de posiciones
+    pila = []         # nodos (nullable, firstpos, lastpos)
+
+    for c in postfix:
+        if es_simbolo(c):
+            if c == EPS:
+                pila.append((True, vacio, vacio))
+                continue
+            pos = len(simbolo_de)
+            simbolo_de.append(c)
+            followpos.append(set())
+            hoja = internar((pos,))
+            pila.append((False, hoja, hoja))
+            continue
+        if c == '*':
+            if not pila:
+                raise ValueError("Expresión regular mal formada.")
+            _, first, last = pila.pop()
+            for p in last:
+                followpos[p] |= first
+            pila.append((True, first, last))
+            continue
+        if len(pila) < 2:
+            raise ValueError("Expresión regular mal formada.")
+        n2, f2, l2 = pila.pop()
+        n1, f1, l1 = pila.pop()
+        if c == '.':
+            for p in l1:
+                followpos[p] |= f2
+            pila.append((
+                n1 and n2,
+                internar(f1 | f2) if n1 else f1,
+                internar(l1 | l2) if n2 else l2,
+            ))
+        else:  # '|'
+            pila.append((n1 or n2, internar(f1 | f2), internar(l1 | l2)))
+
+    if len(pila) != 1:
+        raise ValueError("Expresión regular mal formada.")
+
+    # Marcador de fin (#): la raíz se concatena con una posición final
+    anulable, first, last = pila[0]
+    fin = len(simbolo_de)
+    for p in last:
+        followpos[p].add(fin)
+    return simbolo_de, [internar(f) for f in followpos], first, anulable, internar
+
+
+def regex_a_dfa_directo(regex: str):
+    """
+    Construcción directa regex -> AFD (nullable, firstpos, lastpos y
+    followpos sobre el árbol sintáctico), sin pasar por el AFN de Thompson.
+
+    Retorna (dfa_states, dfa_start, dfa_accepts, dfa_trans, alfabeto) con el
+    mismo formato que nfa_a_dfa.
+    """
+    from collections import deque
+
+    simbolo_de, siguientes, first, anulable, internar = regex_a_posiciones(regex)
+    fin = len(simbolo_de)
+    alfabeto = set(simbolo_de)
+
+    inicio = internar(first | {fin}) if anulable else first
+    dfa_states = {0: inicio}
+    indice = {inicio: 0}
+    dfa_trans = {}
+    dfa_accepts = {0} if fin in inicio else set()
+    queue = deque([0])
+
+    while queue:
+        sid = queue.popleft()
+        por_simbolo = {}
+        for p in dfa_states[sid]:
+            if p != fin:
+                por_simbolo.setdefault(simbolo_de[p], set()).update(siguientes[p])
+        dfa_trans[sid] = {}
+        for a, destino in por_simbolo.items():
+            destino = internar(destino)
+            did = indice.get(destino)
+            if did is None:
+                did = len(dfa_states)
+                dfa_states[did] = destino
+                indice[destino] = did
+                queue.append(did)
+                if fin in destino:
+                    dfa_accepts.add(did)
+            dfa_trans[sid][a] = did
+
+    return dfa_states, 0, dfa_accepts, dfa_trans, alfabeto
+
+class NFABitParalelo:
+    """
+    Simulación del AFN de Thompson con conjuntos de estados como bits
+    (estilo Shift-And / Glushkov). El conjunto activo es un int de Python:
+    el bit i encendido significa que el estado i está activo.
+
+    - mascara_simbolo[a]: estados con transición 'a'. En Thompson toda
+      transición con símbolo va de s a s+1, así que avanzar es (D & B[a]) << 1.
+    - El ε-cierre se resuelve por bloques de 8 bits con tablas que se llenan
+      bajo demanda, de modo que cada paso cuesta O(m/8) operaciones sobre
+      enteros y nunca se construye el AFD.
+    """
+
+    BLOQUE = 8
+
+    def __init__(self, start, accept, transitions, alphabet):
+        self.n_estados = max(transitions.keys()) + 1 if transitions else 1
+        self.mascara_final = 1 << accept
+
+        self.cierre = [0] * self.n_estados
+        for s in range(self.n_estados):
+            bits = 0
+            for t in epsilon_cierre({s}, transitions):
+                bits |= 1 << t
+            self.cierre[s] = bits
+
+        self.mascara_simbolo = {}
+        self._desplazable = True
+        self._destinos = {}  # solo si alguna transición no es s -> s+1
+        for s, trans in transitions.items():
+            for sym, dests in trans.items():
+                if sym == EPS:
+                    continue
+                self.mascara_simbolo[sym] = self.mascara_simbolo.get(sym, 0) | (1 << s)
+                for d in dests:
+                    if d != s + 1:
+                        self._desplazable = False
+                    self._destinos.setdefault((s, sym), set()).add(d)
+
+        self.alfabeto = set(alphabet) - {EPS}
+        self._tablas = [dict() for _ in range(self.n_estados // self.BLOQUE + 1)]
+        self.inicial = self.cerrar(1 << start)
+
+    def cerrar(self, bits: int) -> int:
+        """ε-cierre de un conjunto de estados codificado en bits."""
+        resultado = 0
+        bloque = 0
+        while bits:
+            byte = bits & 0xFF
+            if byte:
+                tabla = self._tablas[bloque]
+                union = tabla.get(byte)
+                if union is None:
+                    union = 0
+                    base = bloque * self.BLOQUE
+                    for i in range(self.BLOQUE):
+                        if byte >> i & 1:
+                            union |= self.cierre[base + i]
+                    tabla[byte] = union
+                resultado |= union
+            bits >>= self.BLOQUE
+            bloque += 1
+        return resultado
+
+    def paso(self, activos: int, simbolo: str) -> int:
+        origen = activos & self.mascara_simbolo.get(simbolo, 0)
+        if not origen:
+            return 0
+        if self._desplazable:
+            return self.cerrar(origen << 1)
+        destino = 0
+        s = 0
+        while origen:
+            if origen & 1:
+                for d in self._destinos.get((s, simbolo), ()):
+                    destino |= 1 << d
+            origen >>= 1
+            s += 1
+        return self.cerrar(destino)
+
+    def acepta(self, cadena: str) -> bool:
+        activos = self.inicial
+        for c in cadena:
+            activos = self.paso(activos, c)
+            if not activos:
+                return False
+        return bool(activos & self.mascara_final)
+
+
+def regex_a_nfa_bits(regex: str) -> NFABitParalelo:
+    return NFABitParalelo(*regex_a_nfa(regex))
+
+
+def gramatica_regular_a_nfa(grammar):
+    """
+    Inverso de dfa_a_gramatica_regular: construye un AFN a partir de una
+    gramática regular lineal por la derecha (A -> a1...akB | a1...ak).
+    Cada no terminal es un estado; las cadenas de varios terminales se
+    encadenan con estados intermedios. Retorna (start, accept, transitions,
+    alfabeto) igual que postfix_a_nfa.
+    """
+    ids = {nt: i for i, nt in enumerate(sorted(grammar.nonterminals))}
+    accept = len(ids)
+    state_counter = accept + 1
+    transitions = {}
+    alphabet = set()
+
+    for p in grammar.productions:
+        if len(p.lhs) != 1 or p.lhs not in ids:
+            raise ValueError(f"{p.lhs} -> {p.rhs} no es una producción regular.")
+        rhs = p.rhs
+        if rhs and rhs[-1] in ids:
+            terminales, destino = rhs[:-1], ids[rhs[-1]]
+        else:
+            terminales, destino = rhs, accept
+        if any(ch in ids for ch in terminales):
+            raise ValueError(f"{p.lhs} -> {p.rhs} no es lineal por la derecha.")
+
+        actual = ids[p.lhs]
+        if not terminales:
+            agregar_transicion(transitions, actual, EPS, destino)
+            continue
+        for i, a in enumerate(terminales):
+            alphabet.add(a)
+            if i == len(terminales) - 1:
+                siguiente = destino
+            else:
+                siguiente = state_counter
+                state_counter += 1
+            agregar_transicion(transitions, actual, a, siguiente)
+            actual = siguiente
+
+    for s in range(state_counter):
+        transitions.setdefault(s, {})
+    return ids[grammar.start_symbol], accept, transitions, alphabet
+
+
+_CACHE_REGULARES = OrderedDict()
+MAX_REGULARES = 32
+
+
+def _compilar_regular(grammar):
+    """Entrada de caché (AFD, AFDCompacto) de una gramática regular."""
+    from grammar_parser import grammar_key
+
+    clave = grammar_key(grammar)
+    entrada = _CACHE_REGULARES.get(clave)
+    if entrada is None:
+        dfa = nfa_a_dfa(*gramatica_regular_a_nfa(grammar), solo_importantes=True)
+        entrada = _CACHE_REGULARES[clave] = (dfa, AFDCompacto(*dfa))
+        if len(_CACHE_REGULARES) > MAX_REGULARES:
+            _CACHE_REGULARES.popitem(last=False)
+    else:
+        _CACHE_REGULARES.move_to_end(clave)
+    return entrada
+
+
+def compilar_gramatica_regular(grammar):
+    """
+    Gramática regular -> AFN -> AFD, cacheado por la clave canónica de la
+    gramática (LRU de MAX_REGULARES entradas). Retorna (dfa_states,
+    dfa_start, dfa_accepts, dfa_trans).
+    """
+    return _compilar_regular(grammar)[0]
+
+
+def compilar_gramatica_regular_compacta(grammar) -> AFDCompacto:
+    """El mismo AFD cacheado, en forma de tabla plana para reconocer cadenas."""
+    return _compilar_regular(grammar)[1]
+
+
+def dfa_acepta(dfa_start, dfa_accepts, dfa_trans, cadena: str) -> bool:
+    """Recorre el AFD en O(|w|). Una transición ausente es el estado muerto."""
+    estado = dfa_start
+    for c in cadena:
+        estado = dfa_trans.get(estado, {}).get(c)
+        if estado is None:
+            return False
+    return estado in dfa_accepts
@@ -0,0 +1,182 @@
+# comparator.py
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from grammar_parser import Grammar
+from grammar_parser import grammar_key
+from language import MAX_GENERADORES, generador_incremental
+
+# Un proceso por núcleo. El árbol de derivaciones de cada gramática se parte
+# en tantas partes como procesos y la parte i va siempre al proceso i, así
+# que todas las gramáticas usan todos los núcleos, cada proceso recibe las
+# longitudes de su parte en orden y cada k sólo procesa el nivel nuevo de
+# su generador incremental.
+_EJECUTORES: List[ProcessPoolExecutor] = []
+
+
+def _ejecutores(max_workers: Optional[int] = None) -> List[ProcessPoolExecutor]:
+    """Se crean una vez (os.cpu_count() por defecto) y se reutilizan entre comparaciones."""
+    if not _EJECUTORES:
+        for _ in range(max_workers or os.cpu_count() or 1):
+            _EJECUTORES.append(ProcessPoolExecutor(max_workers=1))
+    return _EJECUTORES
+
+
+def cadenas_de_longitud(
+    grammar: Grammar,
+    k: int,
+    max_expansiones: int = 2000,
+    particion: Tuple[int, int] = (0, 1),
+) -> Tuple[FrozenSet[str], bool]:
+    """
+    Cadenas de longitud exactamente k de una parte del árbol de derivaciones
+    y si esa parte completó el nivel k sin agotar el presupuesto (se ejecuta
+    en el proceso asignado a la parte). Ese proceso conserva su generador
+    incremental y recibe las longitudes en orden, así que cada k continúa
+    desde la frontera de k-1.
+    """
+    gen = generador_incremental(grammar, max_expansiones, particion)
+    gen.extender(k)
+    return gen.niveles[k], gen.completo[k]
+
+
+# Resultados ya calculados en el proceso principal, por (clave de gramática,
+# presupuesto) y luego por longitud, con su marca de completitud: al subir n
+# sólo se envían las longitudes nuevas. LRU por gramática con el mismo tope
+# que los generadores.
+_CACHE_LONGITUDES: "OrderedDict[tuple, Dict[int, Tuple[FrozenSet[str], bool]]]" = OrderedDict()
+
+
+def _longitudes_cacheadas(
+    clave_gramatica: tuple, max_expansiones: int
+) -> Dict[int, Tuple[FrozenSet[str], bool]]:
+    clave = (clave_gramatica, max_expansiones)
+    niveles = _CACHE_LONGITUDES.get(clave)
+    if niveles is None:
+        niveles = _CACHE_LONGITUDES[clave] = {}
+        if len(_CACHE_LONGITUDES) > MAX_GENERADORES:
+            _CACHE_LONGITUDES.popitem(last=False)
+    else:
+        _CACHE_LONGITUDES.move_to_end(clave)
+    return niveles
+
+
+@dataclass
+class ResultadoComparacion:
+    L1: Set[str] = field(default_factory=set)
+    L2: Set[str] = field(default_factory=set)
+    diff_1_2: List[str] = field(default_factory=list)
+    diff_2_1: List[str] = field(default_factory=list)
+    # Longitud más corta con una diferencia en la que ambos lados agotaron
+    # su búsqueda (None si no hay ninguna concluyente)
+    longitud_contraejemplo: Optional[int] = None
+    # Última longitud comparada
+    hasta: int = -1
+    # completo[k]: las dos gramáticas terminaron el nivel k sin agotar el
+    # presupuesto, así que sus cadenas de largo k son exactas
+    completo: List[bool] = field(default_factory=list)
+
+    @property
+    def equivalentes(self) -> bool:
+        """Iguales en todas las longitudes comparadas, y todas exactas."""
+        return not self.diff_1_2 and not self.diff_2_1 and all(self.completo)
+
+    @property
+    def sin_conclusion(self) -> bool:
+        """Ni contraejemplo concluyente ni todas las longitudes exactas."""
+        return self.longitud_contraejemplo is None and not self.equivalentes
+
+
+def comparar_lenguajes(
+    g1: Grammar,
+    g2: Grammar,
+    n: int,
+    primer_contraejemplo: bool = False,
+    max_expansiones: int = 2000,
+    max_workers: Optional[int] = None,
+    progreso: Optional[Callable[[int, Set[str], Set[str]], None]] = None,
+) -> ResultadoComparacion:
+    """
+    Compara L(G1) y L(G2) longitud por longitud (0..n). Cada terna
+    (gramática, longitud, parte del árbol de derivaciones) es una tarea en
+    el proceso de esa parte, de modo que cada nivel de cada gramática se
+    reparte entre todos los procesos; las longitudes se comparan en orden a
+    medida que llegan todas las partes de los dos lados.
+
+    Una diferencia en la longitud k sólo cuenta como contraejemplo si las
+    dos gramáticas completaron el nivel k; si alguna agotó el presupuesto,
+    las cadenas que le faltan pueden deberse al corte y el resultado queda
+    sin conclusión.
+
+    Con primer_contraejemplo=True se detiene en el primer contraejemplo y
+    cancela el trabajo pendiente.
+    """
+    resultado = ResultadoComparacion()
+    if n < 0:
+        return resultado
+
+    ejecutores = _ejecutores(max_workers)
+    partes = len(ejecutores)
+    claves = (grammar_key(g1), grammar_key(g2))
+    cacheadas = tuple(_longitudes_cacheadas(c, max_expansiones) for c in claves)
+    llegadas: Dict[int, List[Optional[Tuple[FrozenSet[str], bool]]]] = {}
+    # Partes ya recibidas de cada (longitud, lado) que aún no está completo
+    parciales: Dict[tuple, List[Tuple[FrozenSet[str], bool]]] = {}
+    pendientes = {}
+    for k in range(n + 1):
+        for lado, g in ((0, g1), (1, g2)):
+            previo = cacheadas[lado].get(k)
+            if previo is not None:
+                llegadas.setdefault(k, [None, None])[lado] = previo
+                continue
+            for parte, ejecutor in enumerate(ejecutores):
+                fut = ejecutor.submit(
+                    cadenas_de_longitud, g, k, max_expansiones, (parte, partes)
+                )
+                pendientes[fut] = (k, lado)
+
+    siguiente = 0
+    try:
+        while siguiente <= n:
+            if pendientes:
+                hechas, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                for fut in hechas:
+                    k, lado = pendientes.pop(fut)
+                    recibidas = parciales.setdefault((k, lado), [])
+                    recibidas.append(fut.result())
+                    if len(recibidas) < partes:
+                        continue
+                    del parciales[(k, lado)]
+                    nivel = (
+                        frozenset().union(*(cadenas for cadenas, _ in recibidas)),
+                        all(completo for _, completo in recibidas),
+                    )
+                    cacheadas[lado][k] = nivel
+                    llegadas.setdefault(k, [None, None])[lado] = nivel
+            elif siguiente not in llegadas or None in llegadas[siguiente]:
+                break
+
+            while siguiente in llegadas and None not in llegadas[siguiente]:
+                (w1, completo1), (w2, completo2) = llegadas.pop(siguiente)
+                completo = completo1 and completo2
+                resultado.completo.append(completo)
+                resultado.L1 |= w1
+                resultado.L2 |= w2
+                resultado.diff_1_2.extend(sorted(w1 - w2))
+                resultado.diff_2_1.extend(sorted(w2 - w1))
+                resultado.hasta = siguiente
+                if progreso is not None:
+                    progreso(siguiente, w1, w2)
+                if w1 != w2 and completo and resultado.longitud_contraejemplo is None:
+                    resultado.longitud_contraejemplo = siguiente
+                    if primer_contraejemplo:
+                        return resultado
+                siguiente += 1
+    finally:
+        for fut in pendientes:
+            fut.cancel()
+
+    return resultado
@@ -0,0 +1,241 @@
+# corpus.py
+"""
+Corpus local de gramáticas en SQLite, con propiedades precalculadas e
+indexadas para consultarlas sin reprocesar las gramáticas.
+
+    corpus = CorpusGramaticas("corpus.sqlite")
+    corpus.agregar_lote(generar_gramaticas(2, cantidad=5000))
+    ids = corpus.buscar(tipo=2, min_producciones=50)
+
+Cada gramática se guarda una sola vez (por su clave canónica); las
+propiedades (tipo, número de producciones, terminales, vacuidad y finitud)
+se calculan sólo para las gramáticas nuevas al momento de agregarlas.
+Vacuidad y finitud quedan en NULL si la gramática no es libre de contexto.
+"""
+import hashlib
+import json
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from grammar_parser import Grammar, Production, grammar_key
+from classifier import classify_grammar
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS gramaticas (
+    id              INTEGER PRIMARY KEY,
+    clave           BLOB NOT NULL UNIQUE,
+    nombre          TEXT,
+    inicial         TEXT NOT NULL,
+    no_terminales   TEXT NOT NULL,
+    producciones    TEXT NOT NULL,
+    tipo            INTEGER NOT NULL,
+    n_producciones  INTEGER NOT NULL,
+    vacio           INTEGER,
+    finito          INTEGER
+);
+CREATE TABLE IF NOT EXISTS terminales (
+    terminal     TEXT NOT NULL,
+    gramatica_id INTEGER NOT NULL REFERENCES gramaticas(id),
+    PRIMARY KEY (terminal, gramatica_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_tipo_producciones ON gramaticas (tipo, n_producciones);
+CREATE INDEX IF NOT EXISTS idx_producciones ON gramaticas (n_producciones);
+CREATE INDEX IF NOT EXISTS idx_vacio ON gramaticas (vacio, tipo);
+CREATE INDEX IF NOT EXISTS idx_finito ON gramaticas (finito, tipo);
+"""
+
+
+def _clave(grammar: Grammar) -> bytes:
+    texto = json.dumps(grammar_key(grammar), ensure_ascii=False)
+    return hashlib.blake2b(texto.encode("utf-8"), digest_size=16).digest()
+
+
+def _propiedades(grammar: Grammar) -> Tuple[int, Optional[int], Optional[int]]:
+    """(tipo, vacio, finito) con vacio/finito en None si no aplica."""
+    from language_analysis import analizar
+
+    tipo = classify_grammar(grammar).grammar_type
+    try:
+        analisis = analizar(grammar)
+    except ValueError:
+        return tipo, None, None
+    return tipo, int(analisis.vacio), int(analisis.finito)
+
+
+class CorpusGramaticas:
+
+    def __init__(self, path: str = "corpus.sqlite"):
+        self.path = path
+        self.con = sqlite3.connect(path)
+        self.con.executescript(_ESQUEMA)
+
+    # ---------- ingesta ----------
+
+    def agregar(self, grammar: Grammar, nombre: Optional[str] = None) -> int:
+        """Agrega una gramática (si no estaba) y retorna su id."""
+        self.agregar_lote([(nombre, grammar)])
+        fila = self.con.execute(
+            "SELECT id FROM gramaticas WHERE clave = ?", (_clave(grammar),)
+        ).fetchone()
+        return fila[0]
+
+    def agregar_lote(
+        self,
+        gramaticas: Iterable[Union[Grammar, Tuple[Optional[str], Grammar]]],
+        tam_lote: int = 1000,
+    ) -> int:
+        """
+        Ingesta masiva en transacciones de `tam_lote` gramáticas. Las ya
+        presentes no se recalculan. Retorna cuántas gramáticas nuevas entraron.
+        """
+        nuevas = 0
+        lote: List[Tuple[Optional[str], Grammar]] = []
+        for item in gramaticas:
+            lote.append(item if isinstance(item, tuple) else (None, item))
+            if len(lote) >= tam_lote:
+                nuevas += self._insertar(lote)
+                lote = []
+        if lote:
+            nuevas += self._insertar(lote)
+        return nuevas
+
+    def _insertar(self, lote) -> int:
+        claves = {}
+        for nombre, grammar in lote:
+            claves.setdefault(_clave(grammar), (nombre, grammar))
+
+        existentes = set()
+        lista = list(claves)
+        for i in range(0, len(lista), 500):
+            parte = lista[i:i + 500]
+            existentes.update(
+                fila[0] for fila in self.con.execute(
+                    f"SELECT clave FROM gramaticas WHERE clave IN ({','.join('?' * len(parte))})",
+                    parte,
+                )
+            )
+
+        with self.con:
+            nuevas = 0
+            for clave, (nombre, grammar) in claves.items():
+                if clave in existentes:
+                    continue
+                tipo, vacio, finito = _propiedades(grammar)
+                cur = self.con.execute(
+                    "INSERT INTO gramaticas (clave, nombre, inicial, no_terminales, producciones,"
+                    " tipo, n_producciones, vacio, finito) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        clave,
+                        nombre,
+                        grammar.start_symbol,
+                        json.dumps(sorted(grammar.nonterminals), ensure_ascii=False),
+                        json.dumps([[p.lhs, p.rhs] for p in grammar.productions], ensure_ascii=False),
+                        tipo,
+                        len(grammar.productions),
+                        vacio,
+                        finito,
+                    ),
+                )
+                self.con.executemany(
+                    "INSERT INTO terminales (terminal, gramatica_id) VALUES (?, ?)",
+                    ((t, cur.lastrowid) for t in grammar.terminals),
+                )
+                nuevas += 1
+        return nuevas
+
+    # ---------- consultas ----------
+
+    def buscar(
+        self,
+        tipo: Optional[int] = None,
+        min_producciones: Optional[int] = None,
+        max_producciones: Optional[int] = None,
+        vacio: Optional[bool] = None,
+        finito: Optional[bool] = None,
+        terminales: Iterable[str] = (),
+        limite: Optional[int] = None,
+    ) -> List[int]:
+        """Ids de las gramáticas que cumplen todos los filtros dados."""
+        condiciones, params = [], []
+        if tipo is not None:
+            condiciones.append("g.tipo = ?")
+            params.append(tipo)
+        if min_producciones is not None:
+            condiciones.append("g.n_producciones >= ?")
+            params.append(min_producciones)
+        if max_producciones is not None:
+            condiciones.append("g.n_producciones <= ?")
+            params.append(max_producciones)
+        if vacio is not None:
+            condiciones.append("g.vacio = ?")
+            params.append(int(vacio))
+        if finito is not None:
+            condiciones.append("g.finito = ?")
+            params.append(int(finito))
+        for t in sorted(set(terminales)):
+            condiciones.append(
+                "EXISTS (SELECT 1 FROM terminales x WHERE x.terminal = ? AND x.gramatica_id = g.id)"
+            )
+            params.append(t)
+
+        sql = "SELECT g.id FROM gramaticas g"
+        if condiciones:
+            sql += " WHERE " + " AND ".join(condiciones)
+        sql += " ORDER BY g.id"
+        if limite is not None:
+            sql += " LIMIT ?"
+            params.append(limite)
+        return [fila[0] for fila in self.con.execute(sql, params)]
+
+    def gramatica(self, gid: int) -> Grammar:
+        fila = self.con.execute(
+            "SELECT inicial, no_terminales, producciones FROM gramaticas WHERE id = ?", (gid,)
+        ).fetchone()
+        if fila is None:
+            raise KeyError(gid)
+        inicial, nts, prods = fila
+        terminales = {
+            t for (t,) in self.con.execute(
+                "SELECT terminal FROM terminales WHERE gramatica_id = ?", (gid,)
+            )
+        }
+        return Grammar(
+            nonterminals=set(json.loads(nts)),
+            terminals=terminales,
+            productions=[Production(lhs, rhs) for lhs, rhs in json.loads(prods)],
+            start_symbol=inicial,
+        )
+
+    def gramaticas(self, ids: Iterable[int]) -> Iterator[Grammar]:
+        for gid in ids:
+            yield self.gramatica(gid)
+
+    def propiedades(self, gid: int) -> Dict[str, object]:
+        fila = self.con.execute(
+            "SELECT nombre, tipo, n_producciones, vacio, finito FROM gramaticas WHERE id = ?", (gid,)
+        ).fetchone()
+        if fila is None:
+            raise KeyError(gid)
+        nombre, tipo, n_prod, vacio, finito = fila
+        return {
+            "nombre": nombre,
+            "tipo": tipo,
+            "n_producciones": n_prod,
+            "vacio": None if vacio is None else bool(vacio),
+            "finito": None if finito is None else bool(finito),
+        }
+
+    def conteo_por_tipo(self) -> Dict[int, int]:
+        return dict(self.con.execute("SELECT tipo, COUNT(*) FROM gramaticas GROUP BY tipo"))
+
+    def __len__(self):
+        return self.con.execute("SELECT COUNT(*) FROM gramaticas").fetchone()[0]
+
+    def cerrar(self):
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
@@ -0,0 +1,145 @@
+# counting.py
+"""
+Conteo de |L ∩ Σ^n| para lenguajes regulares sin enumerar cadenas.
+
+Con la matriz de transición M de un AFD (M[i][j] = número de símbolos que
+llevan de i a j), el número de cadenas de largo n aceptadas es
+    e_inicial · M^n · 1_finales
+y M^n se obtiene con elevación por cuadrados en O(s³ log n). Los conteos
+son exactos con enteros de Python; con `modulo` se trabaja módulo un primo
+y, si NumPy está instalado, con matrices int64.
+"""
+from typing import Dict, List, Optional
+
+from automata import EPS
+
+
+def matriz_transicion(dfa_states, dfa_trans) -> List[List[int]]:
+    """Matriz s×s en el orden de sorted(dfa_states); se ignoran transiciones ε."""
+    orden = {q: i for i, q in enumerate(sorted(dfa_states))}
+    s = len(orden)
+    M = [[0] * s for _ in range(s)]
+    for q, trans in dfa_trans.items():
+        for a, destino in trans.items():
+            if a != EPS:
+                M[orden[q]][orden[destino]] += 1
+    return M
+
+
+def _multiplicar(A, B, modulo: Optional[int]):
+    columnas = list(zip(*B))
+    C = []
+    for fila in A:
+        nueva = [sum(x * y for x, y in zip(fila, col) if x and y) for col in columnas]
+        if modulo:
+            nueva = [v % modulo for v in nueva]
+        C.append(nueva)
+    return C
+
+
+def _vector_por_matriz(v, M, modulo: Optional[int]):
+    s = len(M)
+    r = [0] * s
+    for i, x in enumerate(v):
+        if x:
+            fila = M[i]
+            for j in range(s):
+                if fila[j]:
+                    r[j] += x * fila[j]
+    return [x % modulo for x in r] if modulo else r
+
+
+def _potencia_numpy(M, n: int, v, modulo: int):
+    import numpy as np
+
+    A = np.array(M, dtype=np.int64) % modulo
+    r = np.array(v, dtype=np.int64)
+    while n:
+        if n & 1:
+            r = (r @ A) % modulo
+        n >>= 1
+        if n:
+            A = (A @ A) % modulo
+    return [int(x) for x in r]
+
+
+def contar_cadenas(
+    dfa_states,
+    dfa_start,
+    dfa_accepts,
+    dfa_trans,
+    n: int,
+    modulo: Optional[int] = None,
+) -> int:
+    """
+    Número de cadenas de largo exactamente n aceptadas por el AFD (módulo
+    `modulo` si se pide). Acepta AFDs de nfa_a_dfa, regex_a_dfa_directo o
+    compilar_gramatica_regular.
+    """
+    if n < 0:
+        raise ValueError("La longitud no puede ser negativa.")
+    orden = sorted(dfa_states)
+    if dfa_start not in dfa_states:
+        return 0
+    M = matriz_transicion(dfa_states, dfa_trans)
+    v = [1 if q == dfa_start else 0 for q in orden]
+
+    # int64 alcanza si cada producto parcial (s · (m-1)²) no desborda
+    if modulo and len(orden) * (modulo - 1) ** 2 < 2 ** 63:
+        try:
+            v = _potencia_numpy(M, n, v, modulo)
+            n = 0
+        except ImportError:
+            pass
+
+    # Elevación por cuadrados: v · M^n procesando los bits de n
+    while n:
+        if n & 1:
+            v = _vector_por_matriz(v, M, modulo)
+        n >>= 1
+        if n:
+            M = _multiplicar(M, M, modulo)
+
+    total = sum(x for q, x in zip(orden, v) if q in dfa_accepts)
+    return total % modulo if modulo else total
+
+
+def contar_hasta(dfa_states, dfa_start, dfa_accepts, dfa_trans, n: int) -> List[int]:
+    """Conteos exactos para cada largo 0..n (avanza el vector paso a paso)."""
+    orden = sorted(dfa_states)
+    if dfa_start not in dfa_states:
+        return [0] * (n + 1)
+    M = matriz_transicion(dfa_states, dfa_trans)
+    finales = [i for i, q in enumerate(orden) if q in dfa_accepts]
+    v = [1 if q == dfa_start else 0 for q in orden]
+    conteos = []
+    for _ in range(n + 1):
+        conteos.append(sum(v[i] for i in finales))
+        v = _vector_por_matriz(v, M, None)
+    return conteos
+
+
+def contar_regex(regex: str, n: int, modulo: Optional[int] = None) -> int:
+    from automata import regex_a_dfa_directo
+
+    dfa_states, dfa_start, dfa_accepts, dfa_trans, _ = regex_a_dfa_directo(regex)
+    return contar_cadenas(dfa_states, dfa_start, dfa_accepts, dfa_trans, n, modulo)
+
+
+def contar_gramatica_regular(grammar, n: int, modulo: Optional[int] = None) -> int:
+    """|L(G) ∩ Σ^n| para una gramática Tipo 3 (usa el AFD cacheado)."""
+    from automata import compilar_gramatica_regular
+
+    return contar_cadenas(*compilar_gramatica_regular(grammar), n, modulo)
+
+
+def estadisticas(dfa_states, dfa_start, dfa_accepts, dfa_trans, n: int) -> Dict[str, object]:
+    """Resumen por longitud: conteos 0..n, total acumulado y densidad en Σ^n."""
+    conteos = contar_hasta(dfa_states, dfa_start, dfa_accepts, dfa_trans, n)
+    simbolos = {a for t in dfa_trans.values() for a in t if a != EPS}
+    k = len(simbolos)
+    return {
+        "conteos": conteos,
+        "total": sum(conteos),
+        "densidad": [c / k ** i if k else float(c) for i, c in enumerate(conteos)],
+    }
@@ -0,0 +1,215 @@
+# dfa_algebra.py
+"""
+Álgebra perezosa de AFDs: intersección, unión, diferencia y complemento.
+
+Ninguna operación construye el producto cartesiano completo: cada autómata
+sólo sabe dar su estado inicial, su transición y si un estado es final, y
+los estados del producto se generan a medida que la búsqueda los visita.
+`testigo` recorre en anchura y se detiene en la primera cadena aceptada,
+así que las consultas de inclusión y solapamiento sólo exploran la parte
+alcanzable (y viva) del producto.
+
+El estado muerto de un AFD o de un producto se representa con None; en
+un complemento ese mismo None es un sumidero que acepta todo.
+"""
+from collections import deque
+from typing import Optional, Set, Tuple
+
+from automata import regex_a_dfa_directo
+
+
+class AFD:
+    """Envoltura de un AFD (dfa_states, dfa_start, dfa_accepts, dfa_trans)."""
+
+    def __init__(self, dfa_states, dfa_start, dfa_accepts, dfa_trans, alfabeto):
+        self.trans = dfa_trans
+        self.inicial = dfa_start
+        self.finales = set(dfa_accepts)
+        self.alfabeto = set(alfabeto)
+
+        # Estados vivos: los que alcanzan algún final (recorrido inverso)
+        inversa = {}
+        for s, t in dfa_trans.items():
+            for d in t.values():
+                inversa.setdefault(d, []).append(s)
+        vivos = set(self.finales)
+        pila = list(vivos)
+        while pila:
+            s = pila.pop()
+            for p in inversa.get(s, ()):
+                if p not in vivos:
+                    vivos.add(p)
+                    pila.append(p)
+        self.vivos = vivos
+
+    @classmethod
+    def desde_regex(cls, regex: str) -> "AFD":
+        return cls(*regex_a_dfa_directo(regex))
+
+    def siguiente(self, estado, simbolo):
+        if estado is None:
+            return None
+        return self.trans.get(estado, {}).get(simbolo)
+
+    def es_final(self, estado) -> bool:
+        return estado in self.finales
+
+    def es_muerto(self, estado) -> bool:
+        return estado is None or estado not in self.vivos
+
+
+class Complemento:
+    """Σ* − L(a), con Σ cualquier alfabeto: los símbolos ajenos llevan al muerto de a."""
+
+    def __init__(self, a, alfabeto: Optional[Set[str]] = None):
+        self.a = a
+        self.alfabeto = set(alfabeto) if alfabeto is not None else set(a.alfabeto)
+        self.inicial = a.inicial
+
+    def siguiente(self, estado, simbolo):
+        return self.a.siguiente(estado, simbolo)
+
+    def es_final(self, estado) -> bool:
+        return not self.a.es_final(estado)
+
+    def es_muerto(self, estado) -> bool:
+        return False
+
+
+class Producto:
+    """Producto perezoso de dos autómatas; `modo` decide qué pares son finales."""
+
+    MODOS = ("interseccion", "union", "diferencia")
+
+    def __init__(self, a, b, modo: str):
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo de producto desconocido: {modo}")
+        self.a = a
+        self.b = b
+        self.modo = modo
+        self.alfabeto = a.alfabeto | b.alfabeto
+        self.inicial = (a.inicial, b.inicial)
+
+    def siguiente(self, estado, simbolo):
+        if estado is None:
+            return None
+        sa, sb = estado
+        nuevo = (self.a.siguiente(sa, simbolo), self.b.siguiente(sb, simbolo))
+        return None if self.es_muerto(nuevo) else nuevo
+
+    def es_final(self, estado) -> bool:
+        if estado is None:
+            return False
+        fa = self.a.es_final(estado[0])
+        fb = self.b.es_final(estado[1])
+        if self.modo == "interseccion":
+            return fa and fb
+        if self.modo == "union":
+            return fa or fb
+        return fa and not fb
+
+    def es_muerto(self, estado) -> bool:
+        if estado is None:
+            return True
+        ma = self.a.es_muerto(estado[0])
+        mb = self.b.es_muerto(estado[1])
+        if self.modo == "interseccion":
+            return ma or mb
+        if self.modo == "union":
+            return ma and mb
+        return ma
+
+
+def interseccion(a, b) -> Producto:
+    return Producto(a, b, "interseccion")
+
+
+def union(a, b) -> Producto:
+    return Producto(a, b, "union")
+
+
+def diferencia(a, b) -> Producto:
+    return Producto(a, b, "diferencia")
+
+
+def complemento(a, alfabeto: Optional[Set[str]] = None) -> Complemento:
+    return Complemento(a, alfabeto)
+
+
+def testigo(automata, max_estados: Optional[int] = None) -> Optional[str]:
+    """
+    Cadena más corta aceptada (en orden de longitud y luego alfabético),
+    o None si el lenguaje es vacío. Se detiene en cuanto la encuentra.
+    """
+    inicial = automata.inicial
+    if automata.es_muerto(inicial):
+        return None
+    if automata.es_final(inicial):
+        return ""
+    alfabeto = sorted(automata.alfabeto)
+    padre = {inicial: None}
+    cola = deque([inicial])
+    while cola:
+        estado = cola.popleft()
+        for a in alfabeto:
+            nuevo = automata.siguiente(estado, a)
+            if nuevo in padre or automata.es_muerto(nuevo):
+                continue
+            padre[nuevo] = (estado, a)
+            if automata.es_final(nuevo):
+                simbolos = []
+                while padre[nuevo] is not None:
+                    nuevo, c = padre[nuevo]
+                    simbolos.append(c)
+                return "".join(reversed(simbolos))
+            if max_estados is not None and len(padre) > max_estados:
+                raise ValueError(f"Se superaron {max_estados} estados del producto.")
+            cola.append(nuevo)
+    return None
+
+
+def es_vacio(automata) -> bool:
+    return testigo(automata) is None
+
+
+def incluido(a, b) -> Tuple[bool, Optional[str]]:
+    """¿L(a) ⊆ L(b)? Retorna (resultado, contraejemplo de L(a) − L(b) o None)."""
+    w = testigo(diferencia(a, b))
+    return w is None, w
+
+
+def se_solapan(a, b) -> Tuple[bool, Optional[str]]:
+    """¿L(a) ∩ L(b) ≠ ∅? Retorna (resultado, cadena común o None)."""
+    w = testigo(interseccion(a, b))
+    return w is not None, w
+
+
+def materializar(automata):
+    """
+    Parte alcanzable y viva del autómata como AFD explícito:
+    (dfa_states, dfa_start, dfa_accepts, dfa_trans, alfabeto).
+    """
+    alfabeto = sorted(automata.alfabeto)
+    ids = {automata.inicial: 0}
+    dfa_states = {0: automata.inicial}
+    dfa_trans = {}
+    dfa_accepts = set()
+    cola = deque([automata.inicial])
+    while cola:
+        estado = cola.popleft()
+        sid = ids[estado]
+        if automata.es_final(estado):
+            dfa_accepts.add(sid)
+        dfa_trans[sid] = {}
+        if automata.es_muerto(estado):
+            continue
+        for a in alfabeto:
+            nuevo = automata.siguiente(estado, a)
+            if automata.es_muerto(nuevo):
+                continue
+            if nuevo not in ids:
+                ids[nuevo] = len(ids)
+                dfa_states[ids[nuevo]] = nuevo
+                cola.append(nuevo)
+            dfa_trans[sid][a] = ids[nuevo]
+    return dfa_states, 0, dfa_accepts, dfa_trans, set(alfabeto)
@@ -0,0 +1,298 @@
+# earley.py
+"""
+Parser de Earley para cualquier gramática libre de contexto (sin pasar a
+FNC) con bosque de análisis compartido y empaquetado (SPPF).
+
+El bosque representa todas las derivaciones de una cadena en espacio
+polinomial, así que contar los árboles distintos (y decidir si la cadena es
+ambigua) cuesta lo mismo que construirlo, aunque haya exponencialmente
+muchos árboles.
+
+Nodos del bosque (claves en el diccionario `familias`):
+    ("S", A, i, j)        no terminal A que genera cadena[i:j]
+    ("I", pid, k, i, j)   prefijo rhs[:k] de la producción pid sobre cadena[i:j]
+    ("T", a, i)           terminal a en la posición i
+Cada familia es una tupla de nodos hijos (una alternativa empaquetada).
+"""
+import math
+from typing import Dict, List, Optional, Tuple
+
+from grammar_parser import Grammar
+from automata import EPS
+
+
+class ParserEarley:
+
+    def __init__(self, grammar: Grammar):
+        NT = grammar.nonterminals
+        for p in grammar.productions:
+            if len(p.lhs) != 1 or p.lhs not in NT:
+                raise ValueError(
+                    f"{p.lhs} -> {p.rhs}: Earley requiere una gramática libre de contexto (Tipo 2)."
+                )
+        self.grammar = grammar
+        self.prods: List[Tuple[str, str]] = [(p.lhs, p.rhs) for p in grammar.productions]
+        self.por_lhs: Dict[str, List[int]] = {A: [] for A in NT}
+        for pid, (A, _) in enumerate(self.prods):
+            self.por_lhs[A].append(pid)
+
+        anulables = set()
+        cambio = True
+        while cambio:
+            cambio = False
+            for A, rhs in self.prods:
+                if A not in anulables and all(ch in anulables for ch in rhs):
+                    anulables.add(A)
+                    cambio = True
+        self.anulables = anulables
+
+    def _chart(self, cadena: str):
+        """
+        Construye los conjuntos de Earley. Cada conjunto es un dict
+        item -> None (orden de inserción) con items (pid, punto, origen).
+        Se usa la corrección de Aycock-Horspool para los anulables.
+        """
+        NT = self.grammar.nonterminals
+        n = len(cadena)
+        conjuntos = [dict() for _ in range(n + 1)]
+        # esperando[i][X]: items de conjuntos[i] con el punto antes de X
+        esperando = [dict() for _ in range(n + 1)]
+
+        for pid in self.por_lhs.get(self.grammar.start_symbol, []):
+            conjuntos[0][(pid, 0, 0)] = None
+
+        for actual in range(n + 1):
+            trabajo = list(conjuntos[actual])
+
+            def agregar(item):
+                if item not in conjuntos[actual]:
+                    conjuntos[actual][item] = None
+                    trabajo.append(item)
+
+            while trabajo:
+                item = trabajo.pop()
+                pid, punto, origen = item
+                A, rhs = self.prods[pid]
+                if punto < len(rhs):
+                    X = rhs[punto]
+                    if X in NT:
+                        esperando[actual].setdefault(X, []).append(item)
+                        for q in self.por_lhs.get(X, []):
+                            agregar((q, 0, actual))
+                        if X in self.anulables:
+                            agregar((pid, punto + 1, origen))
+                    elif actual < n and cadena[actual] == X:
+                        conjuntos[actual + 1][(pid, punto + 1, origen)] = None
+                else:
+                    for (q, d, o) in list(esperando[origen].get(A, [])):
+                        agregar((q, d + 1, o))
+        return conjuntos
+
+    def reconocer(self, cadena: str) -> bool:
+        conjuntos = self._chart(cadena)
+        final = conjuntos[len(cadena)]
+        return any(
+            (pid, len(self.prods[pid][1]), 0) in final
+            for pid in self.por_lhs.get(self.grammar.start_symbol, [])
+        )
+
+    def bosque(self, cadena: str) -> Optional["BosqueSPPF"]:
+        """SPPF de todas las derivaciones de la cadena, o None si no pertenece."""
+        conjuntos = self._chart(cadena)
+        n = len(cadena)
+        NT = self.grammar.nonterminals
+
+        # completados[j][X] = orígenes i con X =>* cadena[i:j]
+        completados = [dict() for _ in range(n + 1)]
+        for j, conjunto in enumerate(conjuntos):
+            for pid, punto, origen in conjunto:
+                A, rhs = self.prods[pid]
+                if punto == len(rhs):
+                    completados[j].setdefault(A, set()).add(origen)
+
+        raiz = ("S", self.grammar.start_symbol, 0, n)
+        if 0 not in completados[n].get(self.grammar.start_symbol, ()):
+            return None
+
+        familias: Dict[tuple, List[tuple]] = {}
+        pendientes = [raiz]
+        while pendientes:
+            nodo = pendientes.pop()
+            if nodo in familias:
+                continue
+            fams: List[tuple] = []
+            if nodo[0] == "S":
+                _, A, i, j = nodo
+                for pid in self.por_lhs.get(A, []):
+                    L = len(self.prods[pid][1])
+                    if (pid, L, i) in conjuntos[j]:
+                        fams.append(((("I", pid, L, i, j),) if L else ()))
+            elif nodo[0] == "I":
+                _, pid, k, i, j = nodo
+                X = self.prods[pid][1][k - 1]
+                if X in NT:
+                    cortes = [m for m in completados[j].get(X, ()) if i <= m]
+                else:
+                    cortes = [j - 1] if j > i and cadena[j - 1] == X else []
+                for m in sorted(cortes):
+                    if k == 1:
+                        if m != i:
+                            continue
+                        izquierda = ()
+                    else:
+                        if (pid, k - 1, i) not in conjuntos[m]:
+                            continue
+                        izquierda = (("I", pid, k - 1, i, m),)
+                    derecha = ("S", X, m, j) if X in NT else ("T", X, m)
+                    fams.append(izquierda + (derecha,))
+            familias[nodo] = fams
+            for fam in fams:
+                for hijo in fam:
+                    if hijo[0] != "T" and hijo not in familias:
+                        pendientes.append(hijo)
+
+        return BosqueSPPF(self, cadena, raiz, familias)
+
+
+class BosqueSPPF:
+
+    def __init__(self, parser: ParserEarley, cadena: str, raiz, familias):
+        self.parser = parser
+        self.cadena = cadena
+        self.raiz = raiz
+        self.familias = familias
+        self._conteo = None
+        self._finitos = None
+
+    def __len__(self):
+        return len(self.familias)
+
+    def _contar(self, ignorar_ciclos: bool):
+        """
+        Conteo de árboles por nodo en post-orden iterativo. Un ciclo
+        alcanzable (A =>+ A sobre el mismo tramo) da infinitos árboles;
+        con ignorar_ciclos las familias que lo cierran cuentan 0.
+
+        Retorna (conteo por nodo, peso de cada familia por nodo).
+        """
+        conteo: Dict[tuple, float] = {}
+        pesos: Dict[tuple, List[float]] = {}
+        en_curso = set()
+        pila = [(self.raiz, False)]
+        while pila:
+            nodo, listo = pila.pop()
+            if listo:
+                pesos_nodo = []
+                for fam in self.familias[nodo]:
+                    prod = 1
+                    for hijo in fam:
+                        if hijo[0] == "T":
+                            continue
+                        if hijo not in conteo:
+                            # hijo todavía en curso: la familia cierra un ciclo
+                            c = 0 if ignorar_ciclos else math.inf
+                        else:
+                            c = conteo[hijo]
+                        prod = prod * c if prod and c else 0
+                    pesos_nodo.append(prod)
+                conteo[nodo] = sum(pesos_nodo)
+                pesos[nodo] = pesos_nodo
+                en_curso.discard(nodo)
+                continue
+            if nodo in conteo or nodo in en_curso:
+                continue
+            en_curso.add(nodo)
+            pila.append((nodo, True))
+            for fam in self.familias[nodo]:
+                for hijo in fam:
+                    if hijo[0] != "T" and hijo not in conteo and hijo not in en_curso:
+                        pila.append((hijo, False))
+        return conteo, pesos
+
+    def contar_arboles(self):
+        """Número de árboles de derivación distintos (math.inf si hay ciclos)."""
+        if self._conteo is None:
+            self._conteo, _ = self._contar(ignorar_ciclos=False)
+        return self._conteo[self.raiz]
+
+    def es_ambigua(self) -> bool:
+        return self.contar_arboles() > 1
+
+    def arbol(self, indice: int):
+        """
+        Árbol número `indice` (0-based) sin enumerar los anteriores: se
+        "desordena" el índice con los conteos de cada nodo. Un árbol es
+        (símbolo, [hijos]) y las hojas son terminales (str).
+        """
+        if self._finitos is None:
+            self._finitos = self._contar(ignorar_ciclos=True)
+        conteo, pesos = self._finitos
+        if not 0 <= indice < conteo[self.raiz]:
+            raise IndexError(indice)
+
+        def valor(hijo):
+            return 1 if hijo[0] == "T" else conteo[hijo]
+
+        raiz_hijos: List = []
+        pila = [(self.raiz, indice, raiz_hijos)]
+        while pila:
+            nodo, r, destino = pila.pop()
+            if nodo[0] == "T":
+                destino.append(nodo[1])
+                continue
+
+            # Las familias con peso 0 (las que cierran ciclos) nunca se eligen
+            for fam, peso in zip(self.familias[nodo], pesos[nodo]):
+                if r < peso:
+                    break
+                r -= peso
+
+            if nodo[0] == "S":
+                hijos: List = []
+                destino.append((nodo[1], hijos if fam else [EPS]))
+                destino = hijos
+
+            # Rango mixto: el primer hijo varía más lento
+            rangos = []
+            for hijo in reversed(fam):
+                v = valor(hijo)
+                rangos.append(r % v)
+                r //= v
+            rangos.reverse()
+            for hijo, rh in reversed(list(zip(fam, rangos))):
+                pila.append((hijo, rh, destino))
+
+        return raiz_hijos[0]
+
+    def arboles(self, limite: int = 10):
+        """Hasta `limite` árboles distintos del bosque."""
+        if self._finitos is None:
+            self._finitos = self._contar(ignorar_ciclos=True)
+        total = self._finitos[0][self.raiz]
+        return [self.arbol(i) for i in range(min(limite, total))]
+
+
+def arbol_a_texto(arbol) -> str:
+    """Notación con corchetes: S(a S(ε) b)."""
+    partes = []
+    pila = [arbol]
+    while pila:
+        x = pila.pop()
+        if isinstance(x, str):
+            partes.append(x)
+            continue
+        simbolo, hijos = x
+        partes.append(simbolo + "(")
+        pila.append(")")
+        for i, h in enumerate(reversed(hijos)):
+            pila.append(h)
+            if i < len(hijos) - 1:
+                pila.append(" ")
+    # ")" y " " se agregan como texto suelto
+    return "".join(partes)
+
+
+def contar_arboles(grammar: Grammar, cadena: str):
+    """0 si la cadena no pertenece; si no, número de árboles de derivación."""
+    bosque = ParserEarley(grammar).bosque(cadena)
+    return 0 if bosque is None else bosque.contar_arboles()
@@ -0,0 +1,136 @@
+# grammar_generator.py
+import random
+from typing import Iterator, List, Optional, Set
+
+from grammar_parser import Grammar, Production
+
+NO_TERMINALES = "SABCDEFGHIJKLMNOPQRTUVWXYZ"
+TERMINALES = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def _validar(tipo: int, n_nt: int, n_t: int, n_prod: int, max_rhs: int, recursion: float):
+    if tipo not in (0, 1, 2, 3):
+        raise ValueError(f"Tipo de gramática inválido: {tipo}")
+    if not 1 <= n_nt <= len(NO_TERMINALES):
+        raise ValueError(f"El número de no terminales debe estar entre 1 y {len(NO_TERMINALES)}.")
+    if not 1 <= n_t <= len(TERMINALES):
+        raise ValueError(f"El número de terminales debe estar entre 1 y {len(TERMINALES)}.")
+    if n_prod < 1 or max_rhs < 1:
+        raise ValueError("Se necesita al menos una producción con lado derecho no vacío.")
+    if not 0.0 <= recursion <= 1.0:
+        raise ValueError("La densidad de recursión debe estar entre 0 y 1.")
+    if tipo == 2 and max_rhs < 2 and n_nt < 2:
+        raise ValueError("Con un solo no terminal y |RHS| <= 1 toda GLC es regular.")
+
+
+def _rhs_regular(rng, nts, ts, max_rhs, recursion, con_nt=None) -> str:
+    if con_nt is None:
+        con_nt = max_rhs >= 2 and rng.random() < recursion
+    k = rng.randint(1, max_rhs - 1 if con_nt else max_rhs)
+    rhs = "".join(rng.choice(ts) for _ in range(k))
+    if con_nt:
+        rhs += rng.choice(nts)
+    return rhs
+
+
+def _cadena(rng, nts, ts, largo, recursion) -> str:
+    return "".join(
+        rng.choice(nts) if rng.random() < recursion else rng.choice(ts)
+        for _ in range(largo)
+    )
+
+
+def generar_gramatica_aleatoria(
+    tipo: int,
+    n_nt: int = 3,
+    n_t: int = 2,
+    n_prod: int = 6,
+    max_rhs: int = 3,
+    recursion: float = 0.4,
+    rng: Optional[random.Random] = None,
+) -> Grammar:
+    """
+    Genera una gramática aleatoria cuyo tipo MÁS RESTRICTIVO es exactamente
+    `tipo` (lo que devolvería classify_grammar).
+
+    - n_nt / n_t: cantidad de no terminales y terminales disponibles.
+    - n_prod: cantidad de producciones (al menos una por no terminal).
+    - max_rhs: longitud máxima del lado derecho (en Tipo 1 se suma a |LHS|).
+    - recursion: probabilidad de que un símbolo del RHS sea no terminal.
+    """
+    _validar(tipo, n_nt, n_t, n_prod, max_rhs, recursion)
+    rng = rng or random.Random()
+    nts = NO_TERMINALES[:n_nt]
+    ts = TERMINALES[:n_t]
+    n_prod = max(n_prod, n_nt)
+
+    producciones: List[Production] = []
+    vistas: Set[tuple] = set()
+
+    def agregar(lhs, rhs) -> bool:
+        if (lhs, rhs) in vistas:
+            return False
+        vistas.add((lhs, rhs))
+        producciones.append(Production(lhs, rhs))
+        return True
+
+    # Una regla "testigo" que fija el tipo exacto
+    if tipo == 2:
+        if max_rhs >= 2:
+            agregar(rng.choice(nts), rng.choice(nts) + rng.choice(ts))
+        else:
+            agregar(rng.choice(nts[1:]), "")
+    elif tipo in (1, 0):
+        largo_lhs = rng.randint(2, max(2, min(3, max_rhs)))
+        lhs = rng.choice(nts) + _cadena(rng, nts, ts, largo_lhs - 1, recursion)
+        if tipo == 1:
+            rhs = _cadena(rng, nts, ts, rng.randint(largo_lhs, largo_lhs + max_rhs - 1), recursion)
+        else:
+            rhs = _cadena(rng, nts, ts, rng.randint(0, largo_lhs - 1), recursion)
+        agregar(lhs, rhs)
+
+    # Cada no terminal con al menos una salida terminal (lenguaje no trivial)
+    for nt in nts:
+        agregar(nt, _rhs_regular(rng, nts, ts, max_rhs, recursion, con_nt=False))
+
+    intentos = 0
+    while len(producciones) < n_prod and intentos < 20 * n_prod:
+        intentos += 1
+        lhs = rng.choice(nts)
+        if tipo == 3:
+            agregar(lhs, _rhs_regular(rng, nts, ts, max_rhs, recursion))
+        elif tipo == 2:
+            agregar(lhs, _cadena(rng, nts, ts, rng.randint(0, max_rhs), recursion))
+        else:
+            # Tipo 1 no admite ε; en Tipo 0 lo evitamos para no duplicar la regla testigo
+            agregar(lhs, _cadena(rng, nts, ts, rng.randint(1, max_rhs), recursion))
+
+    nonterminals = set(nts)
+    terminals = set()
+    for p in producciones:
+        for ch in p.lhs + p.rhs:
+            (nonterminals if ch.isupper() else terminals).add(ch)
+
+    return Grammar(
+        nonterminals=nonterminals,
+        terminals=terminals,
+        productions=producciones,
+        start_symbol="S",
+    )
+
+
+def generar_gramaticas(
+    tipo: int,
+    cantidad: Optional[int] = None,
+    semilla: int = 0,
+    **parametros,
+) -> Iterator[Grammar]:
+    """
+    Flujo determinista de gramáticas aleatorias: la misma semilla produce
+    siempre la misma secuencia. Con cantidad=None el flujo es infinito.
+    """
+    rng = random.Random(semilla)
+    i = 0
+    while cantidad is None or i < cantidad:
+        yield generar_gramatica_aleatoria(tipo, rng=rng, **parametros)
+        i += 1
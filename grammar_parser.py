@@ -90,3 +90,23 @@ class GrammarParser:
             productions=productions,
             start_symbol=start_symbol,
         )
+
+
+def grammar_key(grammar: Grammar) -> tuple:
+    """
+    Clave canónica (hashable) de una gramática: no depende del orden de las
+    producciones ni de duplicados. Se usa para cachear resultados por gramática.
+    """
+    return (
+        grammar.start_symbol,
+        tuple(sorted({(p.lhs, p.rhs) for p in grammar.productions})),
+        tuple(sorted(grammar.nonterminals)),
+        tuple(sorted(grammar.terminals)),
+    )
+
+
+def format_grammar(grammar: Grammar) -> str:
+    """Texto de la gramática, una producción por línea (ε para la cadena vacía)."""
+    return "\n".join(
+        f"{p.lhs} -> {p.rhs if p.rhs != '' else 'ε'}" for p in grammar.productions
+    )
@@ -0,0 +1,666 @@
+# language.py
+import math
+from array import array
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from grammar_parser import Grammar
+
+
+class RegistroDerivaciones:
+    """
+    Guarda cómo se llegó a cada forma sentencial de la búsqueda sin copiar
+    cadenas: cada estado es un registro (padre, producción, posición) en
+    arreglos compactos (12 bytes por estado). La derivación completa de una
+    cadena se reconstruye rehaciendo los pasos desde el símbolo inicial.
+    """
+
+    def __init__(self, grammar: Grammar):
+        self.grammar = grammar
+        self.padre = array("i", [-1])
+        self.produccion = array("i", [-1])
+        self.posicion = array("i", [-1])
+        self.aceptadas: Dict[str, int] = {}
+
+    def nuevo_estado(self, padre: int, produccion: int, posicion: int) -> int:
+        self.padre.append(padre)
+        self.produccion.append(produccion)
+        self.posicion.append(posicion)
+        return len(self.padre) - 1
+
+    def __len__(self):
+        return len(self.padre)
+
+    def derivacion(self, cadena: str) -> Optional[List[str]]:
+        """Formas sentenciales desde el símbolo inicial hasta la cadena (o None)."""
+        sid = self.aceptadas.get(cadena)
+        if sid is None:
+            return None
+
+        pasos = []
+        while sid > 0:
+            pasos.append((self.produccion[sid], self.posicion[sid]))
+            sid = self.padre[sid]
+
+        forma = self.grammar.start_symbol
+        formas = [forma]
+        for pid, pos in reversed(pasos):
+            rhs = self.grammar.productions[pid].rhs
+            forma = forma[:pos] + rhs + forma[pos + 1:]
+            formas.append(forma)
+        return formas
+
+
+def generar_cadenas(
+    grammar: Grammar,
+    max_len: int,
+    max_expansiones: int = 2000,
+    registro: Optional[RegistroDerivaciones] = None,
+    memoria_max: Optional[int] = None,
+    desborde: str = "disco",
+    fp_rate: float = 0.01,
+):
+    """
+    Cadenas de hasta max_len terminales alcanzadas en max_expansiones pasos.
+
+    Con memoria_max (bytes) el presupuesto se reparte en partes iguales
+    entre el conjunto de visitados y la frontera de la búsqueda, ambos con
+    las formas codificadas. Al superar su mitad, los visitados se vuelcan a
+    disco o pasan a un filtro de Bloom según `desborde`, y la frontera se
+    vuelca a disco sin cambiar el orden de la búsqueda (ver visited_set).
+
+    Si el lenguaje es vacío o finito (language_analysis) el resultado es
+    exacto y no se gasta el presupuesto; con `registro` igual se busca,
+    para tener las derivaciones.
+    """
+    from language_analysis import analizar_cacheado
+
+    # Lenguaje vacío o finito: se responde sin buscar
+    analisis = analizar_cacheado(grammar)
+    if analisis is not None:
+        if analisis.vacio:
+            return set()
+        if analisis.lenguaje is not None and registro is None:
+            return {w for w in analisis.lenguaje if len(w) <= max_len}
+
+    if memoria_max is None:
+        return _buscar(grammar, max_len, max_expansiones, registro, {grammar.start_symbol})
+
+    from visited_set import ColaFormas, ConjuntoVisitados
+
+    simbolos = _simbolos(grammar)
+    with ConjuntoVisitados(simbolos, memoria_max // 2, desborde, fp_rate) as visitados, \
+            ColaFormas(simbolos, memoria_max // 2) as frontera:
+        visitados.add(grammar.start_symbol)
+        return _buscar(grammar, max_len, max_expansiones, registro, visitados, frontera)
+
+
+def _simbolos(grammar: Grammar) -> set:
+    simbolos = set(grammar.start_symbol)
+    for p in grammar.productions:
+        simbolos.update(p.lhs, p.rhs)
+    return simbolos
+
+
+def longitudes_minimas(grammar: Grammar) -> Dict[str, float]:
+    """
+    Largo mínimo de cadena terminal que genera cada no terminal (punto
+    fijo sobre las producciones con un solo no terminal a la izquierda).
+    Los no terminales que no generan ninguna cadena quedan en math.inf.
+    """
+    NT = grammar.nonterminals
+    minimos: Dict[str, float] = {A: math.inf for A in NT}
+    cambio = True
+    while cambio:
+        cambio = False
+        for p in grammar.productions:
+            if p.lhs not in minimos:
+                continue
+            largo = sum(minimos[ch] if ch in NT else 1 for ch in p.rhs)
+            if largo < minimos[p.lhs]:
+                minimos[p.lhs] = largo
+                cambio = True
+    return minimos
+
+
+def _buscar(grammar: Grammar, max_len: int, max_expansiones: int, registro, visitados, frontera=None):
+    NT = grammar.nonterminals
+    from collections import deque
+
+    # Cota válida: una forma nunca produce menos terminales que la suma de
+    # los mínimos de sus símbolos, así que se descarta si esa suma > max_len.
+    minimos = longitudes_minimas(grammar)
+    delta = [
+        sum(minimos[ch] if ch in NT else 1 for ch in p.rhs) - minimos.get(p.lhs, math.inf)
+        for p in grammar.productions
+    ]
+
+    inicial = grammar.start_symbol
+    minimo_inicial = minimos.get(inicial, math.inf) if inicial in NT else len(inicial)
+    if minimo_inicial > max_len:
+        return set()
+
+    # Cada elemento: (forma sentencial, id de estado en el registro o -1, largo mínimo)
+    q = deque() if frontera is None else frontera
+    q.append((inicial, 0, minimo_inicial))
+    cadenas = set()
+    expansiones = 0
+
+    while q and expansiones < max_expansiones:
+        actual, sid, minimo = q.popleft()
+        expansiones += 1
+
+        # Primer no terminal
+        idx_nt = None
+        for i, ch in enumerate(actual):
+            if ch in NT:
+                idx_nt = i
+                break
+
+        # Si ya es solo terminales (la cota garantiza len(actual) <= max_len)
+        if idx_nt is None:
+            cadenas.add(actual)
+            if registro is not None:
+                registro.aceptadas.setdefault(actual, sid)
+            continue
+
+        A = actual[idx_nt]
+
+        for pid, p in enumerate(grammar.productions):
+            if p.lhs != A:
+                continue
+            nuevo_minimo = minimo + delta[pid]
+            if nuevo_minimo > max_len:
+                continue
+            rhs = p.rhs  # "" representa epsilon
+            nuevo = actual[:idx_nt] + rhs + actual[idx_nt + 1:]
+            if nuevo not in visitados:
+                visitados.add(nuevo)
+                nuevo_sid = -1
+                if registro is not None:
+                    nuevo_sid = registro.nuevo_estado(sid, pid, idx_nt)
+                q.append((nuevo, nuevo_sid, nuevo_minimo))
+
+    return cadenas
+
+
+class GeneradorIncremental:
+    """
+    Generación del lenguaje por niveles de longitud que se puede reanudar.
+
+    El nivel b expande (a lo ancho, con la cota de largo mínimo) todas las
+    formas que pueden dar cadenas de largo <= b; las formas cuyo largo
+    mínimo supera b no se descartan sino que quedan diferidas para el nivel
+    en que entran. Pedir una cota mayor sólo procesa los niveles nuevos,
+    partiendo de la frontera y las diferidas que dejó el anterior.
+
+    Cada nivel tiene su propio presupuesto de `max_expansiones` y los
+    niveles se procesan siempre en orden. Al cerrar el nivel b se congelan
+    las cadenas de largo b halladas hasta ese momento; las que aparezcan en
+    niveles posteriores no se agregan, así que el resultado para una cota no
+    depende de qué cotas se pidieron antes.
+
+    A diferencia de generar_cadenas, la frontera y los visitados viven en
+    memoria (el generador se conserva entre llamadas); su crecimiento lo
+    acota `max_expansiones` por nivel.
+
+    Con `particion=(i, P)` el generador sólo recorre la parte i de P del
+    árbol de derivaciones: el símbolo inicial se expande a lo ancho hasta
+    tener al menos P formas y cada parte se queda con una de cada P. La
+    unión de las P partes da el mismo nivel que el generador completo
+    cuando todas lo completan; cada parte tiene su propio presupuesto.
+    """
+
+    def __init__(
+        self,
+        grammar: Grammar,
+        max_expansiones: int = 2000,
+        particion: Tuple[int, int] = (0, 1),
+    ):
+        from collections import deque
+        from language_analysis import analizar_cacheado
+
+        self.grammar = grammar
+        self.max_expansiones = max_expansiones
+        # niveles[b]: cadenas de largo b halladas al cerrar el nivel b
+        self.niveles: List[FrozenSet[str]] = []
+        self._encontradas: Dict[int, set] = {}
+        # completo[b]: el nivel b agotó su frontera (resultado exacto hasta b)
+        self.completo: List[bool] = []
+
+        self._lenguaje = None
+        analisis = analizar_cacheado(grammar)
+        if analisis is not None and (analisis.vacio or analisis.lenguaje is not None):
+            self._lenguaje = analisis.lenguaje
+
+        NT = grammar.nonterminals
+        self._minimos = longitudes_minimas(grammar)
+        self._delta = [
+            sum(self._minimos[ch] if ch in NT else 1 for ch in p.rhs)
+            - self._minimos.get(p.lhs, math.inf)
+            for p in grammar.productions
+        ]
+        inicial = grammar.start_symbol
+        minimo = self._minimos.get(inicial, math.inf) if inicial in NT else len(inicial)
+        self._frontera = deque()
+        self._diferidas: list = []
+        self._orden = 0
+        parte, partes = particion
+        if partes == 1:
+            semillas = [inicial] if minimo < math.inf else []
+        else:
+            if self._lenguaje is not None and parte != 0:
+                # Lenguaje ya conocido: lo entrega entero la parte 0
+                self._lenguaje = set()
+            semillas = self._semillas(inicial, partes)[parte::partes]
+        self._visitados = set(semillas)
+        for forma in semillas:
+            if any(ch in NT for ch in forma):
+                self._diferir(forma, self._minimo(forma))
+            else:
+                self._encontradas.setdefault(len(forma), set()).add(forma)
+
+    def _minimo(self, forma: str):
+        NT = self.grammar.nonterminals
+        return sum(self._minimos.get(ch, math.inf) if ch in NT else 1 for ch in forma)
+
+    def _semillas(self, inicial: str, partes: int) -> List[str]:
+        """Formas de la expansión a lo ancho desde el inicial, en orden fijo."""
+        from collections import deque
+
+        NT = self.grammar.nonterminals
+        if self._minimo(inicial) == math.inf:
+            return []
+        if not any(ch in NT for ch in inicial):
+            return [inicial]
+        abiertas = deque([inicial])
+        terminales: List[str] = []
+        vistas = {inicial}
+        expansiones = 0
+        # Tope de expansiones para gramáticas lineales, que no se ramifican
+        while abiertas and len(abiertas) < partes and expansiones < 4 * partes:
+            actual = abiertas.popleft()
+            expansiones += 1
+            idx_nt = next(i for i, ch in enumerate(actual) if ch in NT)
+            for p in self.grammar.productions:
+                if p.lhs != actual[idx_nt]:
+                    continue
+                nuevo = actual[:idx_nt] + p.rhs + actual[idx_nt + 1:]
+                if nuevo in vistas or self._minimo(nuevo) == math.inf:
+                    continue
+                vistas.add(nuevo)
+                if any(ch in NT for ch in nuevo):
+                    abiertas.append(nuevo)
+                else:
+                    terminales.append(nuevo)
+        return terminales + list(abiertas)
+
+    @property
+    def hasta(self) -> int:
+        return len(self.completo) - 1
+
+    def _diferir(self, forma: str, minimo):
+        import heapq
+
+        self._orden += 1
+        heapq.heappush(self._diferidas, (minimo, self._orden, forma))
+
+    def extender(self, max_len: int):
+        if self._lenguaje is not None:
+            for b in range(self.hasta + 1, max_len + 1):
+                self.niveles.append(frozenset(w for w in self._lenguaje if len(w) == b))
+                self.completo.append(True)
+            return
+        for b in range(self.hasta + 1, max_len + 1):
+            self._nivel(b)
+
+    def _nivel(self, b: int):
+        import heapq
+
+        NT = self.grammar.nonterminals
+        frontera = self._frontera
+        while self._diferidas and self._diferidas[0][0] <= b:
+            minimo, _, forma = heapq.heappop(self._diferidas)
+            frontera.append((forma, minimo))
+
+        expansiones = 0
+        while frontera and expansiones < self.max_expansiones:
+            actual, minimo = frontera.popleft()
+            expansiones += 1
+
+            idx_nt = None
+            for i, ch in enumerate(actual):
+                if ch in NT:
+                    idx_nt = i
+                    break
+            if idx_nt is None:
+                # Las de niveles ya cerrados no se agregan
+                if len(actual) >= b:
+                    self._encontradas.setdefault(len(actual), set()).add(actual)
+                continue
+
+            A = actual[idx_nt]
+            for pid, p in enumerate(self.grammar.productions):
+                if p.lhs != A:
+                    continue
+                nuevo_minimo = minimo + self._delta[pid]
+                if nuevo_minimo == math.inf:
+                    continue
+                nuevo = actual[:idx_nt] + p.rhs + actual[idx_nt + 1:]
+                if nuevo in self._visitados:
+                    continue
+                self._visitados.add(nuevo)
+                if nuevo_minimo > b:
+                    self._diferir(nuevo, nuevo_minimo)
+                else:
+                    frontera.append((nuevo, nuevo_minimo))
+
+        self.niveles.append(frozenset(self._encontradas.pop(b, ())))
+        self.completo.append(not frontera)
+
+    def cadenas(self, max_len: int) -> set:
+        self.extender(max_len)
+        resultado = set()
+        for k in range(max_len + 1):
+            resultado |= self.niveles[k]
+        return resultado
+
+    def cadenas_de_longitud(self, k: int) -> set:
+        self.extender(k)
+        return set(self.niveles[k])
+
+
+_GENERADORES: "OrderedDict[tuple, GeneradorIncremental]" = OrderedDict()
+MAX_GENERADORES = 32
+
+
+def generador_incremental(
+    grammar: Grammar,
+    max_expansiones: int = 2000,
+    particion: Tuple[int, int] = (0, 1),
+) -> GeneradorIncremental:
+    """Generador reanudable por gramática (clave canónica) y parte, con caché LRU."""
+    from grammar_parser import grammar_key
+
+    clave = (grammar_key(grammar), max_expansiones, particion)
+    gen = _GENERADORES.get(clave)
+    if gen is None:
+        gen = _GENERADORES[clave] = GeneradorIncremental(grammar, max_expansiones, particion)
+        if len(_GENERADORES) > MAX_GENERADORES:
+            _GENERADORES.popitem(last=False)
+    else:
+        _GENERADORES.move_to_end(clave)
+    return gen
+
+
+def buscar_cadena(
+    grammar: Grammar,
+    cadena: str,
+    max_expansiones: int = 20000,
+    registro: Optional[RegistroDerivaciones] = None,
+    memoria_max: Optional[int] = None,
+    desborde: str = "disco",
+    fp_rate: float = 0.01,
+) -> Tuple[bool, bool]:
+    """
+    Búsqueda dirigida a una cadena concreta. Como siempre se expande el no
+    terminal de más a la izquierda, los terminales antes del primer no
+    terminal (prefijo) y después del último (sufijo) ya no cambian; una
+    forma se descarta si no coinciden con la cadena, si tiene más
+    apariciones de algún terminal que la cadena o si su largo mínimo la
+    supera. Se expande primero la forma con menos caracteres por fijar.
+
+    Retorna (encontrada, exacto): exacto es True si se encontró o si se
+    agotó el espacio sin llegar al presupuesto (entonces no pertenece).
+    Sólo se aplican producciones con un no terminal a la izquierda, así que
+    para gramáticas que no son libres de contexto un negativo nunca es exacto.
+
+    `memoria_max`, `desborde` y `fp_rate` acotan los visitados y la cola
+    como en generar_cadenas; si los visitados pasan a Bloom, un negativo
+    tampoco es exacto.
+    """
+    import functools
+    import heapq
+    from language_analysis import _es_libre_de_contexto
+
+    NT = grammar.nonterminals
+    libre = _es_libre_de_contexto(grammar)
+    n = len(cadena)
+    minimos = longitudes_minimas(grammar)
+    delta = [
+        sum(minimos[ch] if ch in NT else 1 for ch in p.rhs) - minimos.get(p.lhs, math.inf)
+        for p in grammar.productions
+    ]
+
+    # Cada forma lleva su estado: largo del prefijo terminal (que es la
+    # posición del primer no terminal), largo del sufijo terminal y cuántas
+    # veces aparece cada terminal de la cadena. Al expandir sólo se revisa
+    # lo que cambia la producción, no la forma entera.
+    terminales = sorted(set(cadena))
+    indice = {t: k for k, t in enumerate(terminales)}
+    objetivo = [cadena.count(t) for t in terminales]
+    # Por producción: (uso de cada terminal, terminales al inicio y al final
+    # del lado derecho, si tiene no terminales); None si usa un terminal que
+    # no está en la cadena.
+    info = []
+    for p in grammar.productions:
+        uso = {}
+        for ch in p.rhs:
+            if ch not in NT:
+                uso[indice.get(ch, -1)] = uso.get(indice.get(ch, -1), 0) + 1
+        if -1 in uso:
+            info.append(None)
+            continue
+        inicio = 0
+        while inicio < len(p.rhs) and p.rhs[inicio] not in NT:
+            inicio += 1
+        final = 0
+        while final < len(p.rhs) - inicio and p.rhs[len(p.rhs) - 1 - final] not in NT:
+            final += 1
+        info.append((tuple(uso.items()), inicio, final, inicio < len(p.rhs)))
+
+    def estado_inicial(forma: str):
+        """(prefijo, sufijo, cuentas) de una forma completa, o None si no es compatible."""
+        cuenta = [0] * len(terminales)
+        for ch in forma:
+            if ch not in NT:
+                if ch not in indice:
+                    return None
+                cuenta[indice[ch]] += 1
+        if any(c > o for c, o in zip(cuenta, objetivo)):
+            return None
+        i = 0
+        while i < len(forma) and forma[i] not in NT:
+            i += 1
+        if i == len(forma):
+            return (i, 0, cuenta) if forma == cadena else None
+        j = len(forma)
+        while forma[j - 1] not in NT:
+            j -= 1
+        sufijo = len(forma) - j
+        if i + sufijo > n or forma[:i] != cadena[:i] or forma[j:] != cadena[n - sufijo:]:
+            return None
+        return i, sufijo, cuenta
+
+    def expandir(actual: str, i: int, sufijo: int, cuenta, pid: int, nuevo: str):
+        """Estado de `nuevo` (actual con la producción pid en la posición i), o None."""
+        datos = info[pid]
+        if datos is None:
+            return None
+        uso, inicio, final, con_nt = datos
+        if uso:
+            cuenta = list(cuenta)
+            for k, veces in uso:
+                cuenta[k] += veces
+                if cuenta[k] > objetivo[k]:
+                    return None
+        # El no terminal en i es el único si no hay otro antes del sufijo
+        unico = len(actual) - sufijo - 1 == i
+        if con_nt:
+            nuevo_i = i + inicio
+            if unico and final:
+                fin = len(nuevo) - sufijo
+                if nuevo[fin - final:fin] != cadena[n - sufijo - final:n - sufijo]:
+                    return None
+                sufijo += final
+        elif unico:
+            # Forma terminal: prefijo y sufijo ya coinciden, falta el medio
+            if len(nuevo) != n or nuevo[i:n - sufijo] != cadena[i:n - sufijo]:
+                return None
+            return n, 0, cuenta
+        else:
+            nuevo_i = i + inicio
+            while nuevo[nuevo_i] not in NT:
+                nuevo_i += 1
+        if nuevo_i + sufijo > n or nuevo[i:nuevo_i] != cadena[i:nuevo_i]:
+            return None
+        return nuevo_i, sufijo, cuenta
+
+    inicial = grammar.start_symbol
+    minimo_inicial = minimos.get(inicial, math.inf) if inicial in NT else len(inicial)
+    estado = estado_inicial(inicial) if minimo_inicial <= n else None
+    if estado is None:
+        return False, libre
+    prefijo, sufijo_inicial, cuenta_inicial = estado
+
+    def recorrer(visitados, cola) -> Tuple[bool, bool]:
+        if isinstance(cola, list):
+            meter = functools.partial(heapq.heappush, cola)
+            sacar = functools.partial(heapq.heappop, cola)
+        else:
+            meter, sacar = cola.push, cola.pop
+        contador = 0
+        # (caracteres sin fijar, holgura de largo, orden de llegada, forma, id,
+        #  mínimo, sufijo, *cuentas)
+        meter((n - prefijo, n - minimo_inicial, contador, inicial, 0, minimo_inicial,
+               sufijo_inicial, *cuenta_inicial))
+        expansiones = 0
+
+        while cola and expansiones < max_expansiones:
+            sin_fijar, _, _, actual, sid, minimo, sufijo, *cuenta = sacar()
+            expansiones += 1
+
+            idx_nt = n - sin_fijar
+            if idx_nt == len(actual):
+                # Sólo entran formas terminales iguales a la cadena
+                if registro is not None:
+                    registro.aceptadas.setdefault(actual, sid)
+                return True, True
+
+            A = actual[idx_nt]
+            for pid, p in enumerate(grammar.productions):
+                if p.lhs != A:
+                    continue
+                nuevo_minimo = minimo + delta[pid]
+                if nuevo_minimo > n:
+                    continue
+                nuevo = actual[:idx_nt] + p.rhs + actual[idx_nt + 1:]
+                # Antes que visitados: descarta sin codificar ni hashear la forma
+                estado = expandir(actual, idx_nt, sufijo, cuenta, pid, nuevo)
+                if estado is None or nuevo in visitados:
+                    continue
+                nuevo_prefijo, nuevo_sufijo, nueva_cuenta = estado
+                visitados.add(nuevo)
+                nuevo_sid = -1
+                if registro is not None:
+                    nuevo_sid = registro.nuevo_estado(sid, pid, idx_nt)
+                contador += 1
+                meter((n - nuevo_prefijo, n - nuevo_minimo, contador, nuevo, nuevo_sid,
+                       nuevo_minimo, nuevo_sufijo, *nueva_cuenta))
+
+        return False, libre and not cola
+
+    if memoria_max is None:
+        return recorrer({inicial}, [])
+
+    from visited_set import ColaFormas, ConjuntoVisitados
+
+    simbolos = _simbolos(grammar)
+    with ConjuntoVisitados(simbolos, memoria_max // 2, desborde, fp_rate) as visitados, \
+            ColaFormas(simbolos, memoria_max // 2, n_prioridad=3,
+                       n_datos=3 + len(terminales)) as cola:
+        visitados.add(inicial)
+        encontrada, exacto = recorrer(visitados, cola)
+        # Con Bloom, un falso positivo pudo podar el camino hacia la cadena
+        return encontrada, exacto and not (desborde == "bloom" and visitados.desbordado)
+
+
+def _es_lineal_derecha(grammar: Grammar) -> bool:
+    """Producciones A -> a1...ak o A -> a1...akB (como en gramatica_regular_a_nfa)."""
+    NT = grammar.nonterminals
+    for p in grammar.productions:
+        if len(p.lhs) != 1 or p.lhs not in NT:
+            return False
+        if any(ch in NT for ch in p.rhs[:-1]):
+            return False
+    return True
+
+
+def _derivar_lineal(grammar: Grammar, cadena: str) -> Optional[List[str]]:
+    """
+    Camino de aceptación del AFN de la gramática: los estados son pares
+    (posición en la cadena, no terminal) y se recorren por posición, así
+    que el costo es O(|cadena| · |producciones|).
+    """
+    NT = grammar.nonterminals
+    n = len(cadena)
+    por_lhs: Dict[str, list] = {}
+    for p in grammar.productions:
+        destino = p.rhs[-1] if p.rhs and p.rhs[-1] in NT else None
+        terminales = p.rhs[:-1] if destino is not None else p.rhs
+        por_lhs.setdefault(p.lhs, []).append((terminales, destino))
+
+    inicial = (0, grammar.start_symbol)
+    previo = {inicial: None}
+    pendientes: List[list] = [[] for _ in range(n + 1)]
+    pendientes[0].append(grammar.start_symbol)
+    final = None
+    for pos in range(n + 1):
+        # La lista crece mientras se recorre por las producciones A -> B
+        for A in pendientes[pos]:
+            for terminales, destino in por_lhs.get(A, ()):
+                fin = pos + len(terminales)
+                if fin > n or not cadena.startswith(terminales, pos):
+                    continue
+                if destino is None:
+                    if fin == n:
+                        final = (pos, A)
+                        break
+                    continue
+                if (fin, destino) not in previo:
+                    previo[(fin, destino)] = (pos, A)
+                    pendientes[fin].append(destino)
+            if final is not None:
+                break
+        if final is not None:
+            break
+        pendientes[pos] = None
+
+    if final is None:
+        return None
+    camino = []
+    estado = final
+    while estado is not None:
+        camino.append(estado)
+        estado = previo[estado]
+    return [cadena[:pos] + A for pos, A in reversed(camino)] + [cadena]
+
+
+def derivar(
+    grammar: Grammar,
+    cadena: str,
+    max_expansiones: int = 20000,
+    memoria_max: Optional[int] = None,
+    desborde: str = "disco",
+) -> Optional[List[str]]:
+    """
+    Derivación más a la izquierda de la cadena, o None. Las gramáticas
+    lineales por la derecha se recorren como su AFN (posición, no terminal)
+    en tiempo lineal en la cadena; las demás usan la búsqueda dirigida.
+    """
+    if _es_lineal_derecha(grammar):
+        return _derivar_lineal(grammar, cadena)
+    registro = RegistroDerivaciones(grammar)
+    buscar_cadena(grammar, cadena, max_expansiones=max_expansiones, registro=registro,
+                  memoria_max=memoria_max, desborde=desborde)
+    return registro.derivacion(cadena)
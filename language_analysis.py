@@ -0,0 +1,259 @@
+# language_analysis.py
+"""
+Vacuidad y finitud de L(G) en tiempo lineal para gramáticas libres de
+contexto, para que las búsquedas no gasten su presupuesto en casos triviales.
+
+- Vacío: el símbolo inicial no es generador. Los generadores se obtienen
+  con una lista de trabajo que lleva, por producción, cuántos no terminales
+  del RHS faltan por ser generadores (cada ocurrencia se visita una vez).
+- Infinito: en el grafo de dependencias entre no terminales útiles hay una
+  componente fuertemente conexa con una arista "que crece" (A -> αBβ donde
+  αβ deriva alguna cadena no vacía). Los ciclos sólo de producciones
+  unitarias o anulables no agregan cadenas.
+
+Si el lenguaje es finito se calcula completo una sola vez (punto fijo sobre
+conjuntos de cadenas) y queda cacheado por la clave canónica de la gramática.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Set
+
+from grammar_parser import Grammar, grammar_key
+
+# Tope de cadenas al calcular un lenguaje finito completo
+LIMITE_FINITO = 100000
+
+
+@dataclass
+class AnalisisLenguaje:
+    vacio: bool
+    finito: bool
+    generadores: Set[str] = field(default_factory=set)
+    alcanzables: Set[str] = field(default_factory=set)
+    # Lenguaje completo si es finito y no supera LIMITE_FINITO
+    lenguaje: Optional[FrozenSet[str]] = None
+
+
+def _es_libre_de_contexto(grammar: Grammar) -> bool:
+    NT = grammar.nonterminals
+    return all(len(p.lhs) == 1 and p.lhs in NT for p in grammar.productions)
+
+
+def simbolos_generadores(grammar: Grammar) -> Set[str]:
+    NT = grammar.nonterminals
+    faltan = []
+    ocurrencias: Dict[str, List[int]] = {A: [] for A in NT}
+    trabajo = []
+    generadores: Set[str] = set()
+    for pid, p in enumerate(grammar.productions):
+        nts = [ch for ch in p.rhs if ch in NT]
+        faltan.append(len(nts))
+        for ch in nts:
+            ocurrencias[ch].append(pid)
+        if not nts and p.lhs not in generadores:
+            generadores.add(p.lhs)
+            trabajo.append(p.lhs)
+
+    while trabajo:
+        X = trabajo.pop()
+        for pid in ocurrencias[X]:
+            faltan[pid] -= 1
+            A = grammar.productions[pid].lhs
+            if faltan[pid] == 0 and A not in generadores:
+                generadores.add(A)
+                trabajo.append(A)
+    return generadores
+
+
+def _producciones_utiles(grammar: Grammar, generadores: Set[str]):
+    NT = grammar.nonterminals
+    return [
+        p for p in grammar.productions
+        if p.lhs in generadores and all(ch in generadores for ch in p.rhs if ch in NT)
+    ]
+
+
+def simbolos_alcanzables(grammar: Grammar, producciones=None) -> Set[str]:
+    NT = grammar.nonterminals
+    if producciones is None:
+        producciones = grammar.productions
+    por_lhs: Dict[str, List[str]] = {}
+    for p in producciones:
+        por_lhs.setdefault(p.lhs, []).append(p.rhs)
+    alcanzables = {grammar.start_symbol}
+    pila = [grammar.start_symbol]
+    while pila:
+        A = pila.pop()
+        for rhs in por_lhs.get(A, ()):
+            for ch in rhs:
+                if ch in NT and ch not in alcanzables:
+                    alcanzables.add(ch)
+                    pila.append(ch)
+    return alcanzables
+
+
+def _generan_no_vacia(grammar: Grammar, producciones) -> Set[str]:
+    """No terminales que derivan alguna cadena terminal no vacía."""
+    NT = grammar.nonterminals
+    ocurrencias: Dict[str, List[int]] = {}
+    marcados: Set[str] = set()
+    trabajo = []
+    for pid, p in enumerate(producciones):
+        if any(ch not in NT for ch in p.rhs) and p.lhs not in marcados:
+            marcados.add(p.lhs)
+            trabajo.append(p.lhs)
+        for ch in set(p.rhs):
+            if ch in NT:
+                ocurrencias.setdefault(ch, []).append(pid)
+    while trabajo:
+        X = trabajo.pop()
+        for pid in ocurrencias.get(X, ()):
+            A = producciones[pid].lhs
+            if A not in marcados:
+                marcados.add(A)
+                trabajo.append(A)
+    return marcados
+
+
+def _componentes(nodos, aristas: Dict[str, List[str]]) -> Dict[str, int]:
+    """Tarjan iterativo: nodo -> id de componente fuertemente conexa."""
+    indice: Dict[str, int] = {}
+    bajo: Dict[str, int] = {}
+    componente: Dict[str, int] = {}
+    pila: List[str] = []
+    en_pila: Set[str] = set()
+    contador = 0
+    for raiz in nodos:
+        if raiz in indice:
+            continue
+        llamadas = [(raiz, iter(aristas.get(raiz, ())))]
+        indice[raiz] = bajo[raiz] = contador
+        contador += 1
+        pila.append(raiz)
+        en_pila.add(raiz)
+        while llamadas:
+            v, hijos = llamadas[-1]
+            avanzo = False
+            for w in hijos:
+                if w not in indice:
+                    indice[w] = bajo[w] = contador
+                    contador += 1
+                    pila.append(w)
+                    en_pila.add(w)
+                    llamadas.append((w, iter(aristas.get(w, ()))))
+                    avanzo = True
+                    break
+                if w in en_pila:
+                    bajo[v] = min(bajo[v], indice[w])
+            if avanzo:
+                continue
+            llamadas.pop()
+            if llamadas:
+                u = llamadas[-1][0]
+                bajo[u] = min(bajo[u], bajo[v])
+            if bajo[v] == indice[v]:
+                while True:
+                    w = pila.pop()
+                    en_pila.discard(w)
+                    componente[w] = indice[v]
+                    if w == v:
+                        break
+    return componente
+
+
+def _lenguaje_finito(grammar: Grammar, producciones, limite: int) -> Optional[FrozenSet[str]]:
+    """Punto fijo L(A) = ∪ concatenaciones; None si se supera `limite`."""
+    NT = grammar.nonterminals
+    L: Dict[str, Set[str]] = {p.lhs: set() for p in producciones}
+    cambio = True
+    while cambio:
+        cambio = False
+        for p in producciones:
+            parciales = {""}
+            for ch in p.rhs:
+                opciones = L.get(ch, ()) if ch in NT else (ch,)
+                # Cota por cardinalidades antes de armar el producto
+                if len(parciales) * len(opciones) > limite:
+                    return None
+                parciales = {u + v for u in parciales for v in opciones}
+                if not parciales:
+                    break
+            nuevas = parciales - L[p.lhs]
+            if nuevas:
+                L[p.lhs] |= nuevas
+                if len(L[p.lhs]) > limite:
+                    return None
+                cambio = True
+    return frozenset(L.get(grammar.start_symbol, ()))
+
+
+def analizar(grammar: Grammar) -> AnalisisLenguaje:
+    if not _es_libre_de_contexto(grammar):
+        raise ValueError("El análisis de vacuidad y finitud requiere una gramática libre de contexto.")
+    NT = grammar.nonterminals
+
+    generadores = simbolos_generadores(grammar)
+    if grammar.start_symbol not in generadores:
+        return AnalisisLenguaje(vacio=True, finito=True, generadores=generadores,
+                                lenguaje=frozenset())
+
+    utiles = _producciones_utiles(grammar, generadores)
+    alcanzables = simbolos_alcanzables(grammar, utiles)
+    utiles = [p for p in utiles if p.lhs in alcanzables]
+    no_vacia = _generan_no_vacia(grammar, utiles)
+
+    # Aristas A -> B con indicador de crecimiento
+    aristas: Dict[str, List[str]] = {}
+    crecientes = []
+    for p in utiles:
+        for i, B in enumerate(p.rhs):
+            if B not in NT:
+                continue
+            aristas.setdefault(p.lhs, []).append(B)
+            resto = p.rhs[:i] + p.rhs[i + 1:]
+            if any(ch not in NT or ch in no_vacia for ch in resto):
+                crecientes.append((p.lhs, B))
+
+    componente = _componentes(sorted(alcanzables), aristas)
+    finito = not any(componente[A] == componente[B] for A, B in crecientes)
+    return AnalisisLenguaje(vacio=False, finito=finito, generadores=generadores,
+                            alcanzables=alcanzables)
+
+
+# Caché LRU de análisis (con el lenguaje finito, si se calculó)
+_CACHE_ANALISIS: "OrderedDict[tuple, AnalisisLenguaje]" = OrderedDict()
+MAX_ANALISIS = 32
+
+
+def analizar_cacheado(grammar: Grammar) -> Optional[AnalisisLenguaje]:
+    """
+    Análisis cacheado por grammar_key; si el lenguaje es finito incluye el
+    lenguaje completo (salvo que supere LIMITE_FINITO). None si la
+    gramática no es libre de contexto.
+    """
+    if not _es_libre_de_contexto(grammar):
+        return None
+    clave = grammar_key(grammar)
+    analisis = _CACHE_ANALISIS.get(clave)
+    if analisis is not None:
+        _CACHE_ANALISIS.move_to_end(clave)
+    else:
+        analisis = analizar(grammar)
+        if analisis.finito and not analisis.vacio:
+            utiles = [
+                p for p in _producciones_utiles(grammar, analisis.generadores)
+                if p.lhs in analisis.alcanzables
+            ]
+            analisis.lenguaje = _lenguaje_finito(grammar, utiles, LIMITE_FINITO)
+        _CACHE_ANALISIS[clave] = analisis
+        if len(_CACHE_ANALISIS) > MAX_ANALISIS:
+            _CACHE_ANALISIS.popitem(last=False)
+    return analisis
+
+
+def es_vacio(grammar: Grammar) -> bool:
+    return analizar(grammar).vacio
+
+
+def es_finito(grammar: Grammar) -> bool:
+    return analizar(grammar).finito
@@ -5,7 +5,13 @@ from grammar_parser import GrammarParser
 from classifier import classify_grammar
 from visualizer import grammar_to_dot
 from examples.sample_grammars import get_sample_grammars
-from tutor import get_quiz_questions
+from tutor import cargar_banco
+
+
+@st.cache_resource
+def banco_compartido():
+    """Un solo mapeo del banco por proceso, compartido entre reejecuciones y sesiones."""
+    return cargar_banco()
 
 
 def page_classifier():
@@ -64,9 +70,9 @@ def page_examples():
 def page_tutor():
     st.header("🧠 Modo Tutor – Quiz de Jerarquía de Chomsky (versión básica)")
 
-    questions = get_quiz_questions()
+    banco = banco_compartido()
     # Para que no sea muy largo, tomamos una sola pregunta por ejecución
-    if not questions:
+    if not len(banco):
         st.warning("No hay preguntas disponibles.")
         return
 
@@ -74,12 +80,12 @@ def page_tutor():
     idx = st.number_input(
         "Selecciona índice de pregunta",
         min_value=0,
-        max_value=len(questions) - 1,
+        max_value=len(banco) - 1,
         value=0,
         step=1,
     )
 
-    desc, grammar, result_real = questions[idx]
+    desc, grammar, result_real = banco.pregunta(int(idx))
 
     st.subheader("Gramática a clasificar")
     st.write(desc)
@@ -5,309 +5,25 @@ import random
 import os
 from datetime import datetime
 
-from grammar_parser import GrammarParser, Grammar
+from grammar_parser import GrammarParser, Grammar, format_grammar
 from classifier import classify_grammar
-from examples.sample_grammars import get_sample_grammars
-
-try:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.pdfgen import canvas
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
-
-
-
-def generar_cadenas(grammar: Grammar, max_len: int, max_expansiones: int = 2000):
-    NT = grammar.nonterminals
-    start = grammar.start_symbol
-
-    from collections import deque
-
-    inicial = start
-    visitados = set([inicial])
-    q = deque([inicial])
-    cadenas = set()
-    expansiones = 0
-
-    while q and expansiones < max_expansiones:
-        actual = q.popleft()
-        expansiones += 1
-
-        # Si ya es solo terminales
-        if all(ch not in NT for ch in actual):
-            if len(actual) <= max_len:
-                cadenas.add(actual)
-            continue
-
-        if len(actual) > max_len + 2:
-            continue
-
-        # Primer no terminal
-        idx_nt = None
-        for i, ch in enumerate(actual):
-            if ch in NT:
-                idx_nt = i
-                break
-        if idx_nt is None:
-            continue
-
-        A = actual[idx_nt]
-
-        for p in grammar.productions:
-            if p.lhs != A:
-                continue
-            rhs = p.rhs  # "" representa epsilon
-            nuevo = actual[:idx_nt] + rhs + actual[idx_nt + 1:]
-            if nuevo not in visitados and len(nuevo) <= max_len + len(NT):
-                visitados.add(nuevo)
-                q.append(nuevo)
-
-    return cadenas
-
-EPS = 'ε'
-
-
-def limpiar_regex(regex: str) -> str:
-    return ''.join(ch for ch in regex if not ch.isspace())
-
-
-def es_simbolo(c: str) -> bool:
-    return c not in {'(', ')', '|', '*', '.'}
-
-
-def agregar_concatenacion(regex: str) -> str:
-    """
-    Inserta '.' donde la concatenación es implícita.
-    Ej: (ab)*a -> (a.b)*.a
-    """
-    res = []
-    for i, c in enumerate(regex):
-        res.append(c)
-        if i == len(regex) - 1:
-            continue
-        d = regex[i + 1]
-        if (es_simbolo(c) or c in {')', '*'}) and (es_simbolo(d) or d == '('):
-            res.append('.')
-    return ''.join(res)
-
-
-def regex_a_postfix(regex: str) -> str:
-
-    prec = {'|': 1, '.': 2}
-    salida = []
-    pila = []
-
-    for c in regex:
-        if es_simbolo(c):
-            salida.append(c)
-        elif c == '(':
-            pila.append(c)
-        elif c == ')':
-            while pila and pila[-1] != '(':
-                salida.append(pila.pop())
-            if not pila:
-                raise ValueError("Paréntesis desbalanceados")
-            pila.pop()
-        elif c in {'.', '|'}:
-            while pila and pila[-1] in prec and prec[pila[-1]] >= prec[c]:
-                salida.append(pila.pop())
-            pila.append(c)
-        elif c == '*':
-            salida.append(c)
-        else:
-            raise ValueError(f"Símbolo no soportado en regex: {c}")
-
-    while pila:
-        op = pila.pop()
-        if op in {'(', ')'}:
-            raise ValueError("Paréntesis desbalanceados")
-        salida.append(op)
-
-    return ''.join(salida)
-
-
-class NFAFragment:
-    def __init__(self, start, accept, transitions):
-        self.start = start
-        self.accept = accept
-        self.transitions = transitions  # dict[state][symbol] -> set(states)
-
-
-def agregar_transicion(trans, src, symbol, dst):
-    if src not in trans:
-        trans[src] = {}
-    if symbol not in trans[src]:
-        trans[src][symbol] = set()
-    trans[src][symbol].add(dst)
-
-
-def postfix_a_nfa(postfix: str):
-    """
-    Construcción de Thompson.
-    Retorna (start, accept, transitions, alfabeto)
-    """
-    stack = []
-    transitions = {}
-    state_counter = 0
-    alphabet = set()
-
-    for c in postfix:
-        if es_simbolo(c):
-            s = state_counter
-            f = state_counter + 1
-            state_counter += 2
-            agregar_transicion(transitions, s, c, f)
-            alphabet.add(c)
-            stack.append(NFAFragment(s, f, transitions))
-        elif c == '.':
-            # concatenación
-            b = stack.pop()
-            a = stack.pop()
-            agregar_transicion(transitions, a.accept, EPS, b.start)
-            stack.append(NFAFragment(a.start, b.accept, transitions))
-        elif c == '|':
-            b = stack.pop()
-            a = stack.pop()
-            s = state_counter
-            f = state_counter + 1
-            state_counter += 2
-            agregar_transicion(transitions, s, EPS, a.start)
-            agregar_transicion(transitions, s, EPS, b.start)
-            agregar_transicion(transitions, a.accept, EPS, f)
-            agregar_transicion(transitions, b.accept, EPS, f)
-            stack.append(NFAFragment(s, f, transitions))
-        elif c == '*':
-            a = stack.pop()
-            s = state_counter
-            f = state_counter + 1
-            state_counter += 2
-            agregar_transicion(transitions, s, EPS, a.start)
-            agregar_transicion(transitions, s, EPS, f)
-            agregar_transicion(transitions, a.accept, EPS, a.start)
-            agregar_transicion(transitions, a.accept, EPS, f)
-            stack.append(NFAFragment(s, f, transitions))
-        else:
-            raise ValueError(f"Operador no soportado en postfix: {c}")
-
-    if len(stack) != 1:
-        raise ValueError("Error al construir el AFN (stack no quedó en 1)")
-
-    frag = stack[0]
-    # Asegurar que todos los estados aparecen en transitions
-    all_states = set(transitions.keys())
-    for d in transitions.values():
-        for dests in d.values():
-            all_states |= dests
-    for s in all_states:
-        transitions.setdefault(s, {})
-    return frag.start, frag.accept, transitions, alphabet
-
-
-def epsilon_cierre(states, transitions):
-    stack = list(states)
-    cierre = set(states)
-    while stack:
-        s = stack.pop()
-        for dest in transitions.get(s, {}).get(EPS, set()):
-            if dest not in cierre:
-                cierre.add(dest)
-                stack.append(dest)
-    return cierre
-
-
-def mover(states, symbol, transitions):
-    dest = set()
-    for s in states:
-        dest |= transitions.get(s, {}).get(symbol, set())
-    return dest
-
-
-def nfa_a_dfa(start_nfa, accept_nfa, transitions, alphabet):
-    from collections import deque
-
-    dfa_states = {}
-    dfa_trans = {}
-    dfa_accepts = set()
-
-    start_set = frozenset(epsilon_cierre({start_nfa}, transitions))
-    dfa_states[0] = start_set
-    queue = deque([0])
-    next_id = 1
-
-    if accept_nfa in start_set:
-        dfa_accepts.add(0)
-
-    while queue:
-        sid = queue.popleft()
-        current_set = dfa_states[sid]
-        dfa_trans[sid] = {}
-        for a in alphabet:
-            move_set = mover(current_set, a, transitions)
-            if not move_set:
-                continue
-            new_set = frozenset(epsilon_cierre(move_set, transitions))
-            # buscar si ya existe
-            existing_id = None
-            for k, sset in dfa_states.items():
-                if sset == new_set:
-                    existing_id = k
-                    break
-            if existing_id is None:
-                existing_id = next_id
-                dfa_states[existing_id] = new_set
-                queue.append(existing_id)
-                next_id += 1
-                if accept_nfa in new_set:
-                    dfa_accepts.add(existing_id)
-            dfa_trans[sid][a] = existing_id
-
-    dfa_start = 0
-    return dfa_states, dfa_start, dfa_accepts, dfa_trans
-
-
-def dfa_a_gramatica_regular(dfa_states, dfa_start, dfa_accepts, dfa_trans):
-    lines = []
-    lines.append(f"Gramática Regular (símbolo inicial: Q{dfa_start})\n")
-    for sid in sorted(dfa_states.keys()):
-        nombre = f"Q{sid}"
-        trans = dfa_trans.get(sid, {})
-        for a, dest in trans.items():
-            lines.append(f"{nombre} -> {a} Q{dest}")
-        if sid in dfa_accepts:
-            lines.append(f"{nombre} -> {EPS}")
-    return '\n'.join(lines)
-
-
-def describir_afn(start, accept, trans, alphabet):
-    lines = []
-    estados = sorted(trans.keys())
-    lines.append(f"Estados: {estados}")
-    lines.append(f"Estado inicial: {start}")
-    lines.append(f"Estado de aceptación: {accept}")
-    lines.append(f"Alfabeto: {sorted(alphabet)}")
-    lines.append("Transiciones:")
-    for s in estados:
-        for sym, dests in trans[s].items():
-            for d in dests:
-                lines.append(f"  {s} --{sym}--> {d}")
-    return '\n'.join(lines)
-
-
-def describir_afd(dfa_states, dfa_start, dfa_accepts, dfa_trans, alphabet):
-    lines = []
-    estados = sorted(dfa_states.keys())
-    lines.append("Estados: " + ", ".join(f"Q{i}" for i in estados))
-    lines.append(f"Estado inicial: Q{dfa_start}")
-    lines.append("Estados de aceptación: " +
-                 ", ".join(f"Q{i}" for i in sorted(dfa_accepts)))
-    lines.append("Alfabeto: " + ", ".join(sorted(alphabet)))
-    lines.append("Transiciones:")
-    for sid in estados:
-        trans = dfa_trans.get(sid, {})
-        for a, dest in trans.items():
-            lines.append(f"  Q{sid} --{a}--> Q{dest}")
-    return '\n'.join(lines)
+from membership import verificar_pertenencia
+from language import derivar
+from virtual_view import VistaVirtual
+from automata import (
+    EPS,
+    limpiar_regex,
+    dfa_a_gramatica_regular,
+    describir_afn,
+    describir_afd,
+    regex_a_nfa_bits,
+    regex_a_dfa_directo,
+)
+
+# Memoria para la búsqueda de pertenencia y derivación (visitados + cola)
+MEMORIA_BUSQUEDA = 64 << 20
+# Largo máximo de cadena cuya derivación se muestra sin pedirla
+MAX_DERIVACION_AUTOMATICA = 200
 
 
 class ChomskyApp(tk.Tk):
@@ -334,16 +50,29 @@ class ChomskyApp(tk.Tk):
         self.notebook.add(self.tab_tutor, text="Modo Tutor Interactivo (Quiz)")
         self.notebook.add(self.tab_generador, text="Generador Automático de Ejemplos")
 
-        # Datos globales para modo tutor / generador
-        self.sample_grammars = get_sample_grammars()
+        # Datos globales para modo tutor (el banco se abre al construir la pestaña)
+        self.banco = None
+        self.rng_tutor = random.Random()
         self.idx_pregunta = 0
 
-        # Construir pestañas
-        self._build_tab_clasificador()
-        self._build_tab_conversor()
-        self._build_tab_comparador()
-        self._build_tab_tutor()
-        self._build_tab_generador()
+        # Las pestañas se construyen la primera vez que se seleccionan
+        self._constructores = {
+            str(self.tab_clasificador): self._build_tab_clasificador,
+            str(self.tab_conversor): self._build_tab_conversor,
+            str(self.tab_comparador): self._build_tab_comparador,
+            str(self.tab_tutor): self._build_tab_tutor,
+            str(self.tab_generador): self._build_tab_generador,
+        }
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self._construir_pestana(str(self.tab_clasificador))
+
+    def _construir_pestana(self, nombre):
+        constructor = self._constructores.pop(nombre, None)
+        if constructor is not None:
+            constructor()
+
+    def _on_tab_changed(self, event):
+        self._construir_pestana(self.notebook.select())
 
     def _build_tab_clasificador(self):
         frame = self.tab_clasificador
@@ -400,17 +129,13 @@ class ChomskyApp(tk.Tk):
         lbl_exp = tk.Label(right, text="Explicación del modo inteligente:")
         lbl_exp.pack(anchor="w")
 
-        self.txt_explanation = scrolledtext.ScrolledText(
-            right, width=60, height=12, wrap=tk.WORD
-        )
+        self.txt_explanation = VistaVirtual(right, width=60, height=12)
         self.txt_explanation.pack(fill=tk.BOTH, expand=True)
 
         lbl_prod = tk.Label(right, text="Producciones detectadas:")
         lbl_prod.pack(anchor="w", pady=(8, 0))
 
-        self.txt_productions = scrolledtext.ScrolledText(
-            right, width=60, height=6, wrap=tk.WORD
-        )
+        self.txt_productions = VistaVirtual(right, width=60, height=6)
         self.txt_productions.pack(fill=tk.BOTH, expand=True)
 
         lbl_cad_result = tk.Label(right, text="Resultado para la cadena ingresada:")
@@ -421,6 +146,20 @@ class ChomskyApp(tk.Tk):
         )
         self.lbl_cadena_resultado.pack(anchor="w")
 
+        tk.Button(
+            right,
+            text="Mostrar derivación de la cadena",
+            command=self.mostrar_derivacion_action
+        ).pack(anchor="w", pady=(5, 0))
+
+        tk.Button(
+            right,
+            text="Analizar ambigüedad de la cadena (Earley)",
+            command=self.analizar_ambiguedad_action
+        ).pack(anchor="w", pady=(5, 0))
+        self.lbl_ambiguedad = tk.Label(right, text="", fg="gray", justify=tk.LEFT, wraplength=500)
+        self.lbl_ambiguedad.pack(anchor="w")
+
         # Botón para generar PDF (inciso de Reportes PDF)
         btn_pdf = tk.Button(
             right,
@@ -443,26 +182,36 @@ class ChomskyApp(tk.Tk):
 
             self.lbl_result.config(text=f"Clasificación: {result.label}")
 
-            self.txt_explanation.delete("1.0", tk.END)
-            for line in result.explanation:
-                self.txt_explanation.insert(tk.END, line + "\n")
-
-            self.txt_productions.delete("1.0", tk.END)
-            for p in grammar.productions:
-                rhs_display = p.rhs if p.rhs != "" else EPS
-                self.txt_productions.insert(tk.END, f"{p.lhs} -> {rhs_display}\n")
+            self.txt_explanation.mostrar("\n".join(result.explanation).splitlines())
+            self.txt_productions.mostrar([
+                f"{p.lhs} -> {p.rhs if p.rhs != '' else EPS}" for p in grammar.productions
+            ])
 
             if cadena:
-                max_len = max(10, len(cadena) + 2)
-                cadenas = generar_cadenas(grammar, max_len=max_len)
-                if cadena in cadenas:
+                pertenece, exacto, metodo = verificar_pertenencia(
+                    grammar, result, cadena, memoria_max=MEMORIA_BUSQUEDA
+                )
+                if pertenece:
                     self.lbl_cadena_resultado.config(
-                        text=f"La cadena '{cadena}' SÍ puede ser generada por esta gramática.",
+                        text=f"La cadena '{cadena}' SÍ puede ser generada por esta gramática ({metodo}).",
                         fg="darkgreen"
                     )
+                    if len(cadena) <= MAX_DERIVACION_AUTOMATICA:
+                        self._mostrar_derivacion(grammar, result, cadena)
+                    else:
+                        self.txt_explanation.mostrar(
+                            "\n".join(result.explanation).splitlines()
+                            + ["", f"(Derivación no calculada para cadenas de más de "
+                                   f"{MAX_DERIVACION_AUTOMATICA} símbolos: usa 'Mostrar derivación'.)"]
+                        )
+                elif exacto:
+                    self.lbl_cadena_resultado.config(
+                        text=f"La cadena '{cadena}' NO pertenece al lenguaje ({metodo}).",
+                        fg="darkred"
+                    )
                 else:
                     self.lbl_cadena_resultado.config(
-                        text=f"La cadena '{cadena}' NO se generó en la búsqueda (hasta longitud {max_len}).",
+                        text=f"La cadena '{cadena}' NO se generó en la búsqueda ({metodo}).",
                         fg="darkred"
                     )
             else:
@@ -473,9 +222,72 @@ class ChomskyApp(tk.Tk):
         except Exception as e:
             messagebox.showerror("Error al analizar", str(e))
 
+    def _mostrar_derivacion(self, grammar, result, cadena):
+        formas = derivar(grammar, cadena, memoria_max=MEMORIA_BUSQUEDA)
+        if formas:
+            self.txt_explanation.mostrar(
+                "\n".join(result.explanation).splitlines()
+                + ["", f"Derivación de '{cadena}':"]
+                + [f"  ⇒ {f or EPS}" if i else f"  {f}" for i, f in enumerate(formas)]
+            )
+        else:
+            self.txt_explanation.mostrar(
+                "\n".join(result.explanation).splitlines()
+                + ["", f"(No se encontró una derivación de '{cadena}' dentro del presupuesto.)"]
+            )
+
+    def mostrar_derivacion_action(self):
+        text = self.txt_grammar.get("1.0", tk.END).strip()
+        cadena = self.entry_cadena.get().strip()
+        if not text:
+            messagebox.showwarning("Advertencia", "Ingresa alguna gramática primero.")
+            return
+
+        try:
+            grammar = GrammarParser.parse(text)
+            self._mostrar_derivacion(grammar, classify_grammar(grammar), cadena)
+        except Exception as e:
+            messagebox.showerror("Error al analizar", str(e))
+
+    def analizar_ambiguedad_action(self):
+        text = self.txt_grammar.get("1.0", tk.END).strip()
+        cadena = self.entry_cadena.get().strip()
+        if not text:
+            messagebox.showwarning("Advertencia", "Ingresa alguna gramática primero.")
+            return
+
+        try:
+            from earley import ParserEarley, arbol_a_texto
+
+            grammar = GrammarParser.parse(text)
+            bosque = ParserEarley(grammar).bosque(cadena)
+            if bosque is None:
+                self.lbl_ambiguedad.config(
+                    text=f"La cadena '{cadena}' no pertenece al lenguaje.", fg="darkred"
+                )
+                return
+
+            total = bosque.contar_arboles()
+            ejemplos = [arbol_a_texto(t) for t in bosque.arboles(2)]
+            if total == 1:
+                texto = "1 árbol de derivación: la cadena NO es ambigua.\n"
+            elif total == float("inf"):
+                texto = "Infinitos árboles de derivación (ciclos A ⇒+ A): ambigua.\n"
+            else:
+                texto = f"{total} árboles de derivación distintos: la cadena es AMBIGUA.\n"
+            texto += "\n".join(e if len(e) <= 200 else e[:200] + "…" for e in ejemplos)
+            self.lbl_ambiguedad.config(text=texto, fg="darkgreen" if total == 1 else "darkred")
+
+        except Exception as e:
+            messagebox.showerror("Error al analizar", str(e))
+
     def generar_pdf_action(self):
         """Genera un reporte PDF con la gramática, clasificación y explicación."""
-        if not REPORTLAB_AVAILABLE:
+        # reportlab sólo se importa cuando realmente se pide un PDF
+        try:
+            from reportlab.lib.pagesizes import letter
+            from reportlab.pdfgen import canvas
+        except ImportError:
             messagebox.showerror(
                 "Reporte PDF",
                 "Necesitas instalar reportlab en tu entorno:\n\n"
@@ -484,8 +296,8 @@ class ChomskyApp(tk.Tk):
             return
 
         gram_text = self.txt_grammar.get("1.0", tk.END).strip()
-        exp_text = self.txt_explanation.get("1.0", tk.END).strip()
-        prods_text = self.txt_productions.get("1.0", tk.END).strip()
+        exp_text = self.txt_explanation.texto().strip()
+        prods_text = self.txt_productions.texto().strip()
         clasif = self.lbl_result.cget("text")
         cadena = self.entry_cadena.get().strip()
         cadena_res = self.lbl_cadena_resultado.cget("text")
@@ -592,25 +404,82 @@ class ChomskyApp(tk.Tk):
         )
         btn.pack(pady=8, anchor="w")
 
+        # Últimos autómatas construidos, para exportarlos a DOT
+        self._afn_conversor = None
+        self._afd_conversor = None
+        fila_dot = tk.Frame(top)
+        fila_dot.pack(fill=tk.X)
+        tk.Button(
+            fila_dot,
+            text="Exportar AFN (.dot)",
+            command=lambda: self.exportar_dot_action("afn")
+        ).pack(side=tk.LEFT)
+        tk.Button(
+            fila_dot,
+            text="Exportar AFD (.dot)",
+            command=lambda: self.exportar_dot_action("afd")
+        ).pack(side=tk.LEFT, padx=5)
+
+        self.var_dfa_directo = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            top,
+            text="Omitir el AFN (AFD directo desde la regex con followpos)",
+            variable=self.var_dfa_directo
+        ).pack(anchor="w")
+
+        fila_prueba = tk.Frame(top)
+        fila_prueba.pack(fill=tk.X)
+        tk.Label(fila_prueba, text="Probar cadena contra la regex:").pack(side=tk.LEFT)
+        self.entry_cadena_regex = tk.Entry(fila_prueba, width=30)
+        self.entry_cadena_regex.pack(side=tk.LEFT, padx=5)
+        tk.Button(
+            fila_prueba,
+            text="Probar (AFN bit-paralelo)",
+            command=self.probar_cadena_regex_action
+        ).pack(side=tk.LEFT, padx=5)
+        self.lbl_cadena_regex = tk.Label(fila_prueba, text="(sin probar)", fg="gray")
+        self.lbl_cadena_regex.pack(side=tk.LEFT, padx=5)
+
+        fila_algebra = tk.Frame(top)
+        fila_algebra.pack(fill=tk.X, pady=(5, 0))
+        tk.Label(fila_algebra, text="Segunda regex (R2):").pack(side=tk.LEFT)
+        self.entry_regex2 = tk.Entry(fila_algebra, width=25)
+        self.entry_regex2.pack(side=tk.LEFT, padx=5)
+        self.combo_operacion = ttk.Combobox(
+            fila_algebra,
+            values=["R1 ∩ R2", "R1 ∪ R2", "R1 − R2", "R2 − R1", "¬R1"],
+            state="readonly",
+            width=10
+        )
+        self.combo_operacion.current(0)
+        self.combo_operacion.pack(side=tk.LEFT, padx=5)
+        tk.Button(
+            fila_algebra,
+            text="Aplicar operación",
+            command=self.operar_regex_action
+        ).pack(side=tk.LEFT, padx=5)
+        self.lbl_algebra = tk.Label(top, text="", fg="gray", justify=tk.LEFT, anchor="w")
+        self.lbl_algebra.pack(fill=tk.X)
+
         middle = tk.Frame(frame, padx=10, pady=10)
         middle.pack(fill=tk.BOTH, expand=True)
 
         col1 = tk.Frame(middle)
         col1.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         tk.Label(col1, text="1. Regex ⇒ AFN").pack(anchor="w")
-        self.txt_afn = scrolledtext.ScrolledText(col1, width=40, height=15)
+        self.txt_afn = VistaVirtual(col1, width=40, height=15)
         self.txt_afn.pack(fill=tk.BOTH, expand=True)
 
         col2 = tk.Frame(middle)
         col2.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         tk.Label(col2, text="2. AFN ⇒ AFD").pack(anchor="w")
-        self.txt_afd = scrolledtext.ScrolledText(col2, width=40, height=15)
+        self.txt_afd = VistaVirtual(col2, width=40, height=15)
         self.txt_afd.pack(fill=tk.BOTH, expand=True)
 
         col3 = tk.Frame(middle)
         col3.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         tk.Label(col3, text="3. AFD ⇒ Gramática Regular (Tipo 3)").pack(anchor="w")
-        self.txt_gr_regular = scrolledtext.ScrolledText(col3, width=40, height=15)
+        self.txt_gr_regular = VistaVirtual(col3, width=40, height=15)
         self.txt_gr_regular.pack(fill=tk.BOTH, expand=True)
 
         bottom = tk.Frame(frame, padx=10, pady=5)
@@ -627,23 +496,131 @@ class ChomskyApp(tk.Tk):
                 messagebox.showwarning("Advertencia", "Ingresa una expresión regular.")
                 return
 
-            regex_conc = agregar_concatenacion(regex)
-            postfix = regex_a_postfix(regex_conc)
-            start_nfa, accept_nfa, trans_nfa, alphabet = postfix_a_nfa(postfix)
-            dfa_states, dfa_start, dfa_accepts, dfa_trans = nfa_a_dfa(
-                start_nfa, accept_nfa, trans_nfa, alphabet
-            )
-            texto_afn = describir_afn(start_nfa, accept_nfa, trans_nfa, alphabet)
+            if self.var_dfa_directo.get():
+                dfa_states, dfa_start, dfa_accepts, dfa_trans, alphabet = regex_a_dfa_directo(regex)
+                texto_afn = "(AFN omitido: el AFD se construyó directamente con followpos)"
+            else:
+                # AFN y AFD compilados una vez y guardados en disco por regex
+                from serialization import dfa_desde_regex_en_disco, nfa_desde_regex_en_disco
+
+                start_nfa, accept_nfa, trans_nfa, alphabet = nfa_desde_regex_en_disco(regex)
+                with dfa_desde_regex_en_disco(regex) as afd:
+                    dfa_states, dfa_start, dfa_accepts, dfa_trans = afd.a_diccionarios()
+                texto_afn = describir_afn(start_nfa, accept_nfa, trans_nfa, alphabet)
+            self._afn_conversor = None if self.var_dfa_directo.get() else (start_nfa, accept_nfa, trans_nfa)
+            self._afd_conversor = (dfa_states, dfa_start, dfa_accepts, dfa_trans)
             texto_afd = describir_afd(dfa_states, dfa_start, dfa_accepts, dfa_trans, alphabet)
             texto_gram = dfa_a_gramatica_regular(dfa_states, dfa_start, dfa_accepts, dfa_trans)
 
-            self.txt_afn.delete("1.0", tk.END)
-            self.txt_afd.delete("1.0", tk.END)
-            self.txt_gr_regular.delete("1.0", tk.END)
+            self.txt_afn.mostrar(texto_afn.splitlines())
+            self.txt_afd.mostrar(texto_afd.splitlines())
+            self.txt_gr_regular.mostrar(texto_gram.splitlines())
+
+        except Exception as e:
+            messagebox.showerror("Error en conversión", str(e))
+
+    def exportar_dot_action(self, tipo):
+        """Guarda en DOT el AFN o el AFD de la última conversión."""
+        from tkinter import filedialog
+        from visualizer import export_dot, write_nfa_dot, write_dfa_dot
+
+        automata = self._afn_conversor if tipo == "afn" else self._afd_conversor
+        if automata is None:
+            messagebox.showwarning(
+                "Exportar DOT",
+                "Primero convierte una regex (el AFN no existe si se usó el AFD directo)."
+            )
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension=".dot",
+            filetypes=[("Graphviz DOT", "*.dot")],
+            initialfile=f"{tipo}.dot"
+        )
+        if not path:
+            return
+        try:
+            writer = write_nfa_dot if tipo == "afn" else write_dfa_dot
+            export_dot(path, writer, *automata)
+        except Exception as e:
+            messagebox.showerror("Exportar DOT", str(e))
+            return
+        messagebox.showinfo("Exportar DOT", f"Guardado en:\n{path}")
+
+    def operar_regex_action(self):
+        # Producto perezoso: sólo se visitan los pares de estados alcanzables
+        try:
+            from dfa_algebra import (
+                AFD, interseccion, union, diferencia, complemento,
+                testigo, materializar, incluido, se_solapan,
+            )
 
-            self.txt_afn.insert(tk.END, texto_afn)
-            self.txt_afd.insert(tk.END, texto_afd)
-            self.txt_gr_regular.insert(tk.END, texto_gram)
+            regex1 = limpiar_regex(self.entry_regex.get())
+            regex2 = limpiar_regex(self.entry_regex2.get())
+            operacion = self.combo_operacion.get()
+            if not regex1 or (not regex2 and operacion != "¬R1"):
+                messagebox.showwarning("Advertencia", "Ingresa las expresiones regulares.")
+                return
+
+            a1 = AFD.desde_regex(regex1)
+            a2 = AFD.desde_regex(regex2) if regex2 else None
+            operaciones = {
+                "R1 ∩ R2": lambda: interseccion(a1, a2),
+                "R1 ∪ R2": lambda: union(a1, a2),
+                "R1 − R2": lambda: diferencia(a1, a2),
+                "R2 − R1": lambda: diferencia(a2, a1),
+                "¬R1": lambda: complemento(a1, a1.alfabeto | (a2.alfabeto if a2 else set())),
+            }
+            resultado = operaciones[operacion]()
+
+            w = testigo(resultado)
+            lineas = [
+                f"{operacion}: vacío." if w is None
+                else f"{operacion}: no vacío, cadena más corta '{w or EPS}'."
+            ]
+            if a2 is not None:
+                sub12, c12 = incluido(a1, a2)
+                sub21, c21 = incluido(a2, a1)
+                solapan, comun = se_solapan(a1, a2)
+                lineas.append(
+                    f"R1 ⊆ R2: {'sí' if sub12 else f'no (ej. {c12 or EPS})'} · "
+                    f"R2 ⊆ R1: {'sí' if sub21 else f'no (ej. {c21 or EPS})'} · "
+                    f"se solapan: {f'sí (ej. {comun or EPS})' if solapan else 'no'}"
+                )
+            self.lbl_algebra.config(text="\n".join(lineas), fg="black")
+
+            dfa_states, dfa_start, dfa_accepts, dfa_trans, alphabet = materializar(resultado)
+            self.txt_afn.mostrar([f"(AFN omitido: AFD de {operacion} por producto perezoso)"])
+            self.txt_afd.mostrar(
+                describir_afd(dfa_states, dfa_start, dfa_accepts, dfa_trans, alphabet).splitlines()
+            )
+            self.txt_gr_regular.mostrar(
+                dfa_a_gramatica_regular(dfa_states, dfa_start, dfa_accepts, dfa_trans).splitlines()
+            )
+
+        except Exception as e:
+            messagebox.showerror("Error en conversión", str(e))
+
+    def probar_cadena_regex_action(self):
+        # Simula el AFN directamente: no hace falta construir el AFD,
+        # así que funciona aunque la determinización explote.
+        try:
+            regex = limpiar_regex(self.entry_regex.get())
+            if not regex:
+                messagebox.showwarning("Advertencia", "Ingresa una expresión regular.")
+                return
+
+            cadena = self.entry_cadena_regex.get().strip()
+            matcher = regex_a_nfa_bits(regex)
+            if matcher.acepta(cadena):
+                self.lbl_cadena_regex.config(
+                    text=f"'{cadena}' SÍ pertenece al lenguaje de la regex.",
+                    fg="darkgreen"
+                )
+            else:
+                self.lbl_cadena_regex.config(
+                    text=f"'{cadena}' NO pertenece al lenguaje de la regex.",
+                    fg="darkred"
+                )
 
         except Exception as e:
             messagebox.showerror("Error en conversión", str(e))
@@ -700,6 +677,13 @@ class ChomskyApp(tk.Tk):
         )
         btn.pack(side=tk.LEFT, padx=10)
 
+        self.primer_contraejemplo_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            bottom_top,
+            text="Detener en el primer contraejemplo",
+            variable=self.primer_contraejemplo_var
+        ).pack(side=tk.LEFT, padx=10)
+
         bottom = tk.Frame(frame, padx=10, pady=10)
         bottom.pack(fill=tk.BOTH, expand=True)
 
@@ -710,11 +694,11 @@ class ChomskyApp(tk.Tk):
         col2.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         tk.Label(col1, text="L(G1) (|w| <= n):").pack(anchor="w")
-        self.txt_l1 = scrolledtext.ScrolledText(col1, width=40, height=10)
+        self.txt_l1 = VistaVirtual(col1, width=40, height=10)
         self.txt_l1.pack(fill=tk.BOTH, expand=True)
 
         tk.Label(col2, text="L(G2) (|w| <= n):").pack(anchor="w")
-        self.txt_l2 = scrolledtext.ScrolledText(col2, width=40, height=10)
+        self.txt_l2 = VistaVirtual(col2, width=40, height=10)
         self.txt_l2.pack(fill=tk.BOTH, expand=True)
 
         tk.Label(bottom, text="Resultado de la comparación:").pack(anchor="w")
@@ -722,11 +706,11 @@ class ChomskyApp(tk.Tk):
         self.lbl_comp_result.pack(anchor="w")
 
         tk.Label(bottom, text="Diferencias (G1 - G2):").pack(anchor="w")
-        self.txt_diff_1_2 = scrolledtext.ScrolledText(bottom, width=100, height=4)
+        self.txt_diff_1_2 = VistaVirtual(bottom, width=100, height=4)
         self.txt_diff_1_2.pack(fill=tk.BOTH, expand=True)
 
         tk.Label(bottom, text="Diferencias (G2 - G1):").pack(anchor="w")
-        self.txt_diff_2_1 = scrolledtext.ScrolledText(bottom, width=100, height=4)
+        self.txt_diff_2_1 = VistaVirtual(bottom, width=100, height=4)
         self.txt_diff_2_1.pack(fill=tk.BOTH, expand=True)
 
     def comparar_gramaticas_action(self):
@@ -747,41 +731,52 @@ class ChomskyApp(tk.Tk):
             g1 = GrammarParser.parse(g1_text)
             g2 = GrammarParser.parse(g2_text)
 
-            L1 = generar_cadenas(g1, max_len=n)
-            L2 = generar_cadenas(g2, max_len=n)
+            from comparator import comparar_lenguajes
 
-            self.txt_l1.delete("1.0", tk.END)
-            self.txt_l2.delete("1.0", tk.END)
-            for w in sorted(L1):
-                self.txt_l1.insert(tk.END, w + "\n")
-            for w in sorted(L2):
-                self.txt_l2.insert(tk.END, w + "\n")
+            res = comparar_lenguajes(
+                g1, g2, n, primer_contraejemplo=self.primer_contraejemplo_var.get()
+            )
 
-            diff_1_2 = sorted(L1 - L2)
-            diff_2_1 = sorted(L2 - L1)
+            self.txt_l1.mostrar(sorted(res.L1))
+            self.txt_l2.mostrar(sorted(res.L2))
 
-            self.txt_diff_1_2.delete("1.0", tk.END)
-            self.txt_diff_2_1.delete("1.0", tk.END)
-            self.txt_diff_1_2.insert(tk.END, ", ".join(diff_1_2) if diff_1_2 else "(vacío)")
-            self.txt_diff_2_1.insert(tk.END, ", ".join(diff_2_1) if diff_2_1 else "(vacío)")
+            self.txt_diff_1_2.mostrar(res.diff_1_2 if res.diff_1_2 else ["(vacío)"])
+            self.txt_diff_2_1.mostrar(res.diff_2_1 if res.diff_2_1 else ["(vacío)"])
 
-            if not diff_1_2 and not diff_2_1:
+            if res.equivalentes:
                 self.lbl_comp_result.config(
-                    text="Aproximadamente equivalentes para |w| <= n.",
+                    text="Equivalentes para |w| <= n.",
                     fg="darkgreen"
                 )
-            else:
+            elif res.longitud_contraejemplo is not None:
                 self.lbl_comp_result.config(
-                    text="No equivalentes (se encontraron diferencias para |w| <= n).",
+                    text=(
+                        "No equivalentes (primera diferencia en |w| = "
+                        f"{res.longitud_contraejemplo}; comparado hasta |w| = {res.hasta})."
+                    ),
                     fg="darkred"
                 )
+            else:
+                incompletas = [k for k, ok in enumerate(res.completo) if not ok]
+                self.lbl_comp_result.config(
+                    text=(
+                        f"Sin conclusión hasta |w| = {res.hasta}: la búsqueda agotó su "
+                        f"presupuesto en |w| = {', '.join(map(str, incompletas))}, así que "
+                        "las diferencias listadas pueden deberse al corte."
+                    ),
+                    fg="darkorange"
+                )
 
         except Exception as e:
             messagebox.showerror("Error al analizar gramáticas", str(e))
 
     # ==================== TAB 4: MODO TUTOR INTERACTIVO (QUIZ) ====================
     def _build_tab_tutor(self):
+        from tutor import cargar_banco
+
         frame = self.tab_tutor
+        # Banco de preguntas preclasificadas
+        self.banco = cargar_banco()
 
         top = tk.Frame(frame, padx=10, pady=10)
         top.pack(fill=tk.BOTH, expand=False)
@@ -841,14 +836,16 @@ class ChomskyApp(tk.Tk):
         self.siguiente_pregunta_tutor(init=True)
 
     def _get_current_question(self):
-        desc, gr = self.sample_grammars[self.idx_pregunta]
-        return desc, gr
+        # (desc, gramática, clasificación ya calculada al construir el banco)
+        return self.banco.pregunta(self.idx_pregunta)
 
     def siguiente_pregunta_tutor(self, init=False):
         if not init:
-            self.idx_pregunta = (self.idx_pregunta + 1) % len(self.sample_grammars)
+            anterior = self.idx_pregunta
+            while len(self.banco) > 1 and self.idx_pregunta == anterior:
+                self.idx_pregunta = self.rng_tutor.randrange(len(self.banco))
 
-        desc, gr = self._get_current_question()
+        desc, gr, _ = self._get_current_question()
         self.txt_tutor_grammar.delete("1.0", tk.END)
         self.txt_tutor_grammar.insert(tk.END, f"# {desc}\n")
         for p in gr.productions:
@@ -859,8 +856,7 @@ class ChomskyApp(tk.Tk):
         self.txt_tutor_expl.delete("1.0", tk.END)
 
     def revisar_tutor_action(self):
-        desc, gr = self._get_current_question()
-        result = classify_grammar(gr)
+        desc, gr, result = self._get_current_question()
 
         mapa_tipo = {
             "Tipo 3 – Regular": 3,
@@ -903,7 +899,7 @@ class ChomskyApp(tk.Tk):
 
         tk.Label(
             top,
-            text="Genera gramáticas aleatorias de un tipo específico (basado en la lista interna de ejemplos)."
+            text="Genera gramáticas aleatorias de un tipo específico con los parámetros indicados."
         ).pack(anchor="w")
 
         middle = tk.Frame(frame, padx=10, pady=10)
@@ -923,6 +919,23 @@ class ChomskyApp(tk.Tk):
         )
         self.combo_gen.pack(anchor="w", pady=(0, 5))
 
+        parametros = tk.Frame(middle)
+        parametros.pack(anchor="w", pady=(0, 5))
+        self.gen_params = {}
+        for clave, texto, valor in [
+            ("n_nt", "No terminales", "3"),
+            ("n_t", "Terminales", "2"),
+            ("n_prod", "Producciones", "6"),
+            ("max_rhs", "|RHS| máx.", "3"),
+            ("recursion", "Recursión (0–1)", "0.4"),
+            ("semilla", "Semilla", ""),
+        ]:
+            tk.Label(parametros, text=texto + ":").pack(side=tk.LEFT)
+            entry = tk.Entry(parametros, width=6)
+            entry.insert(0, valor)
+            entry.pack(side=tk.LEFT, padx=(2, 10))
+            self.gen_params[clave] = entry
+
         tk.Button(
             middle,
             text="Generar Gramática Aleatoria",
@@ -941,22 +954,27 @@ class ChomskyApp(tk.Tk):
         ).pack(anchor="w", pady=(5, 0))
 
     def generar_gramatica_ejemplo_action(self):
-        tipo = self.gen_tipo_var.get()
-        indices_por_tipo = {
-            "Tipo 3": [0],
-            "Tipo 2": [1],
-            "Tipo 1": [2],
-            "Tipo 0": [3],
-        }
-        indices = indices_por_tipo[tipo]
-        idx = random.choice(indices)
+        tipo = int(self.gen_tipo_var.get().split()[-1])
+
+        try:
+            params = {
+                clave: int(self.gen_params[clave].get())
+                for clave in ("n_nt", "n_t", "n_prod", "max_rhs")
+            }
+            params["recursion"] = float(self.gen_params["recursion"].get())
+            semilla_txt = self.gen_params["semilla"].get().strip()
+            rng = random.Random(int(semilla_txt)) if semilla_txt else random.Random()
+
+            from grammar_generator import generar_gramatica_aleatoria
+
+            gr = generar_gramatica_aleatoria(tipo, rng=rng, **params)
+        except ValueError as e:
+            messagebox.showerror("Generador", str(e))
+            return
 
-        desc, gr = self.sample_grammars[idx]
         self.txt_generador.delete("1.0", tk.END)
-        self.txt_generador.insert(tk.END, f"# {desc}\n")
-        for p in gr.productions:
-            rhs_display = p.rhs if p.rhs != "" else EPS
-            self.txt_generador.insert(tk.END, f"{p.lhs} -> {rhs_display}\n")
+        self.txt_generador.insert(tk.END, f"# Gramática aleatoria de Tipo {tipo}\n")
+        self.txt_generador.insert(tk.END, format_grammar(gr) + "\n")
 
 
 if __name__ == "__main__":
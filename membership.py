@@ -0,0 +1,53 @@
+# membership.py
+from typing import Optional, Tuple
+
+from grammar_parser import Grammar
+from classifier import ClassificationResult
+from automata import compilar_gramatica_regular_compacta
+from language import buscar_cadena
+from parsing_tables import analizador_determinista
+from language_analysis import analizar_cacheado
+
+
+def verificar_pertenencia(
+    grammar: Grammar,
+    result: ClassificationResult,
+    cadena: str,
+    memoria_max: Optional[int] = None,
+    desborde: str = "disco",
+) -> Tuple[bool, bool, str]:
+    """
+    Decide si la cadena pertenece a L(grammar) usando el motor adecuado
+    según el tipo de la gramática.
+
+    Retorna (pertenece, exacto, metodo). Si exacto es False, un resultado
+    negativo sólo significa que la búsqueda acotada no la encontró.
+    `memoria_max` (bytes) y `desborde` acotan la búsqueda dirigida (ver
+    language.buscar_cadena).
+    """
+    if result.grammar_type == 3:
+        afd = compilar_gramatica_regular_compacta(grammar)
+        return afd.acepta(cadena), True, "AFD"
+
+    if result.grammar_type == 2:
+        # Gramáticas deterministas: análisis por tabla en O(n)
+        try:
+            analizador = analizador_determinista(grammar)
+        except ValueError:
+            analizador = None
+        if analizador is not None:
+            return analizador.acepta(cadena), True, f"tabla {analizador.metodo}"
+
+    analisis = analizar_cacheado(grammar)
+    if analisis is not None and analisis.vacio:
+        return False, True, "lenguaje vacío"
+    if analisis is not None and analisis.lenguaje is not None:
+        return cadena in analisis.lenguaje, True, "lenguaje finito"
+
+    encontrada, exacto = buscar_cadena(grammar, cadena, memoria_max=memoria_max, desborde=desborde)
+    if encontrada or exacto:
+        return encontrada, True, "búsqueda dirigida"
+    if analisis is None:
+        # Sólo se aplican producciones libres de contexto: el negativo no es concluyente
+        return False, False, "búsqueda dirigida (gramática no libre de contexto)"
+    return False, False, "búsqueda dirigida (presupuesto agotado)"
@@ -0,0 +1,342 @@
+# parsing_tables.py
+"""
+Tablas LL(1), LR(1) y LALR(1) a partir de una Grammar libre de contexto.
+
+FIRST y FOLLOW se calculan como puntos fijos con lista de trabajo (sólo se
+revisan las producciones afectadas por un cambio). Si una tabla no tiene
+conflictos, el análisis guiado por ella decide la pertenencia en O(n);
+las tablas quedan cacheadas por la clave canónica de la gramática.
+"""
+from collections import OrderedDict, deque
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from grammar_parser import Grammar, grammar_key
+
+FIN = "$"
+
+Produccion = Tuple[Optional[str], str]
+
+
+def _producciones(grammar: Grammar) -> List[Produccion]:
+    NT = grammar.nonterminals
+    for p in grammar.productions:
+        if len(p.lhs) != 1 or p.lhs not in NT:
+            raise ValueError(
+                f"{p.lhs} -> {p.rhs}: las tablas LL/LR requieren una gramática libre de contexto."
+            )
+    if FIN in grammar.terminals:
+        raise ValueError(f"'{FIN}' está reservado como marcador de fin de entrada.")
+    return [(p.lhs, p.rhs) for p in grammar.productions]
+
+
+# ==================== FIRST / FOLLOW ====================
+
+def calcular_first(grammar: Grammar) -> Tuple[Dict[str, Set[str]], Set[str]]:
+    """Retorna (FIRST de cada no terminal, conjunto de anulables)."""
+    NT = grammar.nonterminals
+    prods = _producciones(grammar)
+    first: Dict[str, Set[str]] = {A: set() for A in NT}
+    anulables: Set[str] = set()
+
+    # dependientes[X]: producciones cuyo RHS contiene a X
+    dependientes: Dict[str, List[int]] = {A: [] for A in NT}
+    for pid, (_, rhs) in enumerate(prods):
+        for ch in set(rhs):
+            if ch in NT:
+                dependientes[ch].append(pid)
+
+    trabajo = deque(range(len(prods)))
+    en_cola = set(trabajo)
+    while trabajo:
+        pid = trabajo.popleft()
+        en_cola.discard(pid)
+        A, rhs = prods[pid]
+        nuevos = set()
+        anulable = True
+        for ch in rhs:
+            if ch not in NT:
+                nuevos.add(ch)
+                anulable = False
+                break
+            nuevos |= first[ch]
+            if ch not in anulables:
+                anulable = False
+                break
+        cambio = not nuevos <= first[A]
+        first[A] |= nuevos
+        if anulable and A not in anulables:
+            anulables.add(A)
+            cambio = True
+        if cambio:
+            for q in dependientes[A]:
+                if q not in en_cola:
+                    en_cola.add(q)
+                    trabajo.append(q)
+    return first, anulables
+
+
+def first_de_cadena(simbolos: str, first, anulables, NT) -> Tuple[Set[str], bool]:
+    """FIRST de una secuencia de símbolos y si la secuencia es anulable."""
+    resultado: Set[str] = set()
+    for ch in simbolos:
+        if ch not in NT:
+            resultado.add(ch)
+            return resultado, False
+        resultado |= first[ch]
+        if ch not in anulables:
+            return resultado, False
+    return resultado, True
+
+
+def calcular_follow(grammar: Grammar, first=None, anulables=None) -> Dict[str, Set[str]]:
+    NT = grammar.nonterminals
+    prods = _producciones(grammar)
+    if first is None:
+        first, anulables = calcular_first(grammar)
+
+    follow: Dict[str, Set[str]] = {A: set() for A in NT}
+    if grammar.start_symbol in follow:
+        follow[grammar.start_symbol].add(FIN)
+    # hereda[A]: no terminales B con FOLLOW(B) ⊇ FOLLOW(A)
+    hereda: Dict[str, Set[str]] = {A: set() for A in NT}
+    for A, rhs in prods:
+        for i, B in enumerate(rhs):
+            if B not in NT:
+                continue
+            siguiente, anulable = first_de_cadena(rhs[i + 1:], first, anulables, NT)
+            follow[B] |= siguiente
+            if anulable and B != A:
+                hereda[A].add(B)
+
+    trabajo = deque(NT)
+    en_cola = set(NT)
+    while trabajo:
+        A = trabajo.popleft()
+        en_cola.discard(A)
+        for B in hereda[A]:
+            if not follow[A] <= follow[B]:
+                follow[B] |= follow[A]
+                if B not in en_cola:
+                    en_cola.add(B)
+                    trabajo.append(B)
+    return follow
+
+
+# ==================== LL(1) ====================
+
+class TablaLL1:
+    metodo = "LL(1)"
+
+    def __init__(self, grammar: Grammar):
+        NT = grammar.nonterminals
+        self.inicial = grammar.start_symbol
+        self.NT = set(NT)
+        self.prods = _producciones(grammar)
+        first, anulables = calcular_first(grammar)
+        follow = calcular_follow(grammar, first, anulables)
+
+        self.tabla: Dict[Tuple[str, str], int] = {}
+        # conflictos: (no terminal, terminal, producciones en disputa)
+        self.conflictos: List[Tuple[str, str, List[int]]] = []
+        celdas: Dict[Tuple[str, str], List[int]] = {}
+        for pid, (A, rhs) in enumerate(self.prods):
+            siguiente, anulable = first_de_cadena(rhs, first, anulables, NT)
+            if anulable:
+                siguiente = siguiente | follow[A]
+            for a in siguiente:
+                celdas.setdefault((A, a), []).append(pid)
+        for celda, pids in celdas.items():
+            self.tabla[celda] = pids[0]
+            if len(pids) > 1:
+                self.conflictos.append((celda[0], celda[1], pids))
+
+    def acepta(self, cadena: str) -> bool:
+        if FIN in cadena:
+            return False
+        pila = [FIN, self.inicial]
+        entrada = cadena + FIN
+        i = 0
+        while pila:
+            X = pila.pop()
+            a = entrada[i] if i < len(entrada) else None
+            if X not in self.NT:
+                if X != a:
+                    return False
+                i += 1
+                continue
+            pid = self.tabla.get((X, a))
+            if pid is None:
+                return False
+            pila.extend(reversed(self.prods[pid][1]))
+        return i == len(entrada)
+
+
+# ==================== LR(1) / LALR(1) ====================
+
+Item = Tuple[int, int, str]  # (producción, punto, símbolo de anticipación)
+
+
+class TablaLR:
+    """
+    Tabla ACTION/GOTO. Con lalr=True se fusionan los estados LR(1) con el
+    mismo núcleo (LALR(1)); si no, queda la colección canónica LR(1).
+    """
+
+    def __init__(self, grammar: Grammar, lalr: bool = True):
+        NT = grammar.nonterminals
+        self.metodo = "LALR(1)" if lalr else "LR(1)"
+        prods = _producciones(grammar)
+        # Producción aumentada S' -> S al final (lhs None)
+        prods.append((None, grammar.start_symbol))
+        self.prods = prods
+        aumentada = len(prods) - 1
+
+        first, anulables = calcular_first(grammar)
+        por_lhs: Dict[str, List[int]] = {A: [] for A in NT}
+        for pid, (A, _) in enumerate(prods[:-1]):
+            por_lhs[A].append(pid)
+
+        resto: Dict[Tuple[int, int], Tuple[Set[str], bool]] = {}
+
+        def cerradura(items) -> FrozenSet[Item]:
+            conjunto = set(items)
+            pila = list(items)
+            while pila:
+                pid, punto, la = pila.pop()
+                rhs = prods[pid][1]
+                if punto >= len(rhs) or rhs[punto] not in NT:
+                    continue
+                clave = (pid, punto + 1)
+                if clave not in resto:
+                    resto[clave] = first_de_cadena(rhs[punto + 1:], first, anulables, NT)
+                siguiente, anulable = resto[clave]
+                anticipos = siguiente | {la} if anulable else siguiente
+                for q in por_lhs.get(rhs[punto], ()):
+                    for b in anticipos:
+                        item = (q, 0, b)
+                        if item not in conjunto:
+                            conjunto.add(item)
+                            pila.append(item)
+            return frozenset(conjunto)
+
+        estados: List[FrozenSet[Item]] = [cerradura([(aumentada, 0, FIN)])]
+        indice = {estados[0]: 0}
+        transiciones: Dict[Tuple[int, str], int] = {}
+        i = 0
+        while i < len(estados):
+            avances: Dict[str, List[Item]] = {}
+            for pid, punto, la in estados[i]:
+                rhs = prods[pid][1]
+                if punto < len(rhs):
+                    avances.setdefault(rhs[punto], []).append((pid, punto + 1, la))
+            for X, nucleo in avances.items():
+                destino = cerradura(nucleo)
+                j = indice.get(destino)
+                if j is None:
+                    j = len(estados)
+                    indice[destino] = j
+                    estados.append(destino)
+                transiciones[(i, X)] = j
+            i += 1
+
+        if lalr:
+            estados, transiciones = self._fusionar(estados, transiciones)
+        self.n_estados = len(estados)
+
+        self.acciones: Dict[Tuple[int, str], tuple] = {}
+        self.ir_a: Dict[Tuple[int, str], int] = {}
+        # conflictos: (estado, símbolo, acciones en disputa)
+        self.conflictos: List[Tuple[int, str, List[tuple]]] = []
+        celdas: Dict[Tuple[int, str], Set[tuple]] = {}
+        for (i, X), j in transiciones.items():
+            if X in NT:
+                self.ir_a[(i, X)] = j
+            else:
+                celdas.setdefault((i, X), set()).add(("d", j))
+        for i, estado in enumerate(estados):
+            for pid, punto, la in estado:
+                if punto == len(prods[pid][1]):
+                    accion = ("aceptar",) if pid == aumentada else ("r", pid)
+                    celdas.setdefault((i, la), set()).add(accion)
+        for celda, acciones in celdas.items():
+            ordenadas = sorted(acciones)
+            self.acciones[celda] = ordenadas[0]
+            if len(ordenadas) > 1:
+                self.conflictos.append((celda[0], celda[1], ordenadas))
+
+    @staticmethod
+    def _fusionar(estados, transiciones):
+        grupos: Dict[FrozenSet[Tuple[int, int]], int] = {}
+        nuevo_id: List[int] = []
+        fusionados: List[Set[Item]] = []
+        for estado in estados:
+            nucleo = frozenset((pid, punto) for pid, punto, _ in estado)
+            g = grupos.get(nucleo)
+            if g is None:
+                g = grupos[nucleo] = len(fusionados)
+                fusionados.append(set())
+            fusionados[g] |= estado
+            nuevo_id.append(g)
+        nuevas = {(nuevo_id[i], X): nuevo_id[j] for (i, X), j in transiciones.items()}
+        return [frozenset(e) for e in fusionados], nuevas
+
+    def acepta(self, cadena: str) -> bool:
+        if FIN in cadena:
+            return False
+        pila = [0]
+        entrada = cadena + FIN
+        i = 0
+        while True:
+            accion = self.acciones.get((pila[-1], entrada[i]))
+            if accion is None:
+                return False
+            if accion[0] == "d":
+                pila.append(accion[1])
+                i += 1
+            elif accion[0] == "r":
+                A, rhs = self.prods[accion[1]]
+                if rhs:
+                    del pila[-len(rhs):]
+                destino = self.ir_a.get((pila[-1], A))
+                if destino is None:
+                    return False
+                pila.append(destino)
+            else:
+                return True
+
+
+# ==================== Selección y caché ====================
+
+_CACHE_TABLAS: "OrderedDict[tuple, object]" = OrderedDict()
+MAX_TABLAS = 32
+
+
+def tabla(grammar: Grammar, metodo: str = "LALR(1)"):
+    """Tabla del método pedido ("LL(1)", "LALR(1)" o "LR(1)"), con caché LRU."""
+    clave = (grammar_key(grammar), metodo)
+    t = _CACHE_TABLAS.get(clave)
+    if t is not None:
+        _CACHE_TABLAS.move_to_end(clave)
+    else:
+        if metodo == "LL(1)":
+            t = TablaLL1(grammar)
+        elif metodo in ("LALR(1)", "LR(1)"):
+            t = TablaLR(grammar, lalr=metodo == "LALR(1)")
+        else:
+            raise ValueError(f"Método desconocido: {metodo}")
+        _CACHE_TABLAS[clave] = t
+        if len(_CACHE_TABLAS) > MAX_TABLAS:
+            _CACHE_TABLAS.popitem(last=False)
+    return t
+
+
+def analizador_determinista(grammar: Grammar):
+    """
+    Primera tabla sin conflictos entre LL(1), LALR(1) y LR(1), o None si
+    la gramática no es determinista para ninguno de los tres.
+    """
+    for metodo in ("LL(1)", "LALR(1)", "LR(1)"):
+        t = tabla(grammar, metodo)
+        if not t.conflictos:
+            return t
+    return None
@@ -0,0 +1,143 @@
+# regex_search.py
+"""
+Búsqueda de una regex del curso en archivos grandes, sin cargarlos en memoria.
+
+    python regex_search.py "(a|b)*abb" corpus.txt
+
+El archivo se mapea con mmap y se recorre por bloques; el estado del
+autómata pasa de un bloque al siguiente, así que una coincidencia puede
+cruzar el borde entre bloques. Se reporta el desplazamiento (en bytes) en
+el que TERMINA cada coincidencia, como un flujo.
+
+El autómata es el AFD de Σ*R construido de forma perezosa sobre bytes a
+partir de las posiciones (followpos) de la regex: sólo existen los estados
+que el texto visita, y cada transición se calcula una vez y queda en una
+tabla de 256 entradas por estado. Mientras el autómata está en el estado
+inicial, el salto hasta el próximo byte relevante lo hace `re` en C.
+"""
+import mmap
+import os
+import re
+import sys
+from array import array
+from typing import Iterator, List
+
+from automata import regex_a_posiciones
+
+
+class BuscadorRegex:
+
+    def __init__(self, regex: str, max_estados: int = 10000):
+        simbolo_de, self._siguientes, first, self.anulable, _ = regex_a_posiciones(regex)
+        self._fin = len(simbolo_de)
+        self._byte_de = []
+        for s in simbolo_de:
+            b = s.encode("utf-8")
+            if len(b) != 1:
+                raise ValueError(f"El símbolo '{s}' no ocupa un solo byte; la búsqueda es por bytes.")
+            self._byte_de.append(b[0])
+        self._first = frozenset(first)
+        self.max_estados = max_estados
+
+        # Bytes que sacan al autómata del estado inicial
+        relevantes = sorted({self._byte_de[p] for p in self._first})
+        self._salto = (
+            re.compile(b"[" + b"".join(re.escape(bytes([c])) for c in relevantes) + b"]")
+            if relevantes and not self.anulable else None
+        )
+
+        self._estados: List[frozenset] = []
+        self._indice = {}
+        self._trans: List[array] = []
+        self._final = bytearray()
+        self.inicial = self._internar(self._first)
+
+    def _internar(self, conjunto: frozenset) -> int:
+        sid = self._indice.get(conjunto)
+        if sid is None:
+            sid = len(self._estados)
+            self._estados.append(conjunto)
+            self._indice[conjunto] = sid
+            self._trans.append(array("i", [-1]) * 256)
+            self._final.append(1 if self.anulable or self._fin in conjunto else 0)
+        return sid
+
+    def _calcular(self, estado: int, c: int) -> int:
+        destino = set(self._first)  # Σ*: una coincidencia puede empezar en cualquier byte
+        for p in self._estados[estado]:
+            if p != self._fin and self._byte_de[p] == c:
+                destino |= self._siguientes[p]
+        destino = frozenset(destino)
+
+        if destino not in self._indice and len(self._estados) >= self.max_estados:
+            # Caché llena: se vacía y se vuelve a empezar desde el estado inicial
+            self._estados.clear()
+            self._indice.clear()
+            self._trans.clear()
+            del self._final[:]
+            self.inicial = self._internar(self._first)
+            return self._internar(destino)
+
+        sid = self._internar(destino)
+        self._trans[estado][c] = sid
+        return sid
+
+    def buscar_en_bloque(self, datos, estado: int, base: int, salida: List[int]) -> int:
+        """
+        Recorre `datos` desde `estado`, agrega a `salida` el fin de cada
+        coincidencia (base + desplazamiento) y retorna el estado final.
+        """
+        trans = self._trans
+        final = self._final
+        salto = self._salto
+        n = len(datos)
+        i = 0
+        while i < n:
+            if estado == self.inicial and salto is not None:
+                m = salto.search(datos, i)
+                if m is None:
+                    break
+                i = m.start()
+            c = datos[i]
+            sig = trans[estado][c]
+            if sig < 0:
+                sig = self._calcular(estado, c)
+            estado = sig
+            i += 1
+            if final[estado]:
+                salida.append(base + i)
+        return estado
+
+    def buscar_en_bytes(self, datos) -> List[int]:
+        salida = [0] if self.anulable else []
+        self.buscar_en_bloque(datos, self.inicial, 0, salida)
+        return salida
+
+    def buscar_en_archivo(self, path: str, tam_bloque: int = 1 << 20) -> Iterator[int]:
+        """Genera el desplazamiento de fin de cada coincidencia en el archivo."""
+        if self.anulable:
+            yield 0
+        with open(path, "rb") as f:
+            tam = os.fstat(f.fileno()).st_size
+            if tam == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                estado = self.inicial
+                for base in range(0, tam, tam_bloque):
+                    salida: List[int] = []
+                    estado = self.buscar_en_bloque(mm[base:base + tam_bloque], estado, base, salida)
+                    yield from salida
+
+
+def buscar_en_archivo(regex: str, path: str, tam_bloque: int = 1 << 20) -> Iterator[int]:
+    return BuscadorRegex(regex).buscar_en_archivo(path, tam_bloque)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python regex_search.py REGEX ARCHIVO")
+        sys.exit(1)
+    for fin in buscar_en_archivo(sys.argv[1], sys.argv[2]):
+        print(fin)
@@ -0,0 +1,191 @@
+# sampler.py
+import random
+from itertools import product as _combinaciones
+from typing import Dict, List, Optional, Tuple
+
+from grammar_parser import Grammar
+
+
+def _anulables(producciones: Dict[str, List[str]]) -> set:
+    anulables = set()
+    cambio = True
+    while cambio:
+        cambio = False
+        for A, rhss in producciones.items():
+            if A in anulables:
+                continue
+            if any(all(ch in anulables for ch in rhs) for rhs in rhss):
+                anulables.add(A)
+                cambio = True
+    return anulables
+
+
+def _normalizar(grammar: Grammar) -> Tuple[Dict[str, List[Tuple[str, ...]]], bool]:
+    """
+    Elimina producciones ε y unitarias (A -> B) sin cambiar el lenguaje
+    (salvo la cadena vacía, que se devuelve aparte). Después de esto cada
+    símbolo de un RHS genera al menos un carácter.
+    """
+    NT = grammar.nonterminals
+    producciones: Dict[str, List[str]] = {A: [] for A in NT}
+    for p in grammar.productions:
+        if len(p.lhs) != 1 or p.lhs not in NT:
+            raise ValueError(
+                f"{p.lhs} -> {p.rhs}: el muestreo necesita una gramática libre de contexto."
+            )
+        producciones[p.lhs].append(p.rhs)
+
+    anulables = _anulables(producciones)
+    genera_vacia = grammar.start_symbol in anulables
+
+    # Sin ε: cada símbolo anulable puede quedarse o desaparecer
+    sin_eps: Dict[str, set] = {A: set() for A in NT}
+    for A, rhss in producciones.items():
+        for rhs in rhss:
+            opciones = [(ch, "") if ch in anulables else (ch,) for ch in rhs]
+            for eleccion in _combinaciones(*opciones):
+                nuevo = "".join(eleccion)
+                if nuevo:
+                    sin_eps[A].add(nuevo)
+
+    # Sin unitarias: A hereda las producciones no unitarias de todo B con A =>* B
+    resultado: Dict[str, List[Tuple[str, ...]]] = {}
+    for A in NT:
+        alcanzables = {A}
+        pila = [A]
+        while pila:
+            X = pila.pop()
+            for rhs in sin_eps[X]:
+                if len(rhs) == 1 and rhs in NT and rhs not in alcanzables:
+                    alcanzables.add(rhs)
+                    pila.append(rhs)
+        rhss = set()
+        for B in alcanzables:
+            for rhs in sin_eps[B]:
+                if not (len(rhs) == 1 and rhs in NT):
+                    rhss.add(tuple(rhs))
+        resultado[A] = sorted(rhss)
+    return resultado, genera_vacia
+
+
+class MuestreadorUniforme:
+    """
+    Muestreo uniforme de cadenas de longitud exacta n de una GLC.
+
+    Se precalcula f(A, n) = número de derivaciones de A a cadenas de largo n
+    (con enteros exactos). Cada muestra elige producción y puntos de corte
+    con probabilidad proporcional a esos conteos, así que la distribución es
+    uniforme sobre las derivaciones; si la gramática no es ambigua, también
+    es uniforme sobre las cadenas de L(G) ∩ Σ^n.
+
+    Los cortes se buscan en orden alternado (1, n, 2, n-1, ...), lo que da
+    un costo esperado de O(n log n) por muestra una vez hechas las tablas.
+    """
+
+    def __init__(self, grammar: Grammar, max_len: int = 0, semilla: Optional[int] = None):
+        self.grammar = grammar
+        self.rng = random.Random(semilla)
+        self.producciones, self.genera_vacia = _normalizar(grammar)
+        self._prods = [(A, rhs) for A in sorted(self.producciones) for rhs in self.producciones[A]]
+        self._prods_de = {A: [] for A in self.producciones}
+        for pid, (A, _) in enumerate(self._prods):
+            self._prods_de[A].append(pid)
+
+        self._f: Dict[str, List[int]] = {A: [0] for A in self.producciones}
+        # _g[pid][i][n]: derivaciones del sufijo rhs[i:] a largo n (i < |rhs| - 1)
+        self._g = [[[0] for _ in range(len(rhs) - 1)] for _, rhs in self._prods]
+        self._hasta = 0
+        self._extender(max_len)
+
+    # ---------- conteos ----------
+
+    def _F(self, simbolo: str, n: int) -> int:
+        tabla = self._f.get(simbolo)
+        if tabla is None:
+            return 1 if n == 1 else 0
+        return tabla[n]
+
+    def _G(self, pid: int, i: int, n: int) -> int:
+        rhs = self._prods[pid][1]
+        if i == len(rhs) - 1:
+            return self._F(rhs[i], n)
+        return self._g[pid][i][n]
+
+    def _extender(self, max_len: int):
+        for n in range(self._hasta + 1, max_len + 1):
+            for pid, (_, rhs) in enumerate(self._prods):
+                L = len(rhs)
+                for i in range(L - 2, -1, -1):
+                    resto = L - 1 - i  # cada símbolo restante genera >= 1 carácter
+                    total = 0
+                    for k in range(1, n - resto + 1):
+                        fk = self._F(rhs[i], k)
+                        if fk:
+                            total += fk * self._G(pid, i + 1, n - k)
+                    self._g[pid][i].append(total)
+            for A, pids in self._prods_de.items():
+                self._f[A].append(sum(self._G(pid, 0, n) for pid in pids))
+            self._hasta = n
+
+    def contar(self, n: int) -> int:
+        """Número de derivaciones de cadenas de longitud n desde el símbolo inicial."""
+        if n == 0:
+            return 1 if self.genera_vacia else 0
+        self._extender(n)
+        return self._f.get(self.grammar.start_symbol, [0] * (n + 1))[n]
+
+    # ---------- muestreo ----------
+
+    def _elegir_corte(self, pid: int, i: int, n: int, r: int) -> int:
+        simbolo = self._prods[pid][1][i]
+        resto = len(self._prods[pid][1]) - 1 - i
+        bajo, alto = 1, n - resto
+        while bajo <= alto:
+            for k in (bajo, alto) if bajo != alto else (bajo,):
+                peso = self._F(simbolo, k) * self._G(pid, i + 1, n - k)
+                if r < peso:
+                    return k
+                r -= peso
+            bajo += 1
+            alto -= 1
+        raise RuntimeError("Conteos inconsistentes al elegir el corte.")
+
+    def muestra(self, n: int) -> str:
+        """Una cadena de longitud n elegida al azar (ver nota de uniformidad)."""
+        total = self.contar(n)
+        if total == 0:
+            raise ValueError(f"La gramática no genera cadenas de longitud {n}.")
+        if n == 0:
+            return ""
+
+        salida: List[str] = []
+        pila = [(self.grammar.start_symbol, n)]
+        while pila:
+            simbolo, largo = pila.pop()
+            if simbolo not in self._f:
+                salida.append(simbolo)
+                continue
+
+            r = self.rng.randrange(self._f[simbolo][largo])
+            for pid in self._prods_de[simbolo]:
+                peso = self._G(pid, 0, largo)
+                if r < peso:
+                    break
+                r -= peso
+
+            rhs = self._prods[pid][1]
+            partes = []
+            for i in range(len(rhs) - 1):
+                r = self.rng.randrange(self._G(pid, i, largo))
+                k = self._elegir_corte(pid, i, largo, r)
+                partes.append((rhs[i], k))
+                largo -= k
+            partes.append((rhs[-1], largo))
+            pila.extend(reversed(partes))
+
+        return "".join(salida)
+
+    def muestras(self, n: int, cantidad: int) -> List[str]:
+        """Lote de `cantidad` muestras independientes de longitud n."""
+        self.contar(n)
+        return [self.muestra(n) for _ in range(cantidad)]
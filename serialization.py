@@ -0,0 +1,438 @@
+# serialization.py
+"""
+Formato binario compacto para AFN, AFD y gramáticas compiladas.
+
+Todos los archivos empiezan con la misma cabecera:
+
+    magic  b"CHOM" | versión (B) | tipo (B) | orden de bytes (B) | relleno (B)
+
+Después va la cabecera propia de cada tipo y los arreglos empaquetados:
+
+  AFD: n_estados, n_simbolos, inicial
+       alfabeto      -> n_simbolos code points (uint32)
+       transiciones  -> n_estados * n_simbolos int32 (-1 = estado muerto)
+       aceptación    -> mapa de bits de ceil(n_estados / 8) bytes
+
+  AFN: n_estados, n_simbolos, inicial, final, n_aristas
+       alfabeto      -> n_simbolos code points (ε incluido si aparece)
+       offsets       -> n_estados + 1 uint32 (formato CSR)
+       aristas       -> n_aristas pares (símbolo, destino) int32
+
+  Gramática: n_producciones, longitud del bloque de texto
+       texto UTF-8: inicial, no terminales, terminales y luego lhs/rhs,
+       todos separados por '\\0'
+
+El banco de preguntas del tutor usa la misma cabecera (ver guardar_banco).
+
+Los AFD se cargan con mmap: las transiciones se leen directamente de las
+páginas del archivo, sin reconstruir diccionarios.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from grammar_parser import Grammar, Production
+from classifier import ClassificationResult
+from automata import EPS, limpiar_regex, regex_a_nfa, nfa_a_dfa
+
+MAGIC = b"CHOM"
+VERSION = 1
+TIPO_AFN = 1
+TIPO_AFD = 2
+TIPO_GRAMATICA = 3
+
+_ORDEN = 0 if sys.byteorder == "little" else 1
+_CABECERA = struct.Struct("<4sBBBB")
+_CAB_AFD = struct.Struct("<III")
+_CAB_AFN = struct.Struct("<IIIII")
+_CAB_GRAMATICA = struct.Struct("<II")
+
+
+def _escribir_cabecera(f, tipo):
+    f.write(_CABECERA.pack(MAGIC, VERSION, tipo, _ORDEN, 0))
+
+
+def _leer_cabecera(buf, tipo_esperado):
+    magic, version, tipo, orden, _ = _CABECERA.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("El archivo no es un autómata/gramática compilado.")
+    if version != VERSION:
+        raise ValueError(f"Versión de formato no soportada: {version}")
+    if tipo != tipo_esperado:
+        raise ValueError(f"Tipo de archivo inesperado: {tipo}")
+    if orden != _ORDEN:
+        raise ValueError("El archivo se generó con otro orden de bytes.")
+    return _CABECERA.size
+
+
+def _tabla_alfabeto(simbolos):
+    for s in simbolos:
+        if len(s) != 1:
+            raise ValueError(f"Sólo se soportan símbolos de un carácter: {s!r}")
+    return array("I", (ord(s) for s in simbolos))
+
+
+# ==================== AFD ====================
+
+def guardar_dfa(path, dfa_states, dfa_start, dfa_accepts, dfa_trans, alphabet):
+    """Guarda un AFD (en el formato de nfa_a_dfa) en formato binario."""
+    estados = sorted(dfa_states.keys())
+    indice = {sid: i for i, sid in enumerate(estados)}
+    simbolos = sorted(alphabet)
+    col = {a: j for j, a in enumerate(simbolos)}
+    n, m = len(estados), len(simbolos)
+
+    tabla = array("i", [-1]) * (n * m)
+    for sid in estados:
+        base = indice[sid] * m
+        for a, dest in dfa_trans.get(sid, {}).items():
+            tabla[base + col[a]] = indice[dest]
+
+    finales = bytearray((n + 7) // 8)
+    for sid in dfa_accepts:
+        i = indice[sid]
+        finales[i >> 3] |= 1 << (i & 7)
+
+    with open(path, "wb") as f:
+        _escribir_cabecera(f, TIPO_AFD)
+        f.write(_CAB_AFD.pack(n, m, indice[dfa_start]))
+        f.write(_tabla_alfabeto(simbolos).tobytes())
+        f.write(tabla.tobytes())
+        f.write(finales)
+
+
+class DFAMapeado:
+    """
+    AFD leído con mmap. Las transiciones se consultan sobre la vista del
+    archivo, así que cargarlo cuesta sólo las páginas que realmente se tocan.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        pos = _leer_cabecera(self._mm, TIPO_AFD)
+        self.n_estados, self.n_simbolos, self.inicial = _CAB_AFD.unpack_from(self._mm, pos)
+        pos += _CAB_AFD.size
+
+        vista = memoryview(self._mm)
+        m = self.n_simbolos
+        alfabeto = vista[pos:pos + 4 * m].cast("I")
+        self.columna = {chr(cp): j for j, cp in enumerate(alfabeto)}
+        alfabeto.release()
+        pos += 4 * m
+
+        tam = 4 * self.n_estados * m
+        self._tabla = vista[pos:pos + tam].cast("i")
+        pos += tam
+        self._finales = vista[pos:pos + (self.n_estados + 7) // 8]
+        self._vista = vista
+
+    @property
+    def alfabeto(self):
+        return set(self.columna)
+
+    def siguiente(self, estado, simbolo):
+        j = self.columna.get(simbolo)
+        if j is None:
+            return -1
+        return self._tabla[estado * self.n_simbolos + j]
+
+    def es_final(self, estado):
+        return bool(self._finales[estado >> 3] >> (estado & 7) & 1)
+
+    def acepta(self, cadena: str) -> bool:
+        estado = self.inicial
+        tabla, m, columna = self._tabla, self.n_simbolos, self.columna
+        for c in cadena:
+            j = columna.get(c)
+            if j is None:
+                return False
+            estado = tabla[estado * m + j]
+            if estado < 0:
+                return False
+        return self.es_final(estado)
+
+    def a_diccionarios(self):
+        """Reconstruye (dfa_states, dfa_start, dfa_accepts, dfa_trans) para mostrarlo."""
+        simbolos = sorted(self.columna, key=self.columna.get)
+        dfa_trans = {}
+        for s in range(self.n_estados):
+            trans = {}
+            for a in simbolos:
+                dest = self.siguiente(s, a)
+                if dest >= 0:
+                    trans[a] = dest
+            dfa_trans[s] = trans
+        dfa_states = {s: frozenset() for s in range(self.n_estados)}
+        dfa_accepts = {s for s in range(self.n_estados) if self.es_final(s)}
+        return dfa_states, self.inicial, dfa_accepts, dfa_trans
+
+    def cerrar(self):
+        self._tabla.release()
+        self._finales.release()
+        self._vista.release()
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def cargar_dfa(path) -> DFAMapeado:
+    return DFAMapeado(path)
+
+
+# Conversiones de regex ya compiladas (AFN y AFD), compartidas entre ejecuciones
+DIRECTORIO_AUTOMATAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "automatas_cache")
+
+
+def _ruta_regex(regex: str, directorio: str, extension: str) -> str:
+    regex = limpiar_regex(regex)
+    return os.path.join(directorio, hashlib.sha1(regex.encode("utf-8")).hexdigest() + extension)
+
+
+def _compilar_regex_en_disco(regex: str, directorio: str):
+    """Thompson + subconjuntos una sola vez; guarda el AFN y el AFD de la regex."""
+    os.makedirs(directorio, exist_ok=True)
+    start, accept, trans, alphabet = regex_a_nfa(regex)
+    dfa = nfa_a_dfa(start, accept, trans, alphabet)
+    # Escribir a un temporal y renombrar: otro proceso nunca ve un archivo a medias
+    for extension, guardar, datos in (
+        (".afn", guardar_nfa, (start, accept, trans, alphabet)),
+        (".afd", guardar_dfa, dfa + (alphabet,)),
+    ):
+        path = _ruta_regex(regex, directorio, extension)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        guardar(tmp, *datos)
+        os.replace(tmp, path)
+
+
+def dfa_desde_regex_en_disco(regex: str, directorio: str = DIRECTORIO_AUTOMATAS) -> DFAMapeado:
+    """
+    Compila la regex a AFD sólo la primera vez; después reutiliza el archivo
+    guardado en `directorio` (compartible entre ejecuciones y procesos).
+    """
+    path = _ruta_regex(regex, directorio, ".afd")
+    if not os.path.exists(path):
+        _compilar_regex_en_disco(regex, directorio)
+    return DFAMapeado(path)
+
+
+def nfa_desde_regex_en_disco(regex: str, directorio: str = DIRECTORIO_AUTOMATAS):
+    """El AFN de Thompson de la regex, desde el mismo directorio que su AFD."""
+    path = _ruta_regex(regex, directorio, ".afn")
+    if not os.path.exists(path):
+        _compilar_regex_en_disco(regex, directorio)
+    return cargar_nfa(path)
+
+
+# ==================== AFN ====================
+
+def guardar_nfa(path, start, accept, transitions, alphabet):
+    """Guarda un AFN (en el formato de postfix_a_nfa) en formato CSR."""
+    estados = sorted(transitions.keys())
+    indice = {s: i for i, s in enumerate(estados)}
+    simbolos = sorted(set(alphabet) | {
+        sym for trans in transitions.values() for sym in trans
+    })
+    col = {a: j for j, a in enumerate(simbolos)}
+
+    offsets = array("I", [0])
+    aristas = array("i")
+    for s in estados:
+        for sym, dests in transitions[s].items():
+            for d in sorted(dests):
+                aristas.append(col[sym])
+                aristas.append(indice[d])
+        offsets.append(len(aristas) // 2)
+
+    with open(path, "wb") as f:
+        _escribir_cabecera(f, TIPO_AFN)
+        f.write(_CAB_AFN.pack(
+            len(estados), len(simbolos), indice[start], indice[accept], len(aristas) // 2
+        ))
+        f.write(_tabla_alfabeto(simbolos).tobytes())
+        f.write(offsets.tobytes())
+        f.write(aristas.tobytes())
+
+
+def cargar_nfa(path):
+    """Retorna (start, accept, transitions, alfabeto) igual que postfix_a_nfa."""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = _leer_cabecera(mm, TIPO_AFN)
+            n, m, start, accept, n_aristas = _CAB_AFN.unpack_from(mm, pos)
+            pos += _CAB_AFN.size
+
+            simbolos = [chr(cp) for cp in array("I", mm[pos:pos + 4 * m])]
+            pos += 4 * m
+            offsets = array("I", mm[pos:pos + 4 * (n + 1)])
+            pos += 4 * (n + 1)
+            aristas = array("i", mm[pos:pos + 8 * n_aristas])
+
+    transitions = {}
+    for s in range(n):
+        trans = {}
+        for k in range(offsets[s], offsets[s + 1]):
+            trans.setdefault(simbolos[aristas[2 * k]], set()).add(aristas[2 * k + 1])
+        transitions[s] = trans
+    alphabet = set(simbolos) - {EPS}
+    return start, accept, transitions, alphabet
+
+
+# ==================== GRAMÁTICAS ====================
+
+def guardar_gramatica(path, grammar: Grammar):
+    partes = [
+        grammar.start_symbol,
+        "".join(sorted(grammar.nonterminals)),
+        "".join(sorted(grammar.terminals)),
+    ]
+    for p in grammar.productions:
+        partes.append(p.lhs)
+        partes.append(p.rhs)
+    texto = "\0".join(partes).encode("utf-8")
+
+    with open(path, "wb") as f:
+        _escribir_cabecera(f, TIPO_GRAMATICA)
+        f.write(_CAB_GRAMATICA.pack(len(grammar.productions), len(texto)))
+        f.write(texto)
+
+
+def cargar_gramatica(path) -> Grammar:
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = _leer_cabecera(mm, TIPO_GRAMATICA)
+            n_prod, tam = _CAB_GRAMATICA.unpack_from(mm, pos)
+            pos += _CAB_GRAMATICA.size
+            partes = mm[pos:pos + tam].decode("utf-8").split("\0")
+
+    start, nts, ts = partes[0], partes[1], partes[2]
+    productions = [
+        Production(partes[3 + 2 * i], partes[4 + 2 * i]) for i in range(n_prod)
+    ]
+    return Grammar(
+        nonterminals=set(nts),
+        terminals=set(ts),
+        productions=productions,
+        start_symbol=start,
+    )
+
+
+# ==================== BANCO DE PREGUNTAS ====================
+#
+#   cabecera común | n_registros (I)
+#   índice  -> n_registros entradas (tipo B, relleno B, n_producciones H, offset I, largo I)
+#   datos   -> registros comprimidos con zlib; cada uno es
+#              descripción \x1f etiqueta \x1f inicial \x1f producciones \x1f explicación
+#              (producciones "lhs\x1drhs" y líneas de explicación separadas por \x1e)
+
+TIPO_BANCO = 4
+_CAB_BANCO = struct.Struct("<I")
+_ENTRADA_BANCO = struct.Struct("<BBHII")
+
+
+def guardar_banco(path, registros):
+    """
+    registros: iterable de (descripción, Grammar, ClassificationResult).
+    Se escribe a un temporal y luego se renombra.
+    """
+    indice = []
+    datos = bytearray()
+    for desc, grammar, result in registros:
+        prods = "\x1e".join(f"{p.lhs}\x1d{p.rhs}" for p in grammar.productions)
+        texto = "\x1f".join([
+            desc, result.label, grammar.start_symbol, prods, "\x1e".join(result.explanation)
+        ])
+        bloque = zlib.compress(texto.encode("utf-8"), 6)
+        indice.append((result.grammar_type, 0, min(len(grammar.productions), 0xFFFF), len(datos), len(bloque)))
+        datos += bloque
+
+    base = _CABECERA.size + _CAB_BANCO.size + _ENTRADA_BANCO.size * len(indice)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        _escribir_cabecera(f, TIPO_BANCO)
+        f.write(_CAB_BANCO.pack(len(indice)))
+        for tipo, relleno, n_prod, offset, largo in indice:
+            f.write(_ENTRADA_BANCO.pack(tipo, relleno, n_prod, base + offset, largo))
+        f.write(datos)
+    os.replace(tmp, path)
+
+
+class BancoMapeado:
+    """
+    Banco de preguntas leído con mmap. Sólo el índice (12 bytes por pregunta)
+    se recorre al abrir; cada pregunta se descomprime al pedirla.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        pos = _leer_cabecera(self._mm, TIPO_BANCO)
+        (self._n,) = _CAB_BANCO.unpack_from(self._mm, pos)
+        self._inicio_indice = pos + _CAB_BANCO.size
+
+        # Índices por tipo, ordenados por cantidad de producciones
+        self.por_tipo = {t: [] for t in (0, 1, 2, 3)}
+        for i in range(self._n):
+            tipo, _, n_prod, _, _ = self._entrada(i)
+            self.por_tipo.setdefault(tipo, []).append((n_prod, i))
+        for lista in self.por_tipo.values():
+            lista.sort()
+
+    def _entrada(self, i):
+        return _ENTRADA_BANCO.unpack_from(self._mm, self._inicio_indice + i * _ENTRADA_BANCO.size)
+
+    def __len__(self):
+        return self._n
+
+    def tipo(self, i) -> int:
+        return self._entrada(i)[0]
+
+    def indices(self, tipo=None, min_prod=0, max_prod=0xFFFF):
+        """Índices de preguntas filtrados por tipo y tamaño (sin descomprimir nada)."""
+        from bisect import bisect_left, bisect_right
+
+        tipos = [tipo] if tipo is not None else sorted(self.por_tipo)
+        res = []
+        for t in tipos:
+            lista = self.por_tipo.get(t, [])
+            a = bisect_left(lista, (min_prod, -1))
+            b = bisect_right(lista, (max_prod, self._n))
+            res.extend(i for _, i in lista[a:b])
+        return res
+
+    def pregunta(self, i):
+        """Retorna (descripción, Grammar, ClassificationResult) de la pregunta i."""
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        tipo, _, _, offset, largo = self._entrada(i)
+        texto = zlib.decompress(self._mm[offset:offset + largo]).decode("utf-8")
+        desc, label, start, prods, explicacion = texto.split("\x1f")
+
+        productions = []
+        nonterminals, terminals = set(), set()
+        for linea in prods.split("\x1e") if prods else []:
+            lhs, rhs = linea.split("\x1d")
+            productions.append(Production(lhs, rhs))
+            for ch in lhs + rhs:
+                (nonterminals if ch.isupper() else terminals).add(ch)
+        nonterminals.add(start)
+
+        grammar = Grammar(
+            nonterminals=nonterminals,
+            terminals=terminals,
+            productions=productions,
+            start_symbol=start,
+        )
+        result = ClassificationResult(tipo, label, explicacion.split("\x1e"))
+        return desc, grammar, result
+
+    def cerrar(self):
+        self._mm.close()
@@ -0,0 +1,293 @@
+# service.py
+"""
+Servicio HTTP/JSON local para clasificar gramáticas sin pasar por la interfaz.
+
+    python service.py --port 8765
+
+Rutas (POST con cuerpo JSON):
+    /classify    {"grammar": "S -> aA\\nA -> b"}
+    /membership  {"grammar": "...", "cadena": "ab"}
+    /convert     {"regex": "(a|b)*abb"}
+    GET /health
+
+Las peticiones concurrentes se agrupan en lotes pequeños que se ejecutan en
+un pool de procesos; peticiones idénticas en vuelo comparten el mismo
+resultado, y los resultados recientes quedan en caché. Si la cola está
+llena se responde 503 (back-pressure) en lugar de acumular trabajo.
+"""
+import argparse
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from grammar_parser import GrammarParser
+from classifier import classify_grammar
+from membership import verificar_pertenencia
+from serialization import dfa_desde_regex_en_disco, nfa_desde_regex_en_disco
+from automata import (
+    describir_afn,
+    describir_afd,
+    dfa_a_gramatica_regular,
+)
+
+RUTAS = {"/classify": "classify", "/membership": "membership", "/convert": "convert"}
+ESTADOS_HTTP = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+                503: "Service Unavailable"}
+MAX_CUERPO = 1 << 20
+# Memoria por búsqueda de pertenencia en cada trabajador (visitados + cola)
+MEMORIA_BUSQUEDA = 64 << 20
+
+
+class Sobrecarga(Exception):
+    pass
+
+
+# ==================== TRABAJO (en procesos del pool) ====================
+
+def _ejecutar(op: str, datos: dict) -> dict:
+    if op == "convert":
+        regex = str(datos["regex"])
+        start, accept, trans, alphabet = nfa_desde_regex_en_disco(regex)
+        with dfa_desde_regex_en_disco(regex) as afd:
+            dfa = afd.a_diccionarios()
+        return {
+            "afn": describir_afn(start, accept, trans, alphabet),
+            "afd": describir_afd(*dfa, alphabet),
+            "gramatica": dfa_a_gramatica_regular(*dfa),
+        }
+
+    grammar = GrammarParser.parse(str(datos["grammar"]))
+    result = classify_grammar(grammar)
+    if op == "classify":
+        return {
+            "type": result.grammar_type,
+            "label": result.label,
+            "explanation": result.explanation,
+        }
+    if op == "membership":
+        pertenece, exacto, metodo = verificar_pertenencia(
+            grammar, result, str(datos["cadena"]), memoria_max=MEMORIA_BUSQUEDA
+        )
+        return {"pertenece": pertenece, "exacto": exacto, "metodo": metodo}
+    raise ValueError(f"Operación desconocida: {op}")
+
+
+def procesar_lote(lote: List[Tuple[str, dict]]) -> List[dict]:
+    """Procesa un lote completo en un solo viaje al proceso trabajador."""
+    resultados = []
+    for op, datos in lote:
+        try:
+            resultados.append({"ok": True, "resultado": _ejecutar(op, datos)})
+        except KeyError as e:
+            resultados.append({"ok": False, "error": f"Falta el campo {e}"})
+        except Exception as e:
+            resultados.append({"ok": False, "error": str(e)})
+    return resultados
+
+
+# ==================== SERVIDOR ====================
+
+class ServicioClasificacion:
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        max_workers: Optional[int] = None,
+        max_lote: int = 32,
+        espera_lote: float = 0.005,
+        max_pendientes: int = 1000,
+        tam_cache: int = 4096,
+    ):
+        self.host = host
+        self.port = port
+        self.max_lote = max_lote
+        self.espera_lote = espera_lote
+        self.max_pendientes = max_pendientes
+        self.tam_cache = tam_cache
+
+        max_workers = max_workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(max_workers=max_workers)
+        # Como mucho un lote en vuelo por proceso; el resto espera en la cola
+        self._lotes_simultaneos = asyncio.Semaphore(max_workers)
+        self._cola: Optional[asyncio.Queue] = None
+        self._en_vuelo: Dict[tuple, asyncio.Future] = {}
+        self._cache: "OrderedDict[tuple, dict]" = OrderedDict()
+
+    # ---------- resolución con coalescencia y caché ----------
+
+    async def resolver(self, op: str, datos: dict) -> dict:
+        clave = (op, json.dumps(datos, sort_keys=True, ensure_ascii=False))
+
+        if clave in self._cache:
+            self._cache.move_to_end(clave)
+            return self._cache[clave]
+
+        fut = self._en_vuelo.get(clave)
+        if fut is None:
+            fut = asyncio.get_running_loop().create_future()
+            try:
+                self._cola.put_nowait((clave, op, datos, fut))
+            except asyncio.QueueFull:
+                raise Sobrecarga()
+            self._en_vuelo[clave] = fut
+        # shield: si un cliente se desconecta, los demás siguen esperando el mismo futuro
+        return await asyncio.shield(fut)
+
+    async def _despachar(self):
+        while True:
+            primero = await self._cola.get()
+            lote = [primero]
+            limite = asyncio.get_running_loop().time() + self.espera_lote
+            while len(lote) < self.max_lote:
+                restante = limite - asyncio.get_running_loop().time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._cola.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._lotes_simultaneos.acquire()
+            asyncio.create_task(self._ejecutar_lote(lote))
+
+    async def _ejecutar_lote(self, lote):
+        loop = asyncio.get_running_loop()
+        try:
+            trabajo = [(op, datos) for _, op, datos, _ in lote]
+            try:
+                resultados = await loop.run_in_executor(self._pool, procesar_lote, trabajo)
+            except Exception as e:
+                resultados = [{"ok": False, "error": f"Error interno: {e}"}] * len(lote)
+
+            for (clave, _, _, fut), res in zip(lote, resultados):
+                self._en_vuelo.pop(clave, None)
+                if res["ok"]:
+                    self._cache[clave] = res
+                    if len(self._cache) > self.tam_cache:
+                        self._cache.popitem(last=False)
+                if not fut.done():
+                    fut.set_result(res)
+        finally:
+            self._lotes_simultaneos.release()
+
+    # ---------- HTTP ----------
+
+    async def _responder(self, writer, estado: int, cuerpo: dict, mantener: bool):
+        datos = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+        cabecera = (
+            f"HTTP/1.1 {estado} {ESTADOS_HTTP.get(estado, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(datos)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n"
+        )
+        writer.write(cabecera.encode("ascii") + datos)
+        await writer.drain()
+
+    async def _atender(self, reader, writer):
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                try:
+                    metodo, ruta, version = linea.decode("latin-1").split()
+                except ValueError:
+                    await self._responder(writer, 400, {"error": "Petición inválida"}, False)
+                    break
+
+                cabeceras = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = h.decode("latin-1").partition(":")
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+
+                mantener = (
+                    version == "HTTP/1.1"
+                    and cabeceras.get("connection", "").lower() != "close"
+                )
+                try:
+                    largo = int(cabeceras.get("content-length", "0") or 0)
+                except ValueError:
+                    await self._responder(writer, 400, {"error": "Content-Length inválido"}, False)
+                    break
+                if largo < 0 or largo > MAX_CUERPO:
+                    await self._responder(writer, 413, {"error": "Cuerpo demasiado grande"}, False)
+                    break
+                cuerpo = await reader.readexactly(largo) if largo else b""
+
+                estado, respuesta = await self._rutear(metodo, ruta, cuerpo)
+                await self._responder(writer, estado, respuesta, mantener)
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _rutear(self, metodo: str, ruta: str, cuerpo: bytes):
+        if metodo == "GET" and ruta == "/health":
+            return 200, {"ok": True, "pendientes": self._cola.qsize(), "cache": len(self._cache)}
+
+        op = RUTAS.get(ruta)
+        if op is None or metodo != "POST":
+            return 404, {"error": f"Ruta no encontrada: {metodo} {ruta}"}
+
+        try:
+            datos = json.loads(cuerpo or b"{}")
+            if not isinstance(datos, dict):
+                raise ValueError("El cuerpo debe ser un objeto JSON.")
+        except ValueError as e:
+            return 400, {"error": f"JSON inválido: {e}"}
+
+        try:
+            res = await self.resolver(op, datos)
+        except Sobrecarga:
+            return 503, {"error": "Servicio saturado, reintenta más tarde."}
+
+        if res["ok"]:
+            return 200, res["resultado"]
+        return 400, {"error": res["error"]}
+
+    async def servir(self):
+        self._cola = asyncio.Queue(maxsize=self.max_pendientes)
+        despachador = asyncio.create_task(self._despachar())
+        server = await asyncio.start_server(self._atender, self.host, self.port)
+        print(f"Servicio escuchando en http://{self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            despachador.cancel()
+            self._pool.shutdown(cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio local de Chomsky Classifier AI")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-lote", type=int, default=32)
+    parser.add_argument("--max-pendientes", type=int, default=1000)
+    args = parser.parse_args()
+
+    servicio = ServicioClasificacion(
+        host=args.host,
+        port=args.port,
+        max_workers=args.workers,
+        max_lote=args.max_lote,
+        max_pendientes=args.max_pendientes,
+    )
+    try:
+        asyncio.run(servicio.servir())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
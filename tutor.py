@@ -1,8 +1,14 @@
 # tutor.py
-from typing import List, Tuple
+import os
+import random
+from typing import Iterator, List, Optional, Tuple
 from examples.sample_grammars import get_sample_grammars
 from grammar_parser import Grammar
 from classifier import classify_grammar, ClassificationResult
+from grammar_generator import generar_gramatica_aleatoria
+from serialization import guardar_banco, BancoMapeado
+
+BANCO_POR_DEFECTO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "quiz_bank.bin")
 
 
 def get_quiz_questions() -> List[Tuple[str, Grammar, ClassificationResult]]:
@@ -18,3 +24,51 @@ def get_quiz_questions() -> List[Tuple[str, Grammar, ClassificationResult]]:
         questions.append((desc, gr, result))
 
     return questions
+
+
+def _preguntas_aleatorias(por_tipo: int, semilla: int) -> Iterator[Tuple[str, Grammar, ClassificationResult]]:
+    rng = random.Random(semilla)
+    numero = 0
+    for _ in range(por_tipo):
+        for tipo in (3, 2, 1, 0):
+            n_nt = rng.randint(1, 5)
+            gr = generar_gramatica_aleatoria(
+                tipo,
+                n_nt=n_nt,
+                n_t=rng.randint(1, 3),
+                n_prod=rng.randint(n_nt, n_nt + 5),
+                max_rhs=rng.randint(2, 4),
+                recursion=rng.uniform(0.1, 0.7),
+                rng=rng,
+            )
+            numero += 1
+            desc = f"Ejercicio #{numero} ({len(gr.productions)} producciones)"
+            yield desc, gr, classify_grammar(gr)
+
+
+def construir_banco(path: str = BANCO_POR_DEFECTO, por_tipo: int = 500, semilla: int = 0):
+    """
+    Construye el banco de preguntas: los ejemplos fijos más `por_tipo`
+    gramáticas aleatorias de cada tipo, ya clasificadas y con su explicación.
+    """
+    def registros():
+        yield from get_quiz_questions()
+        yield from _preguntas_aleatorias(por_tipo, semilla)
+
+    guardar_banco(path, registros())
+
+
+def cargar_banco(path: str = BANCO_POR_DEFECTO) -> BancoMapeado:
+    """Abre el banco (construyéndolo la primera vez si no existe)."""
+    if not os.path.exists(path):
+        construir_banco(path)
+    return BancoMapeado(path)
+
+
+if __name__ == "__main__":
+    import sys
+
+    destino = sys.argv[1] if len(sys.argv) > 1 else BANCO_POR_DEFECTO
+    cantidad = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    construir_banco(destino, por_tipo=cantidad)
+    print(f"Banco guardado en {destino}")
@@ -0,0 +1,141 @@
+# virtual_view.py
+import tkinter as tk
+import tkinter.font as tkfont
+from typing import Sequence
+
+
+class VistaVirtual(tk.Frame):
+    """
+    Vista de texto de sólo lectura que dibuja únicamente las líneas visibles
+    de una secuencia (lista, tupla, range...). Mostrar un resultado enorme
+    cuesta lo mismo que mostrar una pantalla: nunca se inserta todo en el Text.
+
+    Incluye barras de desplazamiento (la horizontal para líneas largas, que
+    no se cortan), paginación y búsqueda de texto.
+    """
+
+    def __init__(self, master, width=40, height=10, **kwargs):
+        super().__init__(master, **kwargs)
+        self._lineas: Sequence[str] = ()
+        self._inicio = 0
+        self._filas = height
+        self._resaltada = None
+
+        barra = tk.Frame(self)
+        barra.pack(side=tk.BOTTOM, fill=tk.X)
+
+        self.entry_buscar = tk.Entry(barra, width=15)
+        self.entry_buscar.pack(side=tk.LEFT)
+        self.entry_buscar.bind("<Return>", lambda e: self.buscar())
+        tk.Button(barra, text="Buscar", command=self.buscar).pack(side=tk.LEFT, padx=2)
+        tk.Button(barra, text="◀", command=lambda: self.desplazar(-1, "pages")).pack(side=tk.LEFT)
+        tk.Button(barra, text="▶", command=lambda: self.desplazar(1, "pages")).pack(side=tk.LEFT)
+        self.lbl_posicion = tk.Label(barra, text="", fg="gray")
+        self.lbl_posicion.pack(side=tk.LEFT, padx=5)
+
+        self.scroll_x = tk.Scrollbar(self, orient=tk.HORIZONTAL)
+        self.scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
+        self.scroll = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.text = tk.Text(
+            self, width=width, height=height, wrap=tk.NONE, state=tk.DISABLED,
+            xscrollcommand=self.scroll_x.set,
+        )
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.text.tag_configure("encontrada", background="#FDE68A")
+        self.scroll_x.config(command=self.text.xview)
+        self._alto_linea = max(1, tkfont.Font(font=self.text.cget("font")).metrics("linespace"))
+
+        self.text.bind("<Configure>", self._on_configure)
+        self.text.bind("<MouseWheel>", self._on_rueda)
+        self.text.bind("<Button-4>", lambda e: self.desplazar(-3, "units"))
+        self.text.bind("<Button-5>", lambda e: self.desplazar(3, "units"))
+        self.text.bind("<Prior>", lambda e: self.desplazar(-1, "pages"))
+        self.text.bind("<Next>", lambda e: self.desplazar(1, "pages"))
+
+    # ---------- API pública ----------
+
+    def mostrar(self, lineas: Sequence[str]):
+        """Reemplaza el contenido. La secuencia no se copia."""
+        self._lineas = lineas
+        self._inicio = 0
+        self._resaltada = None
+        self._render()
+
+    def limpiar(self):
+        self.mostrar(())
+
+    @property
+    def lineas(self) -> Sequence[str]:
+        return self._lineas
+
+    def texto(self) -> str:
+        """Todo el contenido como texto (para reportes)."""
+        return "\n".join(self._lineas)
+
+    def ir_a(self, indice: int):
+        ultimo = max(0, len(self._lineas) - self._filas)
+        self._inicio = max(0, min(indice, ultimo))
+        self._render()
+
+    def desplazar(self, cantidad: int, unidad: str = "units"):
+        paso = self._filas if unidad == "pages" else 1
+        self.ir_a(self._inicio + cantidad * paso)
+
+    def buscar(self, patron: str = None):
+        """Busca hacia adelante desde la línea resaltada (o la primera visible), con vuelta al inicio."""
+        if patron is None:
+            patron = self.entry_buscar.get()
+        n = len(self._lineas)
+        if not patron or not n:
+            return None
+        desde = self._resaltada + 1 if self._resaltada is not None else self._inicio
+        for k in range(n):
+            i = (desde + k) % n
+            if patron in self._lineas[i]:
+                self._resaltada = i
+                if not (self._inicio <= i < self._inicio + self._filas):
+                    self._inicio = max(0, min(i, n - self._filas))
+                self._render()
+                return i
+        self.lbl_posicion.config(text=f"'{patron}' no encontrado")
+        return None
+
+    # ---------- internos ----------
+
+    def _render(self):
+        n = len(self._lineas)
+        fin = min(n, self._inicio + self._filas)
+        visibles = [self._lineas[i] for i in range(self._inicio, fin)]
+
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", "\n".join(visibles))
+        if self._resaltada is not None and self._inicio <= self._resaltada < fin:
+            fila = self._resaltada - self._inicio + 1
+            self.text.tag_add("encontrada", f"{fila}.0", f"{fila}.end")
+        self.text.config(state=tk.DISABLED)
+
+        if n:
+            self.scroll.set(self._inicio / n, fin / n)
+            self.lbl_posicion.config(text=f"{self._inicio + 1}–{fin} de {n}")
+        else:
+            self.scroll.set(0.0, 1.0)
+            self.lbl_posicion.config(text="")
+
+    def _on_scrollbar(self, accion, *args):
+        if accion == "moveto":
+            self.ir_a(int(float(args[0]) * len(self._lineas)))
+        elif accion == "scroll":
+            self.desplazar(int(args[0]), args[1])
+
+    def _on_rueda(self, event):
+        self.desplazar(-1 if event.delta > 0 else 1, "units")
+        return "break"
+
+    def _on_configure(self, event):
+        filas = max(1, event.height // self._alto_linea)
+        if filas != self._filas:
+            self._filas = filas
+            self.ir_a(self._inicio)
@@ -0,0 +1,347 @@
+# visited_set.py
+"""
+Conjunto de formas sentenciales visitadas y cola de formas pendientes
+(frontera), ambos con presupuesto de memoria.
+
+Las formas se guardan empaquetadas (4 bits por símbolo si hay hasta 15
+símbolos, un byte si hay más) en lugar de un objeto str completo. Cuando
+el tamaño estimado supera `memoria_max` bytes hay dos salidas:
+
+    "disco"  las entradas se vuelcan a una tabla SQLite en un archivo
+             temporal; la búsqueda sigue siendo exacta, pero más lenta.
+    "bloom"  las entradas pasan a un filtro de Bloom que ocupa el
+             presupuesto. Con n entradas, m bits y k hashes la tasa de
+             falsos positivos es (1 - e^(-k·n/m))^k; el filtro se
+             dimensiona para `fp_rate` a su capacidad nominal. Un falso
+             positivo hace que la búsqueda descarte una forma nueva, así
+             que puede faltar alguna cadena (nunca sobra una).
+
+La frontera (ColaFormas) siempre desborda a disco: guarda en memoria las
+entradas de menor prioridad y manda el resto a una tabla SQLite indexada
+por prioridad, así que el orden de salida es exactamente el mismo.
+"""
+import hashlib
+import heapq
+import math
+import os
+import sqlite3
+import sys
+import tempfile
+from typing import Iterable, Optional
+
+# Costo aproximado de una entrada en memoria: objeto bytes + hueco en el set
+_COSTO_ENTRADA = sys.getsizeof(b"") + 24
+
+
+class CodificadorFormas:
+    """
+    Empaqueta formas sentenciales como bytes: 4 bits por símbolo con hasta
+    15 símbolos distintos y un byte (UTF-8) con más. Ambas direcciones son
+    un str.translate carácter a carácter, que corre en C.
+    """
+
+    def __init__(self, simbolos: Iterable[str]):
+        self.codigos = {s: i + 1 for i, s in enumerate(sorted(set(simbolos)))}
+        self.hex = len(self.codigos) <= 15
+        self.bits = 4 if self.hex else 8
+        digitos = "0123456789abcdef" if self.hex else None
+        self._ida = {
+            ord(s): digitos[c] if self.hex else chr(c) for s, c in self.codigos.items()
+        }
+        self._vuelta = {ord(v): chr(k) for k, v in self._ida.items()}
+
+    def codificar(self, forma: str) -> bytes:
+        if not self.hex:
+            return forma.translate(self._ida).encode("utf-8")
+        digitos = forma.translate(self._ida)
+        # Los códigos van de 1 a 15: un "0" al final sólo puede ser relleno
+        return bytes.fromhex(digitos + "0" if len(digitos) % 2 else digitos)
+
+    def decodificar(self, clave: bytes) -> str:
+        if not self.hex:
+            return clave.decode("utf-8").translate(self._vuelta)
+        return clave.hex().rstrip("0").translate(self._vuelta)
+
+
+class FiltroBloom:
+
+    def __init__(self, capacidad: int, fp_rate: float = 0.01, m_bits: Optional[int] = None):
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate debe estar entre 0 y 1.")
+        capacidad = max(1, capacidad)
+        if m_bits is None:
+            m_bits = math.ceil(-capacidad * math.log(fp_rate) / math.log(2) ** 2)
+        self.m = max(8, m_bits)
+        self.k = max(1, round(self.m / capacidad * math.log(2)))
+        self.bits = bytearray((self.m + 7) // 8)
+        self.n = 0
+
+    @classmethod
+    def para_presupuesto(cls, bytes_max: int, fp_rate: float = 0.01) -> "FiltroBloom":
+        """Filtro que ocupa `bytes_max` bytes, con capacidad nominal para `fp_rate`."""
+        m = max(8, bytes_max * 8)
+        capacidad = max(1, int(m * math.log(2) ** 2 / -math.log(fp_rate)))
+        return cls(capacidad, fp_rate, m_bits=m)
+
+    def _posiciones(self, clave: bytes):
+        d = hashlib.blake2b(clave, digest_size=16).digest()
+        h1 = int.from_bytes(d[:8], "little")
+        h2 = int.from_bytes(d[8:], "little") | 1
+        for i in range(self.k):
+            yield (h1 + i * h2) % self.m
+
+    def add(self, clave: bytes):
+        for p in self._posiciones(clave):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.n += 1
+
+    def __contains__(self, clave: bytes) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._posiciones(clave))
+
+    def tasa_fp(self) -> float:
+        """Tasa de falsos positivos estimada con las entradas actuales."""
+        return (1 - math.exp(-self.k * self.n / self.m)) ** self.k
+
+
+def _sqlite_temporal(prefijo: str):
+    fd, path = tempfile.mkstemp(prefix=prefijo, suffix=".sqlite")
+    os.close(fd)
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA journal_mode=OFF")
+    con.execute("PRAGMA synchronous=OFF")
+    return path, con
+
+
+def _borrar_sqlite(path: str, con):
+    con.close()
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class _AlmacenDisco:
+    """Tabla SQLite (clave BLOB) en un archivo temporal que se borra al cerrar."""
+
+    def __init__(self):
+        self.path, self.con = _sqlite_temporal("visitados_")
+        self.con.execute("CREATE TABLE v (k BLOB PRIMARY KEY) WITHOUT ROWID")
+
+    def volcar(self, claves: Iterable[bytes]):
+        self.con.executemany("INSERT OR IGNORE INTO v VALUES (?)", ((k,) for k in claves))
+        self.con.commit()
+
+    def __contains__(self, clave: bytes) -> bool:
+        return self.con.execute("SELECT 1 FROM v WHERE k = ?", (clave,)).fetchone() is not None
+
+    def cerrar(self):
+        _borrar_sqlite(self.path, self.con)
+
+
+class ConjuntoVisitados:
+    """
+    Se usa como un set de str (`in`, `add`). Hasta `memoria_max` bytes
+    estimados todo vive en memoria; después se aplica `desborde`.
+    """
+
+    def __init__(
+        self,
+        simbolos: Iterable[str],
+        memoria_max: int,
+        desborde: str = "disco",
+        fp_rate: float = 0.01,
+    ):
+        if desborde not in ("disco", "bloom"):
+            raise ValueError("desborde debe ser 'disco' o 'bloom'.")
+        self.codificador = CodificadorFormas(simbolos)
+        self.memoria_max = memoria_max
+        self.desborde = desborde
+        self.fp_rate = fp_rate
+        self._memoria = set()
+        self._uso = 0
+        self._disco: Optional[_AlmacenDisco] = None
+        self._bloom: Optional[FiltroBloom] = None
+        self.total = 0
+
+    def __contains__(self, forma: str) -> bool:
+        clave = self.codificador.codificar(forma)
+        if clave in self._memoria:
+            return True
+        if self._bloom is not None:
+            return clave in self._bloom
+        return self._disco is not None and clave in self._disco
+
+    def add(self, forma: str):
+        clave = self.codificador.codificar(forma)
+        self.total += 1
+        if self._bloom is not None:
+            self._bloom.add(clave)
+            return
+        self._memoria.add(clave)
+        self._uso += _COSTO_ENTRADA + len(clave)
+        if self._uso > self.memoria_max:
+            self._desbordar()
+
+    def _desbordar(self):
+        if self.desborde == "bloom":
+            self._bloom = FiltroBloom.para_presupuesto(self.memoria_max, self.fp_rate)
+            for clave in self._memoria:
+                self._bloom.add(clave)
+        else:
+            if self._disco is None:
+                self._disco = _AlmacenDisco()
+            self._disco.volcar(self._memoria)
+        self._memoria = set()
+        self._uso = 0
+
+    def __len__(self):
+        return self.total
+
+    @property
+    def desbordado(self) -> bool:
+        return self._bloom is not None or self._disco is not None
+
+    def tasa_fp(self) -> float:
+        """0 mientras la búsqueda es exacta; con Bloom, la tasa estimada actual."""
+        return self._bloom.tasa_fp() if self._bloom is not None else 0.0
+
+    def cerrar(self):
+        if self._disco is not None:
+            self._disco.cerrar()
+            self._disco = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class ColaFormas:
+    """
+    Cola de prioridad de formas sentenciales con presupuesto de memoria.
+    Cada entrada es (*prioridad, forma, *datos), con `n_prioridad` enteros
+    de prioridad distintos entre entradas y `n_datos` enteros de datos (por
+    defecto id y mínimo); `append`/`popleft` la usan como cola FIFO (la
+    prioridad es el orden de llegada).
+
+    En memoria las formas van codificadas. Al superar `memoria_max` bytes
+    estimados la mitad de peor prioridad pasa a disco, y desde entonces
+    toda entrada peor que la mejor del disco va directo al disco: lo que
+    queda en memoria siempre sale antes, y cuando se vacía se recarga un
+    bloque en orden.
+    """
+
+    _LOTE = 1000
+
+    def __init__(
+        self, simbolos: Iterable[str], memoria_max: int, n_prioridad: int = 1, n_datos: int = 2
+    ):
+        self.codificador = CodificadorFormas(simbolos)
+        self.memoria_max = memoria_max
+        self.n_prioridad = n_prioridad
+        self.n_datos = n_datos
+        self._costo = sys.getsizeof((0,) * (n_prioridad + 1 + n_datos)) + _COSTO_ENTRADA
+        self._heap: list = []
+        self._uso = 0
+        self._llegada = 0
+        self._tope: Optional[tuple] = None  # mejor prioridad en disco
+        self._pendientes: list = []
+        self._en_disco = 0
+        self._path = self._con = None
+
+    def __len__(self):
+        return len(self._heap) + self._en_disco
+
+    def push(self, entrada: tuple):
+        k = self.n_prioridad
+        clave = self.codificador.codificar(entrada[k])
+        fila = entrada[:k] + (clave,) + entrada[k + 1:]
+        if self._tope is not None and fila[:k] > self._tope:
+            self._a_disco([fila])
+            return
+        heapq.heappush(self._heap, fila)
+        self._uso += self._costo + len(clave)
+        if self._uso > self.memoria_max:
+            self._desbordar()
+
+    def pop(self) -> tuple:
+        if not self._heap:
+            self._recargar()
+        fila = heapq.heappop(self._heap)
+        k = self.n_prioridad
+        self._uso -= self._costo + len(fila[k])
+        return fila[:k] + (self.codificador.decodificar(fila[k]),) + fila[k + 1:]
+
+    def append(self, entrada: tuple):
+        self._llegada += 1
+        self.push((self._llegada,) + tuple(entrada))
+
+    def popleft(self) -> tuple:
+        return self.pop()[1:]
+
+    def _desbordar(self):
+        filas = sorted(self._heap)
+        mitad = len(filas) // 2
+        self._heap = filas[:mitad]  # una lista ordenada ya es un heap
+        self._uso = sum(self._costo + len(f[self.n_prioridad]) for f in self._heap)
+        self._tope = filas[mitad][:self.n_prioridad]
+        self._a_disco(filas[mitad:])
+
+    def _a_disco(self, filas):
+        if self._con is None:
+            self._path, self._con = _sqlite_temporal("frontera_")
+            columnas = ", ".join(f"p{i} INTEGER" for i in range(self.n_prioridad))
+            indice = ", ".join(f"p{i}" for i in range(self.n_prioridad))
+            datos = ", ".join(f"d{i} INTEGER" for i in range(self.n_datos))
+            self._con.execute(f"CREATE TABLE f ({columnas}, k BLOB, {datos})")
+            self._con.execute(f"CREATE INDEX f_prioridad ON f ({indice})")
+        self._pendientes.extend(filas)
+        self._en_disco += len(filas)
+        if len(self._pendientes) >= self._LOTE:
+            self._volcar()
+
+    def _volcar(self):
+        if self._pendientes:
+            marcas = ", ".join("?" * (self.n_prioridad + 1 + self.n_datos))
+            self._con.executemany(f"INSERT INTO f VALUES ({marcas})", self._pendientes)
+            self._con.commit()
+            self._pendientes = []
+
+    def _recargar(self):
+        """Trae a memoria, en orden, las mejores entradas del disco (hasta media cuota)."""
+        if not self._en_disco:
+            raise IndexError("pop de una cola vacía")
+        self._volcar()
+        k = self.n_prioridad
+        orden = ", ".join(f"p{i}" for i in range(k))
+        ids = []
+        cur = self._con.execute(f"SELECT rowid, * FROM f ORDER BY {orden}")
+        while self._uso <= self.memoria_max // 2:
+            faltan = (self.memoria_max // 2 - self._uso) // (self._costo + 8)
+            filas = cur.fetchmany(max(1, min(self._LOTE, faltan)))
+            if not filas:
+                break
+            for fila in filas:
+                ids.append((fila[0],))
+                self._heap.append(fila[1:])
+                self._uso += self._costo + len(fila[1 + k])
+                if self._uso > self.memoria_max // 2:
+                    break
+        cur.close()
+        self._con.executemany("DELETE FROM f WHERE rowid = ?", ids)
+        self._con.commit()
+        self._en_disco -= len(ids)
+        siguiente = self._con.execute(f"SELECT {orden} FROM f ORDER BY {orden} LIMIT 1").fetchone()
+        self._tope = tuple(siguiente) if siguiente is not None else None
+
+    def cerrar(self):
+        if self._con is not None:
+            _borrar_sqlite(self._path, self._con)
+            self._con = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
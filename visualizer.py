@@ -1,28 +1,228 @@
 # visualizer.py
-from typing import List
+import io
+from typing import Dict, List, Optional, Set, TextIO, Tuple
+
 from grammar_parser import Grammar, Production
+from automata import EPS
+
+# Límite por defecto de nodos dibujados; el resto se resume en un solo nodo.
+MAX_NODOS = 200
+# Máximo de etiquetas combinadas en una arista antes de abreviar.
+MAX_ETIQUETAS = 6
+
+
+def _escapar(texto: str) -> str:
+    return texto.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _etiqueta(etiquetas: List[str]) -> str:
+    if len(etiquetas) > MAX_ETIQUETAS:
+        resto = len(etiquetas) - MAX_ETIQUETAS
+        etiquetas = etiquetas[:MAX_ETIQUETAS] + [f"… (+{resto})"]
+    return _escapar(", ".join(etiquetas))
+
+
+def _componentes_fuertes(nodos: List[str], aristas: Dict[Tuple[str, str], List[str]]) -> List[List[str]]:
+    """Tarjan iterativo (sin recursión, para grafos grandes)."""
+    vecinos: Dict[str, List[str]] = {n: [] for n in nodos}
+    for (a, b) in aristas:
+        vecinos[a].append(b)
+
+    indice: Dict[str, int] = {}
+    bajo: Dict[str, int] = {}
+    en_pila: Set[str] = set()
+    pila: List[str] = []
+    componentes: List[List[str]] = []
+    contador = 0
+
+    for raiz in nodos:
+        if raiz in indice:
+            continue
+        trabajo = [(raiz, 0)]
+        while trabajo:
+            v, i = trabajo.pop()
+            if i == 0:
+                indice[v] = bajo[v] = contador
+                contador += 1
+                pila.append(v)
+                en_pila.add(v)
+            if i < len(vecinos[v]):
+                trabajo.append((v, i + 1))
+                w = vecinos[v][i]
+                if w not in indice:
+                    trabajo.append((w, 0))
+                elif w in en_pila:
+                    bajo[v] = min(bajo[v], indice[w])
+                continue
+            if bajo[v] == indice[v]:
+                comp = []
+                while True:
+                    w = pila.pop()
+                    en_pila.discard(w)
+                    comp.append(w)
+                    if w == v:
+                        break
+                componentes.append(comp)
+            if trabajo:
+                padre = trabajo[-1][0]
+                bajo[padre] = min(bajo[padre], bajo[v])
+    return componentes
 
 
-def grammar_to_dot(grammar: Grammar) -> str:
+def _escribir_grafo(
+    out: TextIO,
+    nombre: str,
+    nodos: List[str],
+    atributos: Dict[str, str],
+    aristas: Dict[Tuple[str, str], List[str]],
+    max_nodos: Optional[int],
+    agrupar_scc: bool,
+):
     """
-    Versión muy sencilla: genera un grafo DOT donde cada no terminal es un nodo
-    y cada producción A -> α genera aristas A -> X por cada no terminal X en α.
-    Esto se puede usar con Graphviz (dot) para generar PNG/SVG.
+    Escribe el grafo en `out` línea por línea. Las aristas paralelas ya vienen
+    agrupadas en `aristas` ((origen, destino) -> etiquetas). Si hay más nodos
+    que `max_nodos`, sólo se dibujan los primeros y el resto se resume.
     """
-    lines: List[str] = ['digraph Grammar {', '  rankdir=LR;']
+    out.write(f"digraph {nombre} {{\n  rankdir=LR;\n")
+
+    visibles = nodos
+    if max_nodos is not None and len(nodos) > max_nodos:
+        visibles = nodos[:max_nodos]
+    conjunto = set(visibles)
+    omitidos = len(nodos) - len(visibles)
+
+    clusters: List[List[str]] = []
+    if agrupar_scc:
+        aristas_vis = {k: v for k, v in aristas.items() if k[0] in conjunto and k[1] in conjunto}
+        clusters = [c for c in _componentes_fuertes(visibles, aristas_vis) if len(c) > 1]
+    en_cluster = {n for c in clusters for n in c}
+
+    for i, comp in enumerate(clusters):
+        out.write(f'  subgraph cluster_{i} {{\n    style=dashed;\n')
+        for n in comp:
+            out.write(f'    "{_escapar(n)}" [{atributos[n]}];\n')
+        out.write("  }\n")
+    for n in visibles:
+        if n not in en_cluster:
+            out.write(f'  "{_escapar(n)}" [{atributos[n]}];\n')
+
+    if omitidos:
+        out.write(f'  "…" [shape=box, style=dashed, label="… {omitidos} nodos más"];\n')
 
-    # Crear nodos para no terminales
-    for nt in grammar.nonterminals:
+    # Las aristas hacia nodos omitidos se resumen en una por nodo visible
+    hacia_resumen: Set[str] = set()
+    for (a, b), etiquetas in aristas.items():
+        if a in conjunto and b in conjunto:
+            out.write(f'  "{_escapar(a)}" -> "{_escapar(b)}" [label="{_etiqueta(etiquetas)}"];\n')
+        elif a in conjunto and a not in hacia_resumen:
+            hacia_resumen.add(a)
+            out.write(f'  "{_escapar(a)}" -> "…" [style=dashed];\n')
+
+    out.write("}\n")
+
+
+def write_grammar_dot(
+    grammar: Grammar,
+    out: TextIO,
+    max_nodos: Optional[int] = MAX_NODOS,
+    agrupar_scc: bool = False,
+):
+    """
+    Escribe en `out` un grafo DOT donde cada no terminal es un nodo y cada
+    producción A -> α aporta una arista A -> X por cada no terminal X en α.
+    Las aristas paralelas se fusionan en una sola con las producciones
+    combinadas como etiqueta.
+    """
+    nodos = sorted(grammar.nonterminals, key=lambda nt: (nt != grammar.start_symbol, nt))
+    atributos = {}
+    for nt in nodos:
         if nt == grammar.start_symbol:
-            lines.append(f'  "{nt}" [shape=doublecircle, label="{nt} (S)"];')
+            atributos[nt] = f'shape=doublecircle, label="{_escapar(nt)} (S)"'
         else:
-            lines.append(f'  "{nt}" [shape=circle];')
+            atributos[nt] = "shape=circle"
 
-    # Crear aristas según apariciones de no terminales en RHS
+    aristas: Dict[Tuple[str, str], List[str]] = {}
     for p in grammar.productions:
-        for ch in p.rhs:
+        rhs_display = p.rhs if p.rhs != "" else EPS
+        for ch in dict.fromkeys(p.rhs):
             if ch in grammar.nonterminals:
-                lines.append(f'  "{p.lhs}" -> "{ch}" [label="{p.rhs}"];')
+                etiquetas = aristas.setdefault((p.lhs, ch), [])
+                if rhs_display not in etiquetas:
+                    etiquetas.append(rhs_display)
 
-    lines.append("}")
-    return "\n".join(lines)
+    _escribir_grafo(out, "Grammar", nodos, atributos, aristas, max_nodos, agrupar_scc)
+
+
+def grammar_to_dot(grammar: Grammar, **kwargs) -> str:
+    """
+    Versión en memoria de write_grammar_dot.
+    Esto se puede usar con Graphviz (dot) para generar PNG/SVG.
+    """
+    buf = io.StringIO()
+    write_grammar_dot(grammar, buf, **kwargs)
+    return buf.getvalue()
+
+
+def write_nfa_dot(
+    start, accept, transitions, out: TextIO,
+    max_nodos: Optional[int] = MAX_NODOS, agrupar_scc: bool = False,
+):
+    """AFN de Thompson a DOT; los estados se visitan en BFS desde el inicial."""
+    from collections import deque
+
+    orden = [start]
+    vistos = {start}
+    q = deque([start])
+    while q:
+        s = q.popleft()
+        for dests in transitions.get(s, {}).values():
+            for d in sorted(dests):
+                if d not in vistos:
+                    vistos.add(d)
+                    orden.append(d)
+                    q.append(d)
+
+    nodos = [str(s) for s in orden]
+    atributos = {}
+    for s in orden:
+        forma = "doublecircle" if s == accept else "circle"
+        extra = ', style=bold' if s == start else ""
+        atributos[str(s)] = f"shape={forma}{extra}"
+
+    aristas: Dict[Tuple[str, str], List[str]] = {}
+    for s in orden:
+        for sym, dests in transitions.get(s, {}).items():
+            for d in dests:
+                aristas.setdefault((str(s), str(d)), []).append(sym)
+
+    _escribir_grafo(out, "AFN", nodos, atributos, aristas, max_nodos, agrupar_scc)
+
+
+def write_dfa_dot(
+    dfa_states, dfa_start, dfa_accepts, dfa_trans, out: TextIO,
+    max_nodos: Optional[int] = MAX_NODOS, agrupar_scc: bool = False,
+):
+    """AFD (formato de nfa_a_dfa) a DOT, con aristas fusionadas por destino."""
+    nodos = [f"Q{sid}" for sid in sorted(dfa_states.keys())]
+    atributos = {}
+    for sid in sorted(dfa_states.keys()):
+        forma = "doublecircle" if sid in dfa_accepts else "circle"
+        extra = ", style=bold" if sid == dfa_start else ""
+        atributos[f"Q{sid}"] = f"shape={forma}{extra}"
+
+    aristas: Dict[Tuple[str, str], List[str]] = {}
+    for sid in sorted(dfa_states.keys()):
+        for a, dest in sorted(dfa_trans.get(sid, {}).items()):
+            aristas.setdefault((f"Q{sid}", f"Q{dest}"), []).append(a)
+
+    _escribir_grafo(out, "AFD", nodos, atributos, aristas, max_nodos, agrupar_scc)
+
+
+def export_dot(path: str, writer, *args, **kwargs):
+    """
+    Escribe el DOT directamente al archivo `path` sin armar todo el texto en
+    memoria. Ej: export_dot("afd.dot", write_dfa_dot, *dfa) o
+    export_dot("afn.dot", write_nfa_dot, *regex_a_nfa(r)[:3])
+    """
+    with open(path, "w", encoding="utf-8") as out:
+        writer(*args, out, **kwargs)